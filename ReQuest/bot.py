@@ -11,9 +11,20 @@ from discord.ext.commands import errors
 from pymongo import AsyncMongoClient as MongoClient
 import redis.asyncio as redis
 
-from ReQuest.ui.gm.views import QuestPostView
-from ReQuest.utilities.constants import QuestFields
-from ReQuest.utilities.supportFunctions import attempt_delete, log_exception
+from ReQuest.ui.gm.buttons import JoinQuestButton, LeaveQuestButton
+from ReQuest.ui.gm.views import QuestPostRenderer
+from ReQuest.ui.common.enums import CharacterStorageMode, StockEngine
+from ReQuest.utilities.supportFunctions import (
+    attempt_delete,
+    log_exception,
+    audit_query_plans,
+    ensure_indexes,
+    migrate_shop_stock,
+    mongo_supports_transactions,
+    reconcile_stock_counters,
+    LocalCache,
+    CacheInvalidationBus
+)
 
 log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
 logging.basicConfig(
@@ -27,10 +38,27 @@ logger = logging.getLogger(__name__)
 class ReQuest(commands.Bot):
     def __init__(self):
         self.mongo_client = None
+        # Whether the MongoDB deployment supports multi-document transactions; determined on startup
+        self.mongo_transactions = False
         self.cdb = None
         self.mdb = None
         self.gdb = None
         self.rdb = None
+        # In-process cache tier in front of Redis for hot, rarely-changing documents such as guild configs
+        self.local_cache = LocalCache(
+            max_size=int(os.getenv('LOCAL_CACHE_SIZE', 2048)),
+            ttl=float(os.getenv('LOCAL_CACHE_TTL', 60))
+        )
+        # Keeps local caches coherent across multiple bot processes sharing one Redis
+        self.cache_bus = CacheInvalidationBus(self)
+        # Folds bursts of quest roster changes into a single edit of the quest post
+        self.quest_post_renderer = QuestPostRenderer(self)
+        # Whether characters are embedded in each player's document or stored one document per character
+        self.character_storage = CharacterStorageMode(os.getenv('CHARACTER_STORAGE', 'embedded').lower())
+        # Whether limited shop stock is counted in MongoDB directly, or in Redis and written back to MongoDB
+        self.stock_engine = StockEngine(os.getenv('STOCK_ENGINE', 'mongo').lower())
+        # Maximum number of expired shop carts cleaned up per run of the cart cleanup task
+        self.cart_cleanup_budget = int(os.getenv('CART_CLEANUP_BUDGET', 1000))
         self.session = None
         self.allow_list_enabled = False
         intents = discord.Intents.default()
@@ -86,6 +114,11 @@ class ReQuest(commands.Bot):
         self.cdb = self.mongo_client[os.getenv('CONFIG_DB')]
         self.gdb = self.mongo_client[os.getenv('GUILD_DB')]
 
+        await ensure_indexes(self)
+        self.mongo_transactions = await mongo_supports_transactions(self)
+        if os.getenv('QUERY_PLAN_AUDIT', 'false').lower() == 'true':
+            await audit_query_plans(self)
+
         # Connect to Redis
         redis_host = os.getenv('REDIS_HOST', 'localhost')
         redis_port = int(os.getenv('REDIS_PORT', 6379))
@@ -99,6 +132,18 @@ class ReQuest(commands.Bot):
             socket_keepalive=True,
             health_check_interval=30
         )
+        self.cache_bus.start()
+
+        # Shop stock moved from one document per guild to one per shop; split any guilds still in the old layout
+        # before a shop can read from the new one
+        migrated_shops = await migrate_shop_stock(self)
+        if migrated_shops:
+            logger.info(f'Migrated stock for {migrated_shops} shop(s) to per-shop documents.')
+
+        # Write back any stock counters a previous run left in Redis, whichever stock engine is now configured
+        flushed_shops = await reconcile_stock_counters(self)
+        if flushed_shops:
+            logger.info(f'Wrote back unsaved stock counters for {flushed_shops} shop(s).')
 
         # Grab the list of extensions and load them asynchronously
         initial_extensions = os.getenv('LOAD_EXTENSIONS').split(',')
@@ -114,28 +159,18 @@ class ReQuest(commands.Bot):
             self.allow_list_enabled = True
             await self.load_allow_list()
 
-        # If the bot is restarted with any existing quests, this reloads their views so they can be interacted with.
-        quests = []
-        quest_collection = self.gdb['quests']
-        cursor = quest_collection.find()
-        for document in await cursor.to_list(length=None):
-            quests.append(document)
-        for quest in quests:
-            try:
-                self.add_view(view=QuestPostView(quest), message_id=quest[QuestFields.MESSAGE_ID])
-            except (KeyError, TypeError) as e:
-                quest_id = quest.get(QuestFields.QUEST_ID, 'unknown')
-                logger.error(f'Failed to load view for quest {quest_id}: {e}')
-            except Exception as e:
-                quest_id = quest.get(QuestFields.QUEST_ID, 'unknown')
-                logger.error(f'Unexpected error loading view for quest {quest_id}: {e}')
+        # Quest post buttons resolve their quest from the custom ID when pressed, so posts from before a restart stay
+        # interactive without loading any quests here.
+        self.add_dynamic_items(JoinQuestButton, LeaveQuestButton)
 
     async def close(self):
         await super().close()
+        self.quest_post_renderer.cancel()
         if self.session:
             await self.session.close()
         if self.mongo_client:
             await self.mongo_client.close()
+        await self.cache_bus.stop()
         if self.rdb:
             await self.rdb.aclose()
 
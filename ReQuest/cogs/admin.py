@@ -5,7 +5,13 @@ from discord.ext.commands import Cog
 
 from ReQuest.ui.admin import views
 from ReQuest.utilities.checks import is_owner
-from ReQuest.utilities.supportFunctions import log_exception
+from ReQuest.utilities.supportFunctions import (
+    log_exception,
+    migrate_character_storage,
+    character_storage_is_split,
+    migrate_quest_rosters,
+    audit_query_plans
+)
 
 
 class Admin(Cog):
@@ -99,6 +105,60 @@ class Admin(Cog):
         except Exception as e:
             await ctx.send(f'There was an error syncing commands: {e}')
 
+    @commands.command(name='migratecharacters', hidden=True)
+    @commands.dm_only()
+    @commands.is_owner()
+    async def migrate_characters(self, ctx):
+        """
+        Moves all embedded characters into their own documents.
+
+        NOTE: Only available when CHARACTER_STORAGE is set to split. Players are otherwise migrated lazily the first
+        time their characters are read.
+        """
+
+        try:
+            if not character_storage_is_split(self.bot):
+                await ctx.send('Character storage is not in split mode. Set `CHARACTER_STORAGE=split` and restart '
+                               'before migrating.')
+                return
+
+            player_count, character_count = await migrate_character_storage(self.bot)
+            await ctx.author.send(f'Migrated {character_count} character(s) belonging to {player_count} player(s).')
+        except Exception as e:
+            await ctx.send(f'There was an error migrating characters: {e}')
+
+    @commands.command(name='migratequestrosters', hidden=True)
+    @commands.dm_only()
+    @commands.is_owner()
+    async def migrate_rosters(self, ctx):
+        """
+        Strips the character snapshots out of existing quest rosters, leaving only the player, character ID and
+        character name.
+        """
+
+        try:
+            quest_count = await migrate_quest_rosters(self.bot)
+            await ctx.author.send(f'Slimmed the rosters of {quest_count} quest(s).')
+        except Exception as e:
+            await ctx.send(f'There was an error migrating quest rosters: {e}')
+
+    @commands.command(name='auditqueries', hidden=True)
+    @commands.dm_only()
+    @commands.is_owner()
+    async def audit_queries(self, ctx):
+        """
+        Explains the query shapes behind each declared index and reports any that would scan a whole collection.
+        """
+
+        try:
+            collection_scans = await audit_query_plans(self.bot)
+            if collection_scans:
+                await ctx.author.send('The following queries are collection scans:\n' + '\n'.join(collection_scans))
+            else:
+                await ctx.author.send('All audited queries use an index.')
+        except Exception as e:
+            await ctx.send(f'There was an error auditing queries: {e}')
+
     @app_commands.command(name='admin')
     @is_owner()
     @app_commands.dm_only()
@@ -5,10 +5,12 @@ from discord.ext.commands import Cog
 
 from ReQuest.ui.gm import views, modals
 from ReQuest.utilities.checks import has_gm_or_mod
-from ReQuest.utilities.constants import CharacterFields, CommonFields, DatabaseCollections
+from ReQuest.utilities.constants import CommonFields, DatabaseCollections
 from ReQuest.utilities.supportFunctions import (
     log_exception,
+    get_active_character,
     get_cached_data,
+    get_player_data,
     get_xp_config,
     UserFeedbackError
 )
@@ -54,21 +56,13 @@ class GameMaster(Cog):
         """
         try:
             bot = interaction.client
-            guild_id = str(interaction.guild_id)
-            player_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member.id}
-            )
+            player_query = await get_player_data(bot, member.id)
             if not player_query:
                 raise UserFeedbackError('The target player does not have any registered characters.')
 
-            if guild_id not in player_query[CharacterFields.ACTIVE_CHARACTERS]:
+            active_character_id, character_data = await get_active_character(bot, member.id, interaction.guild_id)
+            if not character_data:
                 raise UserFeedbackError('The target player does not have a character activated on this server.')
-
-            active_character_id = player_query[CharacterFields.ACTIVE_CHARACTERS][guild_id]
-            character_data = player_query[CharacterFields.CHARACTERS][active_character_id]
             xp_enabled = await get_xp_config(interaction.client, interaction.guild_id)
             modal = modals.ModPlayerModal(member, active_character_id, character_data, xp_enabled)
             await interaction.response.send_modal(modal)
@@ -83,22 +77,14 @@ class GameMaster(Cog):
         """
         try:
             bot = interaction.client
-            guild_id = str(interaction.guild_id)
-            player_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member.id}
-            )
+            player_query = await get_player_data(bot, member.id)
             if not player_query:
                 raise UserFeedbackError('The target player does not have any registered characters.')
 
-            if guild_id not in player_query[CharacterFields.ACTIVE_CHARACTERS]:
+            active_character_id, character_data = await get_active_character(bot, member.id, interaction.guild_id)
+            if not character_data:
                 raise UserFeedbackError('The target player does not have a character activated on this server.')
 
-            active_character_id = player_query[CharacterFields.ACTIVE_CHARACTERS][guild_id]
-            character_data = player_query[CharacterFields.CHARACTERS][active_character_id]
-
             currency_config = await get_cached_data(
                 bot=bot,
                 mongo_database=bot.gdb,
@@ -3,18 +3,18 @@ import logging
 from datetime import timezone
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ext.commands import Cog
-from pymongo import ReturnDocument
 
 from ReQuest.ui.common.enums import ScheduleType, RoleplayMode, DayOfWeek
 from ReQuest.utilities.constants import CharacterFields, RoleplayFields, CommonFields, DatabaseCollections
 from ReQuest.utilities.supportFunctions import (
     log_exception,
     get_cached_data,
-    update_character_inventory,
-    update_character_experience,
-    get_xp_config
+    apply_roleplay_rewards,
+    record_roleplay_message,
+    flush_roleplay_counters,
+    get_roleplay_filter
 )
 
 logger = logging.getLogger(__name__)
@@ -25,14 +25,26 @@ class Roleplay(Cog):
         super().__init__()
         self.bot = bot
 
-    class MockInteraction:
-        def __init__(self, client, user, guild, channel):
-            self.client = client
-            self.user = user
-            self.guild = guild
-            self.channel = channel
-            self.guild_id = guild.id
-            self.response = None
+    async def cog_load(self):
+        """Start flushing roleplay counters when the cog is loaded."""
+        self.roleplay_flush_task.start()
+
+    async def cog_unload(self):
+        """Stop the flush task and write any outstanding counters."""
+        self.roleplay_flush_task.cancel()
+        try:
+            await flush_roleplay_counters(self.bot)
+        except Exception as e:
+            logger.error(f"Error flushing roleplay counters on unload: {e}")
+
+    @tasks.loop(seconds=30)
+    async def roleplay_flush_task(self):
+        """Write changed roleplay counters from Redis to the database."""
+        try:
+            await flush_roleplay_counters(self.bot)
+        except Exception as e:
+            logger.error(f"Error in roleplay flush task: {e}")
+            await log_exception(e)
 
     @staticmethod
     def _get_cycle_key(config, now: datetime.datetime):
@@ -75,6 +87,10 @@ class Roleplay(Cog):
             guild_id = message.guild.id
             user_id = message.author.id
 
+            roleplay_filter = await get_roleplay_filter(bot, guild_id)
+            if not roleplay_filter.allows(message):
+                return
+
             rp_config = await get_cached_data(
                 bot=bot,
                 mongo_database=bot.gdb,
@@ -82,29 +98,6 @@ class Roleplay(Cog):
                 query={'_id': guild_id}
             )
             if not rp_config:
-                logger.debug(f'No roleplay configuration found for guild {guild_id}.')
-                return
-            rp_settings = rp_config.get(RoleplayFields.CONFIG, {})
-
-            if not rp_config or not rp_config.get(RoleplayFields.ENABLED):
-                logger.debug(f'Roleplay not enabled in guild {guild_id}.')
-                return
-
-            allowed_channels = rp_config.get(RoleplayFields.CHANNELS, [])
-
-            # Check if message is in an allowed channel
-            # For threads, check if the parent channel is allowed
-            channel_to_check = message.channel
-            if isinstance(message.channel, discord.Thread):
-                channel_to_check = message.channel.parent
-
-            if not channel_to_check or str(channel_to_check.id) not in allowed_channels:
-                logger.debug(f'Message in channel {message.channel.id} not in allowed RP channels.')
-                return
-
-            min_length = rp_settings.get(RoleplayFields.MIN_LENGTH, 0)
-            if len(message.content) < min_length:
-                logger.debug(f'Message length {len(message.content)} is below minimum {min_length}.')
                 return
 
             character_data = await get_cached_data(
@@ -125,101 +118,24 @@ class Roleplay(Cog):
 
             cooldown_time = int(config_data.get(RoleplayFields.COOLDOWN, 20))
 
-            cooldown_state_key = f"rp:{guild_id}:{user_id}:cooldown"
-            if await bot.rdb.exists(cooldown_state_key):
-                logger.debug(f'User {user_id} is on cooldown in guild {guild_id}.')
-                return
-
-            if cooldown_time > 0:
-                await bot.rdb.set(cooldown_state_key, "1", ex=cooldown_time)
-
-            collection = bot.gdb[DatabaseCollections.ROLEPLAY_DATA]
-            db_key = f"{guild_id}:{user_id}"
-
-            trigger_reward = False
-            reset_count = False
-
             if mode == RoleplayMode.SCHEDULED.value:
                 now = datetime.datetime.now(timezone.utc)
                 current_cycle = self._get_cycle_key(config_data, now)
-
-                result = await collection.find_one_and_update(
-                    {'_id': db_key, 'last_reset': {'$ne': current_cycle}},
-                    {
-                        '$set': {
-                            'message_count': 1,
-                            'last_reset': current_cycle,
-                            'claimed': False
-                        }
-                    },
-                    upsert=False,
-                    return_document=ReturnDocument.AFTER
-                )
-
-                if result:
-                    current_count = 1
-                    claimed = False
-                else:
-                    result = await collection.find_one_and_update(
-                        {'_id': db_key},
-                        {
-                            '$inc': {'message_count': 1},
-                            '$setOnInsert': {'last_reset': current_cycle, 'claimed': False}
-                        },
-                        upsert=True,
-                        return_document=ReturnDocument.AFTER
-                    )
-                    current_count = result.get('message_count', 1)
-                    claimed = result.get('claimed', False)
-
-                threshold = int(config_data.get(RoleplayFields.THRESHOLD, 20))
-                if current_count >= threshold and not claimed:
-                    trigger_reward = True
-
-                    await collection.update_one(
-                        {'_id': db_key},
-                        {'$set': {'claimed': True}}
-                    )
-
+                limit = int(config_data.get(RoleplayFields.THRESHOLD, 20))
             else:
-                frequency = int(config_data.get(RoleplayFields.FREQUENCY, 5))
+                current_cycle = None
+                limit = int(config_data.get(RoleplayFields.FREQUENCY, 5))
 
-                result = await collection.find_one_and_update(
-                    {'_id': db_key},
-                    {'$inc': {'message_count': 1}},
-                    upsert=True,
-                    return_document=ReturnDocument.AFTER
-                )
-                current_count = result.get('message_count', 1)
-
-                if current_count >= frequency:
-                    trigger_reward = True
-                    reset_count = True
+            trigger_reward = await record_roleplay_message(
+                bot, guild_id, user_id, mode, cooldown_time, current_cycle, limit
+            )
 
             if trigger_reward:
-                if reset_count:
-                    await collection.update_one(
-                        {'_id': db_key},
-                        {'$set': {'message_count': 0}}
-                    )
-
                 rewards = rp_config.get(RoleplayFields.REWARDS, {})
-                xp_amount = rewards.get(RoleplayFields.XP)
-                items = rewards.get(RoleplayFields.ITEMS, {})
-                currency = rewards.get(RoleplayFields.CURRENCY, {})
-
-                xp_enabled = await get_xp_config(bot, guild_id)
-
-                mock_interaction = self.MockInteraction(bot, message.author, message.guild, message.channel)
-
-                if xp_enabled and xp_amount:
-                    await update_character_experience(mock_interaction, user_id, active_char_id, xp_amount)
-
-                for item_name, qty in items.items():
-                    await update_character_inventory(mock_interaction, user_id, active_char_id, item_name, qty)
-
-                for curr_name, amount in currency.items():
-                    await update_character_inventory(mock_interaction, user_id, active_char_id, curr_name, amount)
+                if not await apply_roleplay_rewards(bot, guild_id, user_id, active_char_id, rewards):
+                    logger.warning(f'Roleplay rewards were not applied to character {active_char_id} of user '
+                                   f'{user_id}: the character was not found or a reward would leave an item or '
+                                   f'currency negative.')
 
         except Exception as e:
             await log_exception(e)
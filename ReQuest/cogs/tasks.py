@@ -5,18 +5,24 @@ import discord
 from discord.ext import commands, tasks
 from discord.ext.commands import Cog
 
-from ReQuest.ui.common.enums import ScheduleType, RestockMode
+from ReQuest.ui.common.enums import RestockMode
 from ReQuest.utilities.constants import CommonFields, ShopFields, RestockFields, DatabaseCollections
 from ReQuest.utilities.supportFunctions import (
+    claim_due_restocks,
     cleanup_expired_carts,
-    get_last_restock,
-    get_item_stock,
+    defer_shop_restock,
+    ensure_restock_schedule,
+    get_cached_data,
     get_shop_channel,
-    set_available_stock,
-    increment_available_stock,
+    rebuild_restock_schedule,
+    restock_shop_stock,
+    schedule_shop_restock,
     update_last_restock,
     log_exception,
-    escape_markdown
+    RESTOCK_RETRY_DELAY,
+    escape_markdown,
+    stock_engine_is_redis,
+    flush_stock_counters
 )
 
 logger = logging.getLogger(__name__)
@@ -32,11 +38,19 @@ class Tasks(Cog):
         """Start background tasks when the cog is loaded."""
         self.cart_cleanup_task.start()
         self.restock_check_task.start()
+        if stock_engine_is_redis(self.bot):
+            self.stock_flush_task.start()
 
     async def cog_unload(self):
         """Stop background tasks when the cog is unloaded."""
         self.cart_cleanup_task.cancel()
         self.restock_check_task.cancel()
+        if self.stock_flush_task.is_running():
+            self.stock_flush_task.cancel()
+            try:
+                await flush_stock_counters(self.bot)
+            except Exception as e:
+                logger.error(f"Error flushing stock counters on unload: {e}")
 
     @tasks.loop(minutes=1)
     async def cart_cleanup_task(self):
@@ -58,6 +72,15 @@ class Tasks(Cog):
         except Exception as e:
             logger.error(f"Error in startup cart cleanup: {e}")
 
+    @tasks.loop(seconds=5)
+    async def stock_flush_task(self):
+        """Write changed stock counters from Redis to the database."""
+        try:
+            await flush_stock_counters(self.bot)
+        except Exception as e:
+            logger.error(f"Error in stock flush task: {e}")
+            await log_exception(e)
+
     @tasks.loop(minutes=1)
     async def restock_check_task(self):
         """Check all shops for pending restocks."""
@@ -69,89 +92,58 @@ class Tasks(Cog):
 
     @restock_check_task.before_loop
     async def before_restock_check(self):
-        """Wait for the bot to be ready."""
+        """Wait for the bot to be ready and rebuild the restock schedule."""
         await self.bot.wait_until_ready()
+        try:
+            scheduled = await rebuild_restock_schedule(self.bot)
+            logger.info(f"Scheduled restocks for {scheduled} shop(s).")
+        except Exception as e:
+            logger.error(f"Error rebuilding restock schedule: {e}")
 
     async def _process_restocks(self):
-        """Process restocks for all shops with enabled restock schedules."""
+        """Restock every shop whose scheduled restock time has passed, then schedule its next restock."""
         now = datetime.now(timezone.utc)
 
-        # Query all guilds with shops
-        collection = self.bot.gdb[DatabaseCollections.SHOPS]
-        cursor = collection.find({})
-        all_shops = await cursor.to_list(length=None)
-
-        for guild_doc in all_shops:
-            guild_id = guild_doc[CommonFields.ID]
-            shop_channels = guild_doc.get(ShopFields.SHOP_CHANNELS, {})
-
-            for channel_id, shop_data in shop_channels.items():
-                restock_config = shop_data.get(ShopFields.RESTOCK_CONFIG)
-                if not restock_config or not restock_config.get(RestockFields.ENABLED):
+        scheduled = await ensure_restock_schedule(self.bot)
+        if scheduled is not None:
+            logger.warning(f"Restock schedule was missing from Redis; rescheduled restocks for {scheduled} shop(s).")
+
+        for guild_id, channel_id in await claim_due_restocks(self.bot, now):
+            restock_config = None
+            restocked = False
+            try:
+                shop_query = await get_cached_data(
+                    bot=self.bot,
+                    mongo_database=self.bot.gdb,
+                    collection_name=DatabaseCollections.SHOPS,
+                    query={CommonFields.ID: guild_id}
+                )
+                shop_data = (shop_query or {}).get(ShopFields.SHOP_CHANNELS, {}).get(channel_id)
+                if not shop_data:
+                    # The shop was removed; leave it unscheduled
                     continue
 
-                # Check if restock is due
-                last_restock_str = await get_last_restock(self.bot, guild_id, channel_id)
-                last_restock = None
-                if last_restock_str:
-                    try:
-                        last_restock = datetime.fromisoformat(last_restock_str.replace('Z', '+00:00'))
-                    except (ValueError, TypeError):
-                        logger.error(f'Malformed data for last restock in guild {guild_id}, channel {channel_id}')
-
-                if self._is_restock_due(restock_config, last_restock, now):
+                restock_config = shop_data.get(ShopFields.RESTOCK_CONFIG)
+                if restock_config and restock_config.get(RestockFields.ENABLED):
                     await self._restock_shop(guild_id, channel_id, shop_data, restock_config)
+                    restocked = True
                     await update_last_restock(self.bot, guild_id, channel_id, now.isoformat())
                     logger.debug(f"Restocked shop in guild {guild_id}, channel {channel_id}")
 
-    @staticmethod
-    def _is_restock_due(restock_config: dict, last_restock: datetime | None, now: datetime) -> bool:
-        """
-        Determine if restocking should occur based on schedule.
-
-        :param restock_config: The shop's restock configuration
-        :param last_restock: The last restock datetime or None
-        :param now: The current datetime (UTC)
-
-        :return: True if restock is due
-        """
-        schedule = restock_config.get(RestockFields.SCHEDULE)
-        target_minute = restock_config.get(RestockFields.MINUTE, 0)
-        target_hour = restock_config.get(RestockFields.HOUR, 0)
-        target_day = restock_config.get(RestockFields.DAY_OF_WEEK, 0)  # 0 = Monday
-
-        if schedule == ScheduleType.HOURLY.value:
-            # Check time with a tolerance of 1 minute
-            minute_diff = (now.minute - target_minute) % 60
-            if minute_diff in (0, 1):
-                if last_restock is None:
-                    return True
-
-                # Checks with a 1-minute buffer
-                time_diff = now - last_restock
-                if time_diff.total_seconds() >= 3600 - 60:
-                    return True
-
-        elif schedule == ScheduleType.DAILY.value:
-            # Check if we're at target hour:minute
-            if now.hour == target_hour and now.minute == target_minute:
-                if last_restock is None:
-                    return True
-                # Check if it's a different day
-                if now.date() > last_restock.date():
-                    return True
-
-        elif schedule == ScheduleType.WEEKLY.value:
-            # Check if correct day, hour, minute
-            if now.weekday() == target_day and now.hour == target_hour and now.minute == target_minute:
-                if last_restock is None:
-                    return True
-                # Check if at least 6 days have passed (to avoid issues at day boundaries)
-                time_diff = now - last_restock
-                if time_diff.days >= 6:
-                    return True
-
-        return False
+                await schedule_shop_restock(self.bot, guild_id, channel_id, restock_config, now)
+            except Exception as e:
+                logger.error(f"Error restocking shop in guild {guild_id}, channel {channel_id}: {e}")
+                await log_exception(e)
+                # The shop was claimed off the schedule, so it must go back on whatever failed: at its next restock if
+                # this one went through, otherwise after a short delay to retry
+                try:
+                    if restocked:
+                        await schedule_shop_restock(self.bot, guild_id, channel_id, restock_config, now)
+                    else:
+                        await defer_shop_restock(self.bot, guild_id, channel_id, now + RESTOCK_RETRY_DELAY)
+                except Exception as schedule_error:
+                    logger.error(f"Error rescheduling shop in guild {guild_id}, channel {channel_id}: "
+                                 f"{schedule_error}")
 
     async def _restock_shop(self, guild_id: int, channel_id: str, shop_data: dict, restock_config: dict):
         """
@@ -165,32 +157,15 @@ class Tasks(Cog):
         mode = restock_config.get(RestockFields.MODE, RestockMode.FULL.value)
         increment_amount = restock_config.get(RestockFields.INCREMENT_AMOUNT, 1)
 
-        shop_stock = shop_data.get(ShopFields.SHOP_STOCK, [])
-        restocked_items = []  # List of (item_name, amount_added)
-
-        for item in shop_stock:
-            max_stock = item.get(ShopFields.MAX_STOCK)
-            if max_stock is None:
-                continue  # Unlimited item
-
-            item_name = item.get(CommonFields.NAME)
-
-            # Get current stock to calculate how much was added
-            current_stock = await get_item_stock(self.bot, guild_id, channel_id, item_name)
-            current_available = current_stock[ShopFields.AVAILABLE] if current_stock else 0
-
-            if mode == RestockMode.FULL.value:
-                # Set available to maxStock
-                await set_available_stock(self.bot, guild_id, channel_id, item_name, max_stock)
-                amount_added = max_stock - current_available
-            else:
-                # Increment available up to maxStock
-                await increment_available_stock(self.bot, guild_id, channel_id, item_name,
-                                                increment_amount, max_stock)
-                amount_added = min(increment_amount, max_stock - current_available)
+        # Unlimited items have no maxStock and are never restocked
+        max_stocks = {
+            item.get(CommonFields.NAME): item[ShopFields.MAX_STOCK]
+            for item in shop_data.get(ShopFields.SHOP_STOCK, [])
+            if item.get(ShopFields.MAX_STOCK) is not None
+        }
 
-            if amount_added > 0:
-                restocked_items.append((item_name, amount_added))
+        restocked_items = await restock_shop_stock(self.bot, guild_id, channel_id, max_stocks, mode,
+                                                   increment_amount)
 
         # Post restock notification to the shop channel
         if restocked_items:
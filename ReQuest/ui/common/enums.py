@@ -43,3 +43,13 @@ class DayOfWeek(Enum):
 class ShopChannelType(Enum):
     TEXT_CHANNEL = 'text_channel'
     FORUM_THREAD = 'forum_thread'
+
+
+class CharacterStorageMode(Enum):
+    EMBEDDED = 'embedded'
+    SPLIT = 'split'
+
+
+class StockEngine(Enum):
+    MONGO = 'mongo'
+    REDIS = 'redis'
@@ -71,6 +71,11 @@ class PageJumpModal(Modal):
 
             self.calling_view.current_page = page_num - 1
 
+            # Views that fetch one page at a time load the new page before rebuilding
+            load_page = getattr(self.calling_view, 'load_page', None)
+            if load_page:
+                await load_page(interaction.client)
+
             self.calling_view.build_view()
 
             await interaction.response.edit_message(view=self.calling_view)
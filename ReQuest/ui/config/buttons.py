@@ -22,7 +22,9 @@ from ReQuest.utilities.supportFunctions import (
     get_xp_config,
     remove_item_stock_limit,
     encode_mongo_key,
-    format_currency_amount
+    format_currency_amount,
+    unschedule_shop_restock,
+    delete_shop_stock
 )
 
 logger = logging.getLogger(__name__)
@@ -742,6 +744,8 @@ class RemoveShopButton(Button):
                 query={'_id': guild_id},
                 update_data={'$unset': {f'{ShopFields.SHOP_CHANNELS}.{channel_id}': ''}}
             )
+            await unschedule_shop_restock(bot, guild_id, channel_id)
+            await delete_shop_stock(bot, guild_id, channel_id)
 
             from ReQuest.ui.config.views import ConfigShopsView
             new_view = ConfigShopsView()
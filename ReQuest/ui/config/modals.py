@@ -37,7 +37,8 @@ from ReQuest.utilities.supportFunctions import (
     initialize_item_stock,
     get_item_stock,
     encode_mongo_key,
-    format_currency_amount
+    format_currency_amount,
+    schedule_shop_restock
 )
 
 logger = logging.getLogger(__name__)
@@ -255,9 +256,9 @@ class RenameDenominationModal(Modal):
             )
 
             # Invalidate cache
-            from ReQuest.utilities.supportFunctions import build_cache_key
+            from ReQuest.utilities.supportFunctions import build_cache_key, invalidate_cache
             cache_key = build_cache_key(bot.gdb.name, guild_id, DatabaseCollections.CURRENCY)
-            await bot.rdb.delete(cache_key)
+            await invalidate_cache(bot, cache_key)
 
             await setup_view(self.calling_view, interaction)
             await interaction.response.edit_message(view=self.calling_view)
@@ -2127,6 +2128,7 @@ class RestockScheduleModal(Modal):
                 query={CommonFields.ID: guild_id},
                 update_data={'$set': {f'{ShopFields.SHOP_CHANNELS}.{channel_id}': shop_data}}
             )
+            await schedule_shop_restock(bot, guild_id, channel_id, restock_config)
 
             # Refresh the view
             await setup_view(self.calling_view, interaction)
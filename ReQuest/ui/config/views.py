@@ -35,6 +35,7 @@ from ReQuest.utilities.supportFunctions import (
     format_consolidated_totals,
     get_xp_config,
     get_cached_data,
+    get_guild_configs,
     consolidate_currency_totals,
     get_shop_stock,
     escape_markdown,
@@ -665,33 +666,42 @@ class ConfigWizardView(LayoutView):
         try:
             bot = interaction.client
             guild = interaction.guild
-            gdb = interaction.client.gdb
 
             # Bot permissions
             bot_permission_text, bot_permission_warnings = self.validate_bot_permission(guild)
 
-            # Role configs
-            announcement_role_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.ANNOUNCE_ROLE,
-                query={CommonFields.ID: guild.id}
-            )
-            gm_roles_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.GM_ROLES,
-                query={CommonFields.ID: guild.id}
+            # Every config the scan reports on, read in one batch
+            configs = await get_guild_configs(
+                bot,
+                guild.id,
+                DatabaseCollections.ANNOUNCE_ROLE,
+                DatabaseCollections.GM_ROLES,
+                DatabaseCollections.QUEST_CHANNEL,
+                DatabaseCollections.PLAYER_BOARD_CHANNEL,
+                DatabaseCollections.ARCHIVE_CHANNEL,
+                DatabaseCollections.GM_TRANSACTION_LOG_CHANNEL,
+                DatabaseCollections.PLAYER_TRANSACTION_LOG_CHANNEL,
+                DatabaseCollections.SHOP_LOG_CHANNEL,
+                DatabaseCollections.APPROVAL_QUEUE_CHANNEL,
+                DatabaseCollections.QUEST_WAIT_LIST,
+                DatabaseCollections.QUEST_SUMMARY,
+                DatabaseCollections.GM_REWARDS,
+                DatabaseCollections.PLAYER_EXPERIENCE,
+                DatabaseCollections.CURRENCY,
+                DatabaseCollections.ROLEPLAY_CONFIG,
+                DatabaseCollections.SHOPS,
+                DatabaseCollections.INVENTORY_CONFIG,
+                DatabaseCollections.NEW_CHARACTER_SHOP,
+                DatabaseCollections.STATIC_KITS
             )
 
+            # Role configs
+            announcement_role_query = configs[DatabaseCollections.ANNOUNCE_ROLE]
+            gm_roles_query = configs[DatabaseCollections.GM_ROLES]
+
             # Channel configs
             channels = []
-            quest_channel_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.QUEST_CHANNEL,
-                query={CommonFields.ID: guild.id}
-            )
+            quest_channel_query = configs[DatabaseCollections.QUEST_CHANNEL]
             channels.append(
                 {
                     'name': 'Quest Board',
@@ -699,12 +709,7 @@ class ConfigWizardView(LayoutView):
                     'required': True}
             )
 
-            player_channel_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.PLAYER_BOARD_CHANNEL,
-                query={CommonFields.ID: guild.id}
-            )
+            player_channel_query = configs[DatabaseCollections.PLAYER_BOARD_CHANNEL]
             channels.append(
                 {
                     'name': 'Player Board',
@@ -712,12 +717,7 @@ class ConfigWizardView(LayoutView):
                     'required': False}
             )
 
-            archive_channel_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.ARCHIVE_CHANNEL,
-                query={CommonFields.ID: guild.id}
-            )
+            archive_channel_query = configs[DatabaseCollections.ARCHIVE_CHANNEL]
             channels.append(
                 {
                     'name': 'Quest Archive',
@@ -726,12 +726,7 @@ class ConfigWizardView(LayoutView):
                 }
             )
 
-            gm_log_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.GM_TRANSACTION_LOG_CHANNEL,
-                query={CommonFields.ID: guild.id}
-            )
+            gm_log_query = configs[DatabaseCollections.GM_TRANSACTION_LOG_CHANNEL]
             channels.append(
                 {
                     'name': 'GM Transaction Log',
@@ -740,12 +735,7 @@ class ConfigWizardView(LayoutView):
                 }
             )
 
-            player_transaction_log_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.PLAYER_TRANSACTION_LOG_CHANNEL,
-                query={CommonFields.ID: guild.id}
-            )
+            player_transaction_log_query = configs[DatabaseCollections.PLAYER_TRANSACTION_LOG_CHANNEL]
             channels.append(
                 {
                     'name': 'Player Transaction Log',
@@ -755,12 +745,7 @@ class ConfigWizardView(LayoutView):
                 }
             )
 
-            shop_log_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.SHOP_LOG_CHANNEL,
-                query={CommonFields.ID: guild.id}
-            )
+            shop_log_query = configs[DatabaseCollections.SHOP_LOG_CHANNEL]
             channels.append(
                 {
                     'name': 'Shop Log',
@@ -769,12 +754,7 @@ class ConfigWizardView(LayoutView):
                 }
             )
 
-            approval_queue_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.APPROVAL_QUEUE_CHANNEL,
-                query={CommonFields.ID: guild.id}
-            )
+            approval_queue_query = configs[DatabaseCollections.APPROVAL_QUEUE_CHANNEL]
             channels.append(
                 {
                     'name': 'Character Approval Queue',
@@ -784,72 +764,22 @@ class ConfigWizardView(LayoutView):
             )
 
             # Dashboard configs
-            wait_list_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.QUEST_WAIT_LIST,
-                query={CommonFields.ID: guild.id}
-            )
-            quest_summary_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.QUEST_SUMMARY,
-                query={CommonFields.ID: guild.id}
-            )
-            gm_rewards_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.GM_REWARDS,
-                query={CommonFields.ID: guild.id}
-            )
-            player_xp_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.PLAYER_EXPERIENCE,
-                query={CommonFields.ID: guild.id}
-            )
-            currency_config_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.CURRENCY,
-                query={CommonFields.ID: guild.id}
-            )
+            wait_list_query = configs[DatabaseCollections.QUEST_WAIT_LIST]
+            quest_summary_query = configs[DatabaseCollections.QUEST_SUMMARY]
+            gm_rewards_query = configs[DatabaseCollections.GM_REWARDS]
+            player_xp_query = configs[DatabaseCollections.PLAYER_EXPERIENCE]
+            currency_config_query = configs[DatabaseCollections.CURRENCY]
 
             # Roleplay config
-            roleplay_config_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.ROLEPLAY_CONFIG,
-                query={CommonFields.ID: guild.id}
-            )
+            roleplay_config_query = configs[DatabaseCollections.ROLEPLAY_CONFIG]
 
             # Shops config
-            shops_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.SHOPS,
-                query={CommonFields.ID: guild.id}
-            )
+            shops_query = configs[DatabaseCollections.SHOPS]
 
             # New character setup configs
-            inventory_config_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.INVENTORY_CONFIG,
-                query={CommonFields.ID: guild.id}
-            )
-            new_char_shop_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.NEW_CHARACTER_SHOP,
-                query={CommonFields.ID: guild.id}
-            )
-            static_kits_query = await get_cached_data(
-                bot=bot,
-                mongo_database=gdb,
-                collection_name=DatabaseCollections.STATIC_KITS,
-                query={CommonFields.ID: guild.id}
-            )
+            inventory_config_query = configs[DatabaseCollections.INVENTORY_CONFIG]
+            new_char_shop_query = configs[DatabaseCollections.NEW_CHARACTER_SHOP]
+            static_kits_query = configs[DatabaseCollections.STATIC_KITS]
 
             # Role validation report
             role_text, role_has_warnings = self.validate_roles(guild, gm_roles_query, announcement_role_query)
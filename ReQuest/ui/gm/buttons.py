@@ -1,8 +1,9 @@
 import logging
+import re
 
 import discord
 from discord import ButtonStyle
-from discord.ui import Button
+from discord.ui import Button, DynamicItem
 
 from ReQuest.ui.common.modals import ConfirmModal
 from ReQuest.ui.gm import modals
@@ -16,8 +17,10 @@ from ReQuest.utilities.supportFunctions import (
     get_cached_data,
     update_cached_data,
     delete_cached_data,
-    build_cache_key,
-    get_guild_member
+    get_guild_member,
+    get_posted_quest,
+    unindex_quest,
+    UserFeedbackError
 )
 
 logger = logging.getLogger(__name__)
@@ -175,12 +178,8 @@ class CancelQuestButton(Button):
                 cache_id=f'{guild_id}:{quest[QuestFields.QUEST_ID]}'
             )
 
-            # Delete the quest from the redis cache
-            admin_list_key = build_cache_key(bot.gdb.name, f'guild_quests:{guild_id}', 'quests')
-            await bot.rdb.delete(admin_list_key)
-
-            gm_list_key = build_cache_key(bot.gdb.name, f'gm_quests:{guild_id}:{quest[QuestFields.GM]}', 'quests')
-            await bot.rdb.delete(gm_list_key)
+            # Remove the quest from the guild and GM quest lists
+            await unindex_quest(bot, quest)
 
             # Delete the quest from the quest channel
             channel_query = await get_cached_data(
@@ -331,34 +330,65 @@ class IndividualRewardsButton(Button):
             await log_exception(e, interaction)
 
 
-class JoinQuestButton(Button):
-    def __init__(self, calling_view):
+class JoinQuestButton(DynamicItem[Button], template=r'join_quest_button(?::(?P<quest_id>[^:]+))?'):
+    """
+    Join button on a quest post. The quest is looked up from the custom ID when the button is pressed, so quest posts
+    stay interactive across restarts without registering a view per quest.
+    """
+    def __init__(self, quest_id: str | None = None):
         super().__init__(
-            label='Join',
-            style=ButtonStyle.success,
-            custom_id='join_quest_button'
+            Button(
+                label='Join',
+                style=ButtonStyle.success,
+                custom_id=f'join_quest_button:{quest_id}' if quest_id else 'join_quest_button'
+            )
         )
-        self.calling_view = calling_view
+        self.quest_id = quest_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match: re.Match[str], /):
+        return cls(match['quest_id'])
 
     async def callback(self, interaction: discord.Interaction):
         try:
-            await self.calling_view.join_callback(interaction)
+            from ReQuest.ui.gm.views import QuestPostView
+            quest = await get_posted_quest(interaction.client, interaction.guild_id, self.quest_id,
+                                           interaction.message.id)
+            if not quest:
+                raise UserFeedbackError('This quest no longer exists.')
+
+            await QuestPostView(quest).join_callback(interaction)
         except Exception as e:
             await log_exception(e, interaction)
 
 
-class LeaveQuestButton(Button):
-    def __init__(self, calling_view):
+class LeaveQuestButton(DynamicItem[Button], template=r'leave_quest_button(?::(?P<quest_id>[^:]+))?'):
+    """
+    Leave button on a quest post. The quest is looked up from the custom ID when the button is pressed.
+    """
+    def __init__(self, quest_id: str | None = None):
         super().__init__(
-            label='Leave',
-            style=ButtonStyle.danger,
-            custom_id='leave_quest_button'
+            Button(
+                label='Leave',
+                style=ButtonStyle.danger,
+                custom_id=f'leave_quest_button:{quest_id}' if quest_id else 'leave_quest_button'
+            )
         )
-        self.calling_view = calling_view
+        self.quest_id = quest_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match: re.Match[str], /):
+        return cls(match['quest_id'])
 
     async def callback(self, interaction: discord.Interaction):
         try:
-            await self.calling_view.leave_callback(interaction)
+            from ReQuest.ui.gm.views import QuestPostView
+            quest = await get_posted_quest(interaction.client, interaction.guild_id, self.quest_id,
+                                           interaction.message.id)
+            if not quest:
+                raise UserFeedbackError('This quest no longer exists.')
+
+            await QuestPostView(quest).leave_callback(interaction)
         except Exception as e:
             await log_exception(e, interaction)
 
@@ -19,7 +19,8 @@ from ReQuest.utilities.supportFunctions import (
     UserFeedbackError,
     update_cached_data,
     get_cached_data,
-    build_cache_key,
+    index_quest,
+    unindex_quest,
     escape_markdown
 )
 
@@ -203,12 +204,8 @@ class CreateQuestModal(Modal):
             quest_collection = bot.gdb[DatabaseCollections.QUESTS]
             await quest_collection.insert_one(quest)
 
-            # Clear the cached guild quests for the GM
-            admin_key = build_cache_key(bot.gdb.name, f'guild_quests:{guild_id}', 'quests')
-            await bot.rdb.delete(admin_key)
-
-            gm_key = build_cache_key(bot.gdb.name, f'gm_quests:{guild_id}:{author_id}', 'quests')
-            await bot.rdb.delete(gm_key)
+            # Add the quest to the guild and GM quest lists
+            await index_quest(bot, quest)
 
             await setup_view(self.calling_view, interaction)
             await interaction.response.edit_message(view=self.calling_view)
@@ -289,8 +286,13 @@ class EditQuestModal(Modal):
                 cache_id=f'{guild_id}:{self.quest[QuestFields.QUEST_ID]}'
             )
 
-            # Get the updated quest
-            self.quest.update(updates)
+            # Get the updated quest, re-filing it in the quest lists under its new title
+            if updates[QuestFields.TITLE] != self.quest.get(QuestFields.TITLE):
+                await unindex_quest(bot, self.quest)
+                self.quest.update(updates)
+                await index_quest(bot, self.quest)
+            else:
+                self.quest.update(updates)
 
             # Get the quest board channel
             quest_channel_query = await get_cached_data(
@@ -24,22 +24,32 @@ from ReQuest.utilities.constants import CharacterFields, QuestFields, ConfigFiel
 from ReQuest.utilities.supportFunctions import (
     log_exception,
     strip_id,
-    update_character_inventory,
-    update_character_experience,
+    apply_bulk_character_changes,
+    apply_character_changes,
+    split_reward_items,
     attempt_delete,
     update_quest_embed,
     setup_view,
     format_consolidated_totals,
     get_xp_config,
     UserFeedbackError,
+    get_active_character,
     get_cached_data,
+    get_many_cached_data,
+    CachedQuery,
+    get_player_data,
     delete_cached_data,
     update_cached_data,
     format_inventory_by_container,
-    replace_cached_data,
     escape_markdown,
     get_guild_member,
-    build_cache_key
+    build_roster_entry,
+    find_roster_entry,
+    get_posted_quest,
+    get_quest_page,
+    unindex_quest,
+    join_quest_roster,
+    leave_quest_roster
 )
 
 logger = logging.getLogger(__name__)
@@ -75,44 +85,36 @@ class GMQuestMenuView(LayoutView):
         super().__init__(timeout=None)
         self.quests = []
 
+        self.guild_id = None
+        self.gm_id = None
+
         self.items_per_page = 9
         self.current_page = 0
         self.total_pages = 1
 
     async def setup(self, bot, user, guild):
         try:
+            self.guild_id = guild.id
             # Check to see if the user has guild admin privileges. This lets them view any quest in the guild.
-            if user.guild_permissions.manage_guild:
-                query = {QuestFields.GUILD_ID: guild.id}
-                cache_id = f'guild_quests:{guild.id}'
-            else:
-                query = {QuestFields.GUILD_ID: guild.id, QuestFields.GM: user.id}
-                cache_id = f'gm_quests:{guild.id}:{user.id}'
-
-            self.quests = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.QUESTS,
-                query=query,
-                is_single=False,
-                cache_id=cache_id
-            )
-
-            if self.quests is None:
-                self.quests = []
-
-            self.quests.sort(key=lambda x: x.get(QuestFields.TITLE, '').lower())
-
-            self.total_pages = math.ceil(len(self.quests) / self.items_per_page)
-            if self.total_pages == 0:
-                self.total_pages = 1
-            if self.current_page >= self.total_pages:
-                self.current_page = max(0, self.total_pages - 1)
+            self.gm_id = None if user.guild_permissions.manage_guild else user.id
 
+            await self.load_page(bot)
             self.build_view()
         except Exception as e:
             await log_exception(e)
 
+    async def load_page(self, bot):
+        self.quests, total = await get_quest_page(bot, self.guild_id, self.gm_id, self.current_page,
+                                                  self.items_per_page)
+
+        self.total_pages = math.ceil(total / self.items_per_page)
+        if self.total_pages == 0:
+            self.total_pages = 1
+        if self.current_page >= self.total_pages:
+            self.current_page = max(0, self.total_pages - 1)
+            self.quests, _ = await get_quest_page(bot, self.guild_id, self.gm_id, self.current_page,
+                                                  self.items_per_page)
+
     def build_view(self):
         self.clear_items()
         container = Container()
@@ -130,11 +132,7 @@ class GMQuestMenuView(LayoutView):
         if not self.quests:
             container.add_item(TextDisplay("No quests found."))
         else:
-            start = self.current_page * self.items_per_page
-            end = start + self.items_per_page
-            page_items = self.quests[start:end]
-
-            for quest in page_items:
+            for quest in self.quests:
                 title = quest.get(QuestFields.TITLE, 'Untitled')
                 quest_id = quest.get(QuestFields.QUEST_ID, 'Unknown')
                 lock_state = " (Locked)" if quest.get(QuestFields.LOCK_STATE) else ""
@@ -180,12 +178,14 @@ class GMQuestMenuView(LayoutView):
     async def prev_page(self, interaction):
         if self.current_page > 0:
             self.current_page -= 1
+            await self.load_page(interaction.client)
             self.build_view()
             await interaction.response.edit_message(view=self)
 
     async def next_page(self, interaction):
         if self.current_page < self.total_pages - 1:
             self.current_page += 1
+            await self.load_page(interaction.client)
             self.build_view()
             await interaction.response.edit_message(view=self)
 
@@ -387,24 +387,37 @@ class ManageQuestsView(LayoutView):
             guild_id = interaction.guild_id
             guild = interaction.guild
 
-            # Refresh the quest state before attempting to complete it
-            refreshed_quest = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.QUESTS,
-                query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: self.selected_quest[QuestFields.QUEST_ID]},
-                cache_id=f'{guild_id}:{self.selected_quest[QuestFields.QUEST_ID]}'
-            )
+            # Refresh the quest state and read every config completion needs in one batch
+            quest_id = self.selected_quest[QuestFields.QUEST_ID]
+            (
+                refreshed_quest,
+                xp_query,
+                archive_query,
+                currency_config,
+                quest_channel_query,
+                gm_rewards_query
+            ) = await get_many_cached_data(bot, bot.gdb, [
+                CachedQuery(
+                    DatabaseCollections.QUESTS,
+                    {QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
+                    cache_id=f'{guild_id}:{quest_id}'
+                ),
+                CachedQuery(DatabaseCollections.PLAYER_EXPERIENCE, {CommonFields.ID: guild_id}),
+                CachedQuery(DatabaseCollections.ARCHIVE_CHANNEL, {CommonFields.ID: guild_id}),
+                CachedQuery(DatabaseCollections.CURRENCY, {CommonFields.ID: guild_id}),
+                CachedQuery(DatabaseCollections.QUEST_CHANNEL, {CommonFields.ID: guild_id}),
+                CachedQuery(DatabaseCollections.GM_REWARDS, {CommonFields.ID: guild_id})
+            ])
 
             if not refreshed_quest:
                 raise Exception('Could not find the specified quest in the database.')
 
             self.selected_quest = refreshed_quest
             quest = self.selected_quest
-            xp_enabled = await get_xp_config(interaction.client, guild_id)
+            # XP defaults to enabled when the guild hasn't configured it
+            xp_enabled = xp_query.get(ConfigFields.PLAYER_EXPERIENCE, True) if xp_query else True
 
             # Setup quest variables
-            quest_id = quest[QuestFields.QUEST_ID]
             message_id = quest[QuestFields.MESSAGE_ID]
             title = quest[QuestFields.TITLE]
             description = quest[QuestFields.DESCRIPTION]
@@ -416,12 +429,6 @@ class ManageQuestsView(LayoutView):
                 raise UserFeedbackError('You cannot complete a quest with an empty roster. Try cancelling instead.')
 
             archive_channel = None
-            archive_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.ARCHIVE_CHANNEL,
-                query={CommonFields.ID: guild_id}
-            )
             if archive_query:
                 archive_channel = guild.get_channel(strip_id(archive_query[ConfigFields.ARCHIVE_CHANNEL]))
 
@@ -439,6 +446,11 @@ class ManageQuestsView(LayoutView):
             xp_per_member = party_xp // len(party) if party else 0
             party_items = rewards.get(QuestFields.PARTY, {}).get(CommonFields.ITEMS, {})
 
+            # Work out every member's rewards first, then commit them all in one bulk write. Members whose rewards
+            # could not be applied are reported to the GM instead of being sent a rewards DM.
+            character_changes = []
+            reward_messages = []
+            character_labels = {}
             for entry in party:
                 for player_id, character_info in entry.items():
                     # If the player left the server, this will return None
@@ -449,7 +461,8 @@ class ManageQuestsView(LayoutView):
                     # Get character data
                     character_id = next(iter(character_info))
                     character = character_info[character_id]
-                    reward_summary.append(f'<@!{player_id}> as {character[CommonFields.NAME]}:')
+                    character_labels[character_id] = f'<@!{player_id}> as {character[CommonFields.NAME]}'
+                    reward_summary.append(f'{character_labels[character_id]}:')
 
                     # Prep reward data
                     total_xp = xp_per_member
@@ -467,23 +480,35 @@ class ManageQuestsView(LayoutView):
                         for item, quantity in (individual_rewards.get(CommonFields.ITEMS) or {}).items():
                             combined_items[item] = combined_items.get(item, 0) + quantity
 
-                    # Update the character's XP and inventory
+                    # Queue the character's XP and inventory update
                     if xp_enabled and total_xp > 0:
                         reward_summary.append(f'Experience: {total_xp}')
-                        await update_character_experience(interaction, int(player_id), character_id, total_xp)
                     for item_name, quantity in combined_items.items():
                         reward_summary.append(f'{item_name}: {quantity}')
-                        await update_character_inventory(interaction, int(player_id), character_id, item_name, quantity)
 
-                    # Send reward summary to player
+                    item_changes, currency_changes = split_reward_items(currency_config, combined_items)
+                    character_changes.append({
+                        'player_id': int(player_id),
+                        'character_id': character_id,
+                        'item_changes': item_changes,
+                        'currency_changes': currency_changes,
+                        'experience': total_xp if xp_enabled and total_xp > 0 else None
+                    })
+
+                    # Build reward summary for the player
                     reward_strings = self.build_reward_summary(total_xp, combined_items, xp_enabled)
                     dm_embed = discord.Embed(title=f'Quest Complete: {title}', type='rich')
                     if reward_strings:
                         dm_embed.add_field(name='Rewards', value='\n'.join(reward_strings))
-                    try:
-                        await member.send(embed=dm_embed)
-                    except discord.errors.Forbidden as e:
-                        logger.warning(f'Could not DM {member.id} about quest completion rewards: {e}')
+                    reward_messages.append((character_id, member, dm_embed))
+
+            failed_changes = await apply_bulk_character_changes(bot, character_changes, currency_config)
+            failed_character_ids = {change['character_id'] for change in failed_changes}
+
+            # Send reward summaries to players whose rewards were applied
+            await asyncio.gather(*[self.send_reward_message(member, dm_embed)
+                                   for character_id, member, dm_embed in reward_messages
+                                   if character_id not in failed_character_ids])
 
             # Build an embed for feedback
             quest_embed = discord.Embed(
@@ -510,19 +535,18 @@ class ManageQuestsView(LayoutView):
                 quest_embed.add_field(name='Summary', value=summary, inline=False)
             if reward_summary:
                 quest_embed.add_field(name='Rewards', value='\n'.join(reward_summary), inline=True)
+            if failed_character_ids:
+                quest_embed.add_field(
+                    name='Rewards Not Applied',
+                    value='\n'.join(f'- {character_labels[character_id]}' for character_id in failed_character_ids),
+                    inline=False
+                )
 
             # If an archive channel is configured, post the archived post
             if archive_channel:
                 await archive_channel.send(embed=quest_embed)
 
             # Delete the original quest post
-            quest_channel_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.QUEST_CHANNEL,
-                query={CommonFields.ID: guild_id}
-            )
-
             quest_channel_id = quest_channel_query[ConfigFields.QUEST_CHANNEL]
             quest_channel = interaction.client.get_channel(strip_id(quest_channel_id))
             if quest_channel:
@@ -538,53 +562,45 @@ class ManageQuestsView(LayoutView):
                 cache_id=f'{guild_id}:{quest_id}'
             )
 
-            admin_list_key = build_cache_key(bot.gdb.name, f'guild_quests:{guild_id}', 'quests')
-            await bot.rdb.delete(admin_list_key)
-
-            gm_list_key = build_cache_key(bot.gdb.name, f'gm_quests:{guild_id}:{gm}', 'quests')
-            await bot.rdb.delete(gm_list_key)
+            await unindex_quest(bot, quest)
 
             # Message feedback to the GM
             await interaction.user.send(embed=quest_embed)
 
             # Check if GM rewards are enabled, and reward the GM accordingly
-            gm_rewards_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.GM_REWARDS,
-                query={CommonFields.ID: guild_id}
-            )
             if gm_rewards_query:
                 experience = gm_rewards_query.get(CharacterFields.EXPERIENCE)
                 items = gm_rewards_query.get(CommonFields.ITEMS)
 
-                character_query = await get_cached_data(
-                    bot=bot,
-                    mongo_database=bot.mdb,
-                    collection_name=DatabaseCollections.CHARACTERS,
-                    query={CommonFields.ID: interaction.user.id}
-                )
+                character_query = await get_player_data(bot, interaction.user.id)
+                active_character_id, active_character = await get_active_character(bot, interaction.user.id,
+                                                                                   guild_id)
 
                 if not character_query:
                     character_string = ('Your server admin has configured rewards for Game Masters when they complete '
                                         'quests. However, since you have no registered characters, your rewards could '
                                         'not be automatically issued at this time.')
                 else:
-                    if str(guild_id) not in character_query.get(CharacterFields.ACTIVE_CHARACTERS, {}):
+                    if not active_character:
                         character_string = ('Your server admin has configured rewards for Game Masters when they '
                                             'complete quests. However, since you have no active character on this '
                                             'server, your rewards could not be automatically issued at this time.')
                     else:
-                        active_character_id = character_query[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
                         character_string = (f'The following has been awarded to your active character, '
-                                            f'{character_query[CharacterFields.CHARACTERS][active_character_id][CharacterFields.NAME]}')
-                        if experience and xp_enabled:
-                            await update_character_experience(interaction, interaction.user.id, active_character_id,
-                                                              experience)
-                        if items:
-                            for item_name, quantity in items.items():
-                                await update_character_inventory(interaction, interaction.user.id, active_character_id,
-                                                                 item_name, quantity)
+                                            f'{active_character[CharacterFields.NAME]}')
+                        item_changes, currency_changes = split_reward_items(currency_config, items or {})
+                        gm_rewards_applied = await apply_character_changes(
+                            bot, interaction.user.id, active_character_id,
+                            item_changes=item_changes,
+                            currency_changes=currency_changes,
+                            currency_config=currency_config,
+                            experience=experience if xp_enabled else None
+                        )
+                        if not gm_rewards_applied:
+                            character_string = ('Your server admin has configured rewards for Game Masters when they '
+                                                'complete quests. However, your active character could not be '
+                                                'updated, so your rewards could not be automatically issued at this '
+                                                'time.')
 
                 gm_rewards_embed = discord.Embed(
                     title='GM Rewards Issued',
@@ -612,6 +628,13 @@ class ManageQuestsView(LayoutView):
         except Exception as e:
             await log_exception(e, interaction)
 
+    @staticmethod
+    async def send_reward_message(member: discord.Member, embed: discord.Embed):
+        try:
+            await member.send(embed=embed)
+        except discord.errors.Forbidden as e:
+            logger.warning(f'Could not DM {member.id} about quest completion rewards: {e}')
+
     @staticmethod
     def build_reward_summary(xp, items, xp_enabled=True) -> list[str]:
         reward_strings = []
@@ -868,11 +891,6 @@ class RemovePlayerView(LayoutView):
             quest = self.quest
             quest_id = quest[QuestFields.QUEST_ID]
             message_id = quest[QuestFields.MESSAGE_ID]
-            party = quest[QuestFields.PARTY]
-            wait_list = quest[QuestFields.WAIT_LIST]
-            max_wait_list_size = quest[QuestFields.MAX_WAIT_LIST_SIZE]
-            lock_state = quest[QuestFields.LOCK_STATE]
-            rewards = quest[QuestFields.REWARDS]
 
             removed_member_id = self.selected_member_id
             guild_id = interaction.guild_id
@@ -890,6 +908,15 @@ class RemovePlayerView(LayoutView):
             channel = interaction.client.get_channel(channel_id)
             message = channel.get_partial_message(message_id)
 
+            # Remove the player, promote from the wait list and clear their rewards in one guarded update, so roster
+            # changes made since this view loaded the quest aren't overwritten
+            quest, promoted_entry, left_party = await leave_quest_roster(
+                bot, guild_id, quest_id, int(removed_member_id), self.selected_character_id
+            )
+            if not quest:
+                raise UserFeedbackError('That player is no longer on the quest roster.')
+            self.quest = quest
+            lock_state = quest[QuestFields.LOCK_STATE]
             party_role_id = quest[QuestFields.PARTY_ROLE_ID]
 
             # If the quest list is locked and a party role exists, fetch the role.
@@ -904,59 +931,31 @@ class RemovePlayerView(LayoutView):
                     logger.warning(f'Could not find member {removed_member_id} in guild {guild_id} to remove quest '
                                    f'role.')
 
-            removal_message = ''
-            player_found = False
-            # Check the wait list and remove the player if present
-            for waiting_player in wait_list:
-                if removed_member_id in waiting_player:
-                    wait_list.remove(waiting_player)
-                    player_found = True
-                    removal_message = f'The Game Master for **{quest[QuestFields.TITLE]}** has removed you from the wait list.'
-                    break
-
-            # If they're not in the wait list, they must be in the party
-            if not player_found:
-                for player in party:
-                    if removed_member_id in player:
-                        removal_message = f'The Game Master for **{quest[QuestFields.TITLE]}** has removed you from the party.'
-                        party.remove(player)
-
-                        # If there is a wait list, promote the first entry into the party
-                        if max_wait_list_size > 0 and wait_list:
-                            new_player = wait_list.pop(0)
-                            party.append(new_player)
-
-                            for key in new_player:
-                                new_member = await get_guild_member(guild, int(key))
-                                if new_member:
-                                    try:
-                                        await new_member.send(f'You have been added to the party for '
-                                                              f'**{quest[QuestFields.TITLE]}**, due to a player dropping!')
-
-                                        # If a role is set, assign it to the player
-                                        if role and lock_state:
-                                            await new_member.add_roles(role)
-                                    except discord.errors.Forbidden as e:
-                                        logger.warning(f'Could not DM {new_member.id} about party promotion: {e}')
-                                    except Exception as e:
-                                        logger.warning(f'Unhandled exception when attempting to DM '
-                                                       f'{new_member.id}: {e}')
-                                else:
-                                    logger.warning(f'Could not find member ID {key} in guild {guild.id}.')
-
-                        if rewards:
-                            if self.selected_character_id in rewards:
-                                del rewards[self.selected_character_id]
-                        break
-
-            await replace_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.QUESTS,
-                query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
-                new_data=self.quest,
-                cache_id=f'{guild_id}:{quest_id}'
-            )
+            if left_party:
+                removal_message = f'The Game Master for **{quest[QuestFields.TITLE]}** has removed you from the party.'
+            else:
+                removal_message = (f'The Game Master for **{quest[QuestFields.TITLE]}** has removed you from the wait '
+                                   f'list.')
+
+            # If a player was promoted from the wait list, let them know
+            if promoted_entry:
+                for key in promoted_entry:
+                    new_member = await get_guild_member(guild, int(key))
+                    if new_member:
+                        try:
+                            await new_member.send(f'You have been added to the party for '
+                                                  f'**{quest[QuestFields.TITLE]}**, due to a player dropping!')
+
+                            # If a role is set, assign it to the player
+                            if role and lock_state:
+                                await new_member.add_roles(role)
+                        except discord.errors.Forbidden as e:
+                            logger.warning(f'Could not DM {new_member.id} about party promotion: {e}')
+                        except Exception as e:
+                            logger.warning(f'Unhandled exception when attempting to DM '
+                                           f'{new_member.id}: {e}')
+                    else:
+                        logger.warning(f'Could not find member ID {key} in guild {guild.id}.')
 
             # Give the GM some feedback that the changes applied
             gm_member = await get_guild_member(guild, interaction.user.id)
@@ -999,8 +998,8 @@ class QuestPostView(View):
             type='rich'
         )
         self.quest = quest
-        self.join_button = buttons.JoinQuestButton(self)
-        self.leave_button = buttons.LeaveQuestButton(self)
+        self.join_button = buttons.JoinQuestButton(quest[QuestFields.QUEST_ID])
+        self.leave_button = buttons.LeaveQuestButton(quest[QuestFields.QUEST_ID])
         self.add_item(self.join_button)
         self.add_item(self.leave_button)
 
@@ -1017,91 +1016,42 @@ class QuestPostView(View):
             user_id = interaction.user.id
             quest_id = self.quest[QuestFields.QUEST_ID]
 
-            quest = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.QUESTS,
-                query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
-                cache_id=f'{guild_id}:{quest_id}'
-            )
-
-            current_party = quest[QuestFields.PARTY]
-            current_wait_list = quest[QuestFields.WAIT_LIST]
-            for player in current_party:
-                if str(user_id) in player:
-                    for character_id, character_data in player[str(user_id)].items():
-                        raise UserFeedbackError(f'You are already on this quest as {character_data[CommonFields.NAME]}')
-            max_wait_list_size = quest[QuestFields.MAX_WAIT_LIST_SIZE]
-            max_party_size = quest[QuestFields.MAX_PARTY_SIZE]
-
-            player_characters = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: user_id}
-            )
-            if (not player_characters or
-                    CharacterFields.ACTIVE_CHARACTERS not in player_characters or
-                    str(guild_id) not in player_characters[CharacterFields.ACTIVE_CHARACTERS]):
+            active_character_id, active_character = await get_active_character(bot, user_id, guild_id)
+            if not active_character:
                 raise UserFeedbackError(
                     'You do not have an active character on this server. Use the `/player` menus to create a new '
                     'character, or activate an existing one on this server.'
                 )
-            active_character_id = player_characters[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-            active_character = player_characters[CharacterFields.CHARACTERS][active_character_id]
 
-            if quest[QuestFields.LOCK_STATE]:
-                raise UserFeedbackError(
-                    f'Error joining quest **{quest[QuestFields.TITLE]}**: The quest is locked and not accepting new players.'
-                )
-            else:
-                new_player_entry = {f'{user_id}': {f'{active_character_id}': active_character}}
-                # If the wait list is enabled, this section formats the embed to include the wait list
-                if max_wait_list_size > 0:
-                    # If there is room in the party, add the user.
-                    if len(current_party) < max_party_size:
-                        await update_cached_data(
-                            bot=bot,
-                            mongo_database=bot.gdb,
-                            collection_name=DatabaseCollections.QUESTS,
-                            query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
-                            update_data={'$push': {QuestFields.PARTY: new_player_entry}},
-                            cache_id=f'{guild_id}:{quest_id}'
-                        )
-                        self.quest[QuestFields.PARTY].append(new_player_entry)
-                    # If the party is full but the wait list is not, add the user to wait list.
-                    elif len(current_party) >= max_party_size and len(current_wait_list) < max_wait_list_size:
-                        await update_cached_data(
-                            bot=bot,
-                            mongo_database=bot.gdb,
-                            collection_name=DatabaseCollections.QUESTS,
-                            query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
-                            update_data={'$push': {QuestFields.WAIT_LIST: new_player_entry}},
-                            cache_id=f'{guild_id}:{quest_id}'
-                        )
-                        self.quest[QuestFields.WAIT_LIST].append(new_player_entry)
+            new_player_entry = build_roster_entry(user_id, active_character_id, active_character)
+            quest, _ = await join_quest_roster(bot, guild_id, quest_id, user_id, new_player_entry)
 
-                    # Otherwise, inform the user that the party/wait list is full
-                    else:
-                        raise UserFeedbackError(f'Error joining quest **{quest[QuestFields.TITLE]}**: The quest roster is full!')
-                # If there is no wait list, this section formats the embed without it
-                else:
-                    # If there is room in the party, add the user.
-                    if len(current_party) < max_party_size:
-                        await update_cached_data(
-                            bot=bot,
-                            mongo_database=bot.gdb,
-                            collection_name=DatabaseCollections.QUESTS,
-                            query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
-                            update_data={'$push': {QuestFields.PARTY: new_player_entry}},
-                            cache_id=f'{guild_id}:{quest_id}'
-                        )
-                        self.quest[QuestFields.PARTY].append(new_player_entry)
-                    else:
-                        raise UserFeedbackError(f'Error joining quest **{quest[QuestFields.TITLE]}**: The quest roster is full!')
-
-                await setup_view(self, interaction)
-                await interaction.response.edit_message(embed=self.embed, view=self)
+            if not quest:
+                # The guarded update matched nothing; read the quest back to tell the player why
+                quest = await bot.gdb[DatabaseCollections.QUESTS].find_one(
+                    {QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id}
+                )
+                if not quest:
+                    raise UserFeedbackError('This quest no longer exists.')
+
+                for roster in (quest[QuestFields.PARTY], quest[QuestFields.WAIT_LIST]):
+                    entry = find_roster_entry(roster, user_id)
+                    if entry:
+                        for character_id, character_data in entry[str(user_id)].items():
+                            raise UserFeedbackError(
+                                f'You are already on this quest as {character_data[CommonFields.NAME]}'
+                            )
+
+                if quest[QuestFields.LOCK_STATE]:
+                    raise UserFeedbackError(
+                        f'Error joining quest **{quest[QuestFields.TITLE]}**: The quest is locked and not accepting '
+                        f'new players.'
+                    )
+                raise UserFeedbackError(f'Error joining quest **{quest[QuestFields.TITLE]}**: The quest roster is full!')
+
+            # Acknowledge now and leave the post edit to the renderer, which folds bursts of joins into one edit
+            await interaction.response.defer()
+            bot.quest_post_renderer.schedule(interaction.message, guild_id, quest_id)
         except Exception as e:
             await log_exception(e, interaction)
 
@@ -1112,42 +1062,18 @@ class QuestPostView(View):
             user_id = interaction.user.id
             guild = interaction.client.get_guild(guild_id)
 
-            quest = self.quest
-            quest_id = quest[QuestFields.QUEST_ID]
-            party = quest[QuestFields.PARTY]
-            wait_list = quest[QuestFields.WAIT_LIST]
-            max_wait_list_size = quest[QuestFields.MAX_WAIT_LIST_SIZE]
-            lock_state = quest[QuestFields.LOCK_STATE]
-
-            in_party = False
-            for player in party:
-                if str(user_id) in player:
-                    in_party = True
-            in_wait_list = False
-            if wait_list:
-                for player in wait_list:
-                    if str(user_id) in player:
-                        in_wait_list = True
-            if not in_party and not in_wait_list:
+            quest, promoted_entry, left_party = await leave_quest_roster(
+                bot, guild_id, self.quest[QuestFields.QUEST_ID], user_id
+            )
+            if not quest:
                 raise UserFeedbackError(f'You are not signed up for this quest.')
+            self.quest = quest
 
-            if in_wait_list:
-                for player in wait_list:
-                    if str(user_id) in player:
-                        wait_list.remove(player)
-                        break
-            else:
-                for player in party:
-                    if str(user_id) in player:
-                        party.remove(player)
-
+            if left_party:
                 new_member = None
-                # If there is a wait list, move the first entry into the party automatically
-                if max_wait_list_size > 0 and wait_list:
-                    new_player = wait_list.pop(0)
-                    party.append(new_player)
-
-                    for key in new_player:
+                # If a player was promoted from the wait list, let them know
+                if promoted_entry:
+                    for key in promoted_entry:
                         new_member = await get_guild_member(guild, int(key))
 
                     # Notify the member they have been moved into the main party
@@ -1164,7 +1090,7 @@ class QuestPostView(View):
 
                 # If the quest list is locked and a party role exists, fetch the role.
                 party_role_id = quest[QuestFields.PARTY_ROLE_ID]
-                if lock_state and party_role_id:
+                if quest[QuestFields.LOCK_STATE] and party_role_id:
                     role = guild.get_role(party_role_id)
 
                     # Get the member object and remove the role
@@ -1174,23 +1100,52 @@ class QuestPostView(View):
                     if new_member:
                         await new_member.add_roles(role)
 
-            # Update the database
-            await replace_cached_data(
-                bot=bot,
-                mongo_database=bot.gdb,
-                collection_name=DatabaseCollections.QUESTS,
-                query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
-                new_data=self.quest,
-                cache_id=f'{guild_id}:{quest_id}'
-            )
-
-            # Refresh the query with the new document and edit the post
-            await self.setup()
-            await interaction.response.edit_message(embed=self.embed, view=self)
+            await interaction.response.defer()
+            bot.quest_post_renderer.schedule(interaction.message, guild_id, quest[QuestFields.QUEST_ID])
         except Exception as e:
             await log_exception(e, interaction)
 
 
+# Seconds a quest post waits after a roster change before it is re-rendered, so a burst of changes is one edit
+QUEST_POST_RENDER_DELAY = 2.0
+
+
+class QuestPostRenderer:
+    """
+    Coalesces quest post re-renders. Roster changes schedule a render of their post; every change made before the
+    render reads the quest is covered by that one edit, and changes made after it schedule the next one.
+    """
+    def __init__(self, bot, delay: float = QUEST_POST_RENDER_DELAY):
+        self.bot = bot
+        self.delay = delay
+        self._pending: dict[int, asyncio.Task] = {}
+
+    def schedule(self, message: discord.Message, guild_id: int, quest_id: str):
+        if message.id in self._pending:
+            return
+        self._pending[message.id] = asyncio.create_task(self._render(message, guild_id, quest_id))
+
+    async def _render(self, message: discord.Message, guild_id: int, quest_id: str):
+        await asyncio.sleep(self.delay)
+        # Stop coalescing before the read, so any change that misses this render schedules another one
+        self._pending.pop(message.id, None)
+        try:
+            quest = await get_posted_quest(self.bot, guild_id, quest_id, message.id)
+            if not quest:
+                return
+
+            quest_view = QuestPostView(quest)
+            await quest_view.setup()
+            await message.edit(embed=quest_view.embed, view=quest_view)
+        except Exception as e:
+            await log_exception(e)
+
+    def cancel(self):
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+
 class ViewCharacterView(LayoutView):
     def __init__(self, member_id, character_data, currency_config, xp_enabled=True):
         super().__init__(timeout=None)
@@ -1277,10 +1232,14 @@ class ReviewSubmissionView(LayoutView):
             user_id = self.data['user_id']
             submission_id = self.data['submission_id']
 
-            for name, quantity in self.data.get(CommonFields.ITEMS, {}).items():
-                await update_character_inventory(interaction, user_id, character_id, name, quantity)
-            for name, quantity in self.data.get('currency', {}).items():
-                await update_character_inventory(interaction, user_id, character_id, name, quantity)
+            item_changes, currency_changes = split_reward_items(self.currency_config,
+                                                                self.data.get(CommonFields.ITEMS, {}))
+            extra_item_changes, extra_currency_changes = split_reward_items(self.currency_config,
+                                                                            self.data.get('currency', {}))
+            item_changes += extra_item_changes
+            currency_changes += extra_currency_changes
+            await apply_character_changes(bot, user_id, character_id, item_changes=item_changes,
+                                          currency_changes=currency_changes, currency_config=self.currency_config)
 
             await delete_cached_data(
                 bot=bot,
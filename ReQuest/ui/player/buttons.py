@@ -13,13 +13,15 @@ from ReQuest.utilities.supportFunctions import (
     setup_view,
     attempt_delete,
     build_cache_key,
-    get_cached_data,
+    invalidate_cache,
     update_cached_data,
     delete_cached_data,
+    delete_character,
     move_item_between_containers,
     format_inventory_by_container,
     UserFeedbackError,
     get_container_items,
+    find_item_key,
     delete_container,
     reorder_container
 )
@@ -74,36 +76,8 @@ class RemoveCharacterButton(Button):
             bot = interaction.client
             member_id = interaction.user.id
 
-            # Remove character from db
-            await update_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member_id},
-                update_data={'$unset': {f'{CharacterFields.CHARACTERS}.{self.character_id}': ''}}
-            )
-
-            # Unset active character if it was the one removed
-            character_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member_id}
-            )
-            if character_query and CharacterFields.ACTIVE_CHARACTERS in character_query:
-                updates = {}
-                for guild_id, active_character_id in character_query[CharacterFields.ACTIVE_CHARACTERS].items():
-                    if active_character_id == self.character_id:
-                        updates[f'{CharacterFields.ACTIVE_CHARACTERS}.{guild_id}'] = ''
-
-                if updates:
-                    await update_cached_data(
-                        bot=bot,
-                        mongo_database=bot.mdb,
-                        collection_name=DatabaseCollections.CHARACTERS,
-                        query={CommonFields.ID: member_id},
-                        update_data={'$unset': updates}
-                    )
+            # Remove character from db, clearing it as the active character wherever it was active
+            await delete_character(bot, member_id, self.character_id)
 
             await setup_view(self.calling_view, interaction)
             await interaction.response.edit_message(view=self.calling_view)
@@ -214,7 +188,7 @@ class RemovePlayerPostButton(Button):
             cache_id = f'{guild_id}:{interaction.user.id}'
             redis_key = build_cache_key(interaction.client.gdb.name, cache_id, DatabaseCollections.PLAYER_BOARD)
 
-            await interaction.client.rdb.delete(redis_key)
+            await invalidate_cache(interaction.client, redis_key)
 
             await setup_view(self.calling_view, interaction)
             await interaction.response.edit_message(view=self.calling_view)
@@ -739,11 +713,7 @@ class ConsumeFromContainerButton(Button):
             )
 
             # Find quantity (case-insensitive)
-            max_qty = 0
-            for name, qty in items.items():
-                if name.lower() == item_name.lower():
-                    max_qty = qty
-                    break
+            _, max_qty = find_item_key(items, item_name)
 
             modal = modals.ConsumeFromContainerModal(self.calling_view, item_name, max_qty)
             await interaction.response.send_modal(modal)
@@ -772,11 +742,7 @@ class MoveItemButton(Button):
             )
 
             # Find quantity (case-insensitive)
-            max_qty = 0
-            for name, qty in items.items():
-                if name.lower() == item_name.lower():
-                    max_qty = qty
-                    break
+            _, max_qty = find_item_key(items, item_name)
 
             view = MoveDestinationView(
                 self.calling_view,
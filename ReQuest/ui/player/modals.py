@@ -22,7 +22,10 @@ from ReQuest.utilities.supportFunctions import (
     strip_id,
     UserFeedbackError,
     get_cached_data,
-    update_cached_data,
+    get_player_data,
+    get_character,
+    get_active_character,
+    create_character,
     create_container,
     rename_container,
     get_container_name,
@@ -60,15 +63,10 @@ class TradeModal(Modal):
             quantity = float(self.item_quantity_text_input.value)
             item_name = self.item_name_text_input.value
 
-            member_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member_id}
-            )
-
-            member_active_character_id = member_query[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-            member_active_character = member_query[CharacterFields.CHARACTERS][member_active_character_id]
+            member_active_character_id, member_active_character = await get_active_character(bot, member_id,
+                                                                                             guild_id)
+            if not member_active_character:
+                raise UserFeedbackError('You do not have an active character on this server.')
 
             log_channel = None
             log_channel_query = await get_cached_data(
@@ -81,20 +79,15 @@ class TradeModal(Modal):
                 log_channel_id = strip_id(log_channel_query[ConfigFields.PLAYER_TRANSACTION_LOG_CHANNEL])
                 log_channel = interaction.guild.get_channel(log_channel_id)
 
-            target_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: target_id}
-            )
+            target_query = await get_player_data(bot, target_id)
             if not target_query:
                 raise UserFeedbackError('The player you are attempting to trade with has no characters!')
-            elif str(guild_id) not in target_query[CharacterFields.ACTIVE_CHARACTERS]:
+            target_active_character_id, target_active_character = await get_active_character(bot, target_id,
+                                                                                             guild_id)
+            if not target_active_character:
                 raise UserFeedbackError(
                     'The player you are attempting to trade with does not have an active character on this server!'
                 )
-            target_active_character_id = target_query[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-            target_active_character = target_query[CharacterFields.CHARACTERS][target_active_character_id]
 
             currency_query = await get_cached_data(
                 bot=bot,
@@ -177,23 +170,17 @@ class CharacterRegisterModal(Modal):
             character_name = self.name_text_input.value
             character_note = self.note_text_input.value
 
-            await update_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member_id},
-                update_data={'$set': {f'{CharacterFields.ACTIVE_CHARACTERS}.{guild_id}': character_id,
-                                      f'{CharacterFields.CHARACTERS}.{character_id}': {
-                                          CharacterFields.NAME: character_name,
-                                          'note': character_note,
-                                          'registeredDate': date,
-                                          CharacterFields.ATTRIBUTES: {
-                                              'level': None,
-                                              CharacterFields.EXPERIENCE: None,
-                                              CharacterFields.INVENTORY: {},
-                                              CharacterFields.CURRENCY: {}
-                                          }}}}
-            )
+            await create_character(bot, member_id, guild_id, character_id, {
+                CharacterFields.NAME: character_name,
+                'note': character_note,
+                'registeredDate': date,
+                CharacterFields.ATTRIBUTES: {
+                    'level': None,
+                    CharacterFields.EXPERIENCE: None,
+                    CharacterFields.INVENTORY: {},
+                    CharacterFields.CURRENCY: {}
+                }
+            })
 
             inventory_config = await get_cached_data(
                 bot=bot,
@@ -312,17 +299,10 @@ class SpendCurrencyModal(Modal):
             member_id = interaction.user.id
             guild_id = interaction.guild_id
 
-            character_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member_id}
-            )
-            if not character_query or str(guild_id) not in character_query[CharacterFields.ACTIVE_CHARACTERS]:
+            active_character_id, character_data = await get_active_character(bot, member_id, guild_id)
+            if not character_data:
                 raise UserFeedbackError("You do not have an active character on this server.")
 
-            active_character_id = character_query[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-            character_data = character_query[CharacterFields.CHARACTERS][active_character_id]
             current_wallet = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {})
 
             currency_config = await get_cached_data(
@@ -340,14 +320,8 @@ class SpendCurrencyModal(Modal):
 
             await update_character_inventory(interaction, member_id, active_character_id, currency_name, -amount)
 
-            updated_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: member_id}
-            )
-
-            new_wallet = updated_query[CharacterFields.CHARACTERS][active_character_id][CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {})
+            updated_character = await get_character(bot, member_id, active_character_id)
+            new_wallet = updated_character[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {})
 
             formatted_amount = format_price_string(amount, currency_name, currency_config)
             balance_lines = format_currency_display(new_wallet, currency_config)
@@ -36,8 +36,14 @@ from ReQuest.utilities.supportFunctions import (
     get_xp_config,
     UserFeedbackError,
     get_cached_data,
+    get_player_data,
+    get_player_characters,
+    get_character,
+    get_active_character,
+    apply_character_changes,
     update_cached_data,
     build_cache_key,
+    invalidate_cache,
     format_complex_cost,
     get_containers_sorted,
     get_container_name,
@@ -116,14 +122,9 @@ class CharacterBaseView(LayoutView):
     async def setup(self, interaction):
         try:
             bot = interaction.client
-            query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: interaction.user.id}
-            )
+            query = await get_player_data(bot, interaction.user.id)
 
-            self.characters = query.get(CharacterFields.CHARACTERS, {}) if query else {}
+            self.characters = await get_player_characters(bot, interaction.user.id) if query else {}
             self.active_character_id = query.get(CharacterFields.ACTIVE_CHARACTERS, {}).get(str(interaction.guild_id)) \
                 if query else None
 
@@ -262,12 +263,8 @@ class InventoryOverviewView(LayoutView):
     async def setup(self, interaction: discord.Interaction):
         bot = interaction.client
         guild_id = interaction.guild_id
-        query = await get_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: interaction.user.id}
-        )
+        self.active_character_id, self.active_character = await get_active_character(bot, interaction.user.id,
+                                                                                      guild_id)
 
         self.currency_config = await get_cached_data(
             bot=bot,
@@ -276,16 +273,7 @@ class InventoryOverviewView(LayoutView):
             query={CommonFields.ID: guild_id}
         )
 
-        if not query:
-            self.active_character = None
-            self.active_character_id = None
-        elif str(guild_id) not in query.get(CharacterFields.ACTIVE_CHARACTERS, {}):
-            self.active_character = None
-            self.active_character_id = None
-        else:
-            self.active_character_id = query[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-            self.active_character = query[CharacterFields.CHARACTERS][self.active_character_id]
-
+        if self.active_character:
             # Validate currencies in inventory and convert based on server config
             inventory_keys_to_check = list(self.active_character[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {}).keys())
 
@@ -297,55 +285,19 @@ class InventoryOverviewView(LayoutView):
                     is_currency, _ = find_currency_or_denomination(self.currency_config, item_name_key)
 
                     if is_currency:
-                        await update_character_inventory(
-                            interaction,
-                            interaction.user.id,
-                            self.active_character_id,
-                            item_name_key,
-                            float(quantity)
-                        )
-
                         # In the event a currency was given prior to being defined (and therefore stored as an item),
-                        # this second update removes the old entry from inventory and updates the currency dict
-                        inventory = self.active_character[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-                        if item_name_key in inventory:
-                            del inventory[item_name_key]  # Update local copy
-                            inv_path = f'{CharacterFields.CHARACTERS}.{self.active_character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}'
-                            collection = bot.mdb[DatabaseCollections.CHARACTERS]
-                            await collection.update_one(
-                                {CommonFields.ID: interaction.user.id},
-                                [
-                                    {
-                                        '$set': {
-                                            inv_path: {
-                                                '$arrayToObject': {
-                                                    '$filter': {
-                                                        'input': {'$objectToArray': f'${inv_path}'},
-                                                        'cond': {'$ne': ['$$this.k', item_name_key]}
-                                                    }
-                                                }
-                                            }
-                                        }
-                                    }
-                                ]
-                            )
-
-                            # Invalidate cache after direct collection update
-                            cache_key = build_cache_key(bot.mdb.name, interaction.user.id, DatabaseCollections.CHARACTERS)
-                            try:
-                                await bot.rdb.delete(cache_key)
-                            except Exception as e:
-                                logger.error(f"Redis delete failed: {e}")
+                        # move it from the inventory into the currency dict. Both changes are made in one guarded
+                        # update so a concurrent conversion can't credit the currency twice.
+                        await apply_character_changes(
+                            bot, interaction.user.id, self.active_character_id,
+                            item_changes=[(item_name_key, -quantity, None)],
+                            currency_changes=[(item_name_key, float(quantity))],
+                            currency_config=self.currency_config
+                        )
                         conversion_occurred = True
 
                 if conversion_occurred:
-                    query = await get_cached_data(
-                        bot=bot,
-                        mongo_database=bot.mdb,
-                        collection_name=DatabaseCollections.CHARACTERS,
-                        query={CommonFields.ID: interaction.user.id}
-                    )
-                    self.active_character = query[CharacterFields.CHARACTERS][self.active_character_id]
+                    self.active_character = await get_character(bot, interaction.user.id, self.active_character_id)
 
             # Get containers
             self.containers = get_containers_sorted(self.active_character)
@@ -502,14 +454,7 @@ class ContainerItemsView(LayoutView):
     async def setup(self, interaction: discord.Interaction):
         # Refresh character data
         bot = interaction.client
-        player_data = await get_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: interaction.user.id}
-        )
-
-        self.character_data = player_data[CharacterFields.CHARACTERS][self.character_id]
+        self.character_data = await get_character(bot, interaction.user.id, self.character_id)
 
         self.container_name = get_container_name(self.character_data, self.container_id)
         items_dict = get_container_items(self.character_data, self.container_id)
@@ -651,14 +596,7 @@ class MoveDestinationView(LayoutView):
     async def setup(self, interaction: discord.Interaction):
         # Refresh character data
         bot = interaction.client
-        player_data = await get_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: interaction.user.id}
-        )
-
-        self.source_view.character_data = player_data[CharacterFields.CHARACTERS][self.source_view.character_id]
+        self.source_view.character_data = await get_character(bot, interaction.user.id, self.source_view.character_id)
 
         all_containers = get_containers_sorted(self.source_view.character_data)
 
@@ -803,13 +741,7 @@ class ContainerManagementView(LayoutView):
     async def setup(self, interaction: discord.Interaction):
         # Refresh character data
         bot = interaction.client
-        player_data = await get_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: interaction.user.id}
-        )
-        self.character_data = player_data[CharacterFields.CHARACTERS][self.character_id]
+        self.character_data = await get_character(bot, interaction.user.id, self.character_id)
 
         self.containers = get_containers_sorted(self.character_data)
 
@@ -1119,7 +1051,7 @@ class PlayerBoardView(LayoutView):
             cache_id = f'{interaction.guild_id}:{interaction.user.id}'
             redis_key = build_cache_key(interaction.client.gdb.name, cache_id, DatabaseCollections.PLAYER_BOARD)
 
-            await interaction.client.rdb.delete(redis_key)
+            await invalidate_cache(interaction.client, redis_key)
 
             await setup_view(self, interaction)
             await interaction.response.edit_message(view=self)
@@ -1163,7 +1095,7 @@ class PlayerBoardView(LayoutView):
             cache_id = f'{interaction.guild_id}:{interaction.user.id}'
             redis_key = build_cache_key(interaction.client.gdb.name, cache_id, DatabaseCollections.PLAYER_BOARD)
 
-            await interaction.client.rdb.delete(redis_key)
+            await invalidate_cache(interaction.client, redis_key)
 
             await setup_view(self, interaction)
             await interaction.response.edit_message(view=self)
@@ -3,9 +3,10 @@ from discord import ButtonStyle
 from discord.ui import Button
 
 from ReQuest.ui.shop import modals
-from ReQuest.utilities.constants import CharacterFields, ShopFields, CommonFields, CartFields, DatabaseCollections
+from ReQuest.utilities.constants import ShopFields, CommonFields, CartFields, DatabaseCollections
 from ReQuest.utilities.supportFunctions import (
     log_exception,
+    get_active_character,
     get_cached_data,
     UserFeedbackError,
     clear_cart_and_release_stock,
@@ -123,16 +124,7 @@ class ViewCartButton(Button):
                 query={'_id': guild_id}
             )
 
-            character_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={'_id': user_id}
-            )
-            active_character = None
-            if character_query and str(guild_id) in character_query.get(CharacterFields.ACTIVE_CHARACTERS, {}):
-                character_id = character_query[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-                active_character = character_query[CharacterFields.CHARACTERS].get(character_id)
+            _, active_character = await get_active_character(bot, user_id, guild_id)
 
             # Load cart from database
             channel_id = self.calling_view.channel_id
@@ -22,13 +22,12 @@ from ReQuest.utilities.constants import (
 )
 from ReQuest.utilities.supportFunctions import (
     check_sufficient_funds,
-    apply_currency_change_local,
-    apply_item_change_local,
+    apply_character_changes,
     strip_id,
     format_consolidated_totals,
     consolidate_currency_totals,
+    get_active_character,
     get_cached_data,
-    update_cached_data,
     format_complex_cost,
     get_shop_stock,
     get_cart,
@@ -223,17 +222,15 @@ class ShopBaseView(LayoutView):
             item_name = item.get(CommonFields.NAME)
 
             # Use database-backed cart with reservation
-            success = await add_item_to_cart(
+            db_cart = await add_item_to_cart(
                 self.bot, self.guild_id, self.user_id, self.channel_id, item, option_index
             )
 
-            if not success:
+            if not db_cart:
                 raise UserFeedbackError(f'**{escape_markdown(item_name)}** is out of stock.')
 
-            # Refresh local cart cache and stock info
-            db_cart = await get_cart(self.bot, self.guild_id, self.user_id, self.channel_id)
-            if db_cart:
-                self.cart = db_cart.get(CartFields.ITEMS, {})
+            # The write returns the updated cart, so it can be rendered without reading it back
+            self.cart = db_cart.get(CartFields.ITEMS, {})
 
             # Refresh stock info after reservation
             self.stock_info = await get_shop_stock(self.bot, self.guild_id, self.channel_id)
@@ -447,21 +444,12 @@ class ShopCartView(LayoutView):
 
             channel_id = self.prev_view.channel_id
 
-            character_query = await get_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={'_id': user_id}
-            )
-
-            if not character_query or str(guild_id) not in character_query[CharacterFields.ACTIVE_CHARACTERS]:
+            active_char_id, character_data = await get_active_character(bot, user_id, guild_id)
+            if not character_data:
                 await interaction.response.send_message("You do not have an active character on this server.",
                                                         ephemeral=True)
                 return
 
-            active_char_id = character_query[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-            character_data = character_query[CharacterFields.CHARACTERS][active_char_id]
-
             for base_currency, amount in self.base_totals.items():
                 is_ok, msg = check_sufficient_funds(character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {}),
                                                     self.currency_config, base_currency, amount)
@@ -470,10 +458,9 @@ class ShopCartView(LayoutView):
                         f"Checkout failed: Insufficient {titlecase(base_currency)}.", ephemeral=True)
                     return
 
-            for base_currency, amount in self.base_totals.items():
-                character_data = apply_currency_change_local(character_data, self.currency_config,
-                                                             base_currency, -amount)
+            currency_changes = [(base_currency, -amount) for base_currency, amount in self.base_totals.items()]
 
+            item_changes = []
             added_items_summary = []
             for item_key, data in self.prev_view.cart.items():
                 item = data.get(CartFields.ITEM, data)  # Handle both DB and local formats
@@ -481,17 +468,17 @@ class ShopCartView(LayoutView):
                 qty_per_item = item.get(CommonFields.QUANTITY, 1)
                 total_qty = quantity * qty_per_item
 
-                character_data = apply_item_change_local(character_data, item[CommonFields.NAME], total_qty)
+                item_changes.append((item[CommonFields.NAME], total_qty, None))
                 summary_string = (f'{total_qty}x ' if total_qty > 1 else '') + escape_markdown(titlecase(item[CommonFields.NAME]))
                 added_items_summary.append(summary_string)
 
-            await update_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={'_id': user_id},
-                update_data={'$set': {f'characters.{active_char_id}': character_data}}
-            )
+            # Charge the wallet and deliver the items in one guarded update
+            purchased = await apply_character_changes(bot, user_id, active_char_id, item_changes=item_changes,
+                                                      currency_changes=currency_changes,
+                                                      currency_config=self.currency_config)
+            if not purchased:
+                await interaction.response.send_message("Checkout failed: Insufficient funds.", ephemeral=True)
+                return
 
             # Finalize stock (remove from reserved counts) and clear cart from database
             await finalize_cart_purchase(bot, guild_id, user_id, channel_id)
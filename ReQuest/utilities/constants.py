@@ -8,6 +8,7 @@ class CharacterFields:
     ITEMS = 'items'
     EXPERIENCE = 'experience'
     NAME = 'name'
+    OWNER_ID = 'ownerId'
 
 
 class QuestFields:
@@ -44,6 +45,9 @@ class ShopFields:
     ENABLED = 'enabled'
     CHANNEL_TYPE = 'channelType'
     PARENT_FORUM_ID = 'parentForumId'
+    GUILD_ID = 'guildId'
+    CHANNEL_ID = 'channelId'
+    ITEMS = 'items'
 
 
 class CurrencyFields:
@@ -157,3 +161,4 @@ class DatabaseCollections:
     SHOPS = 'shops'
     STATIC_KITS = 'staticKits'
     CHARACTERS = 'characters'
+    CHARACTER_DATA = 'characterData'
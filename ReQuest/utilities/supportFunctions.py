@@ -1,16 +1,24 @@
+import asyncio
 import inspect
 import json
 import logging
+import math
 import re
+import time
 import traceback
+from collections import OrderedDict
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
 from typing import Tuple
 
 import discord
 import shortuuid
 from discord import app_commands
+from pymongo import ReturnDocument, UpdateOne
 from titlecase import titlecase
 from datetime import datetime, timezone, timedelta
 
+from ReQuest.ui.common.enums import CharacterStorageMode, RestockMode, ScheduleType, StockEngine
 from ReQuest.utilities.constants import (
     CharacterFields, QuestFields, ShopFields, CurrencyFields,
     ConfigFields, RoleplayFields, RestockFields, CartFields, ContainerFields, CommonFields,
@@ -31,6 +39,191 @@ def build_cache_key(database_name, identifier, collection_name):
     return f'{database_name}:{identifier}:{collection_name}'
 
 
+class LocalCache:
+    """
+    Bounded in-process cache that sits in front of Redis.
+
+    Entries are keyed by build_cache_key and hold the raw JSON string, so each hit decodes a fresh object that callers
+    are free to mutate. The least recently used entry is evicted once max_size is reached, and entries expire after
+    ttl seconds. A max_size of 0 disables the cache.
+
+    Compiled entries hold read-only objects derived from a cached document (e.g. a RoleplayFilter). They share the
+    document's key, so invalidating the document also drops anything compiled from it.
+    """
+    def __init__(self, max_size: int = 2048, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = True
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._compiled: OrderedDict[str, tuple[float, object]] = OrderedDict()
+
+    def _get(self, entries: OrderedDict, key: str):
+        if not self.enabled:
+            return None
+
+        entry = entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del entries[key]
+            return None
+
+        entries.move_to_end(key)
+        return value
+
+    def _set(self, entries: OrderedDict, key: str, value):
+        if not self.enabled or self.max_size <= 0:
+            return
+
+        entries[key] = (time.monotonic() + self.ttl, value)
+        entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def get(self, key: str) -> str | None:
+        return self._get(self._entries, key)
+
+    def set(self, key: str, value: str):
+        self._set(self._entries, key, value)
+
+    def get_compiled(self, key: str):
+        return self._get(self._compiled, key)
+
+    def set_compiled(self, key: str, value):
+        self._set(self._compiled, key, value)
+
+    def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+            self._compiled.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._compiled.clear()
+
+
+CACHE_INVALIDATION_CHANNEL = 'request:cacheInvalidation'
+
+
+class CacheInvalidationBus:
+    """
+    Keeps the local cache of every bot process coherent over a redis pub/sub channel.
+
+    Each process publishes the keys it invalidates and evicts the keys published by everyone else. While the
+    subscription is down the local cache is disabled, and it is cleared on every (re)subscribe, since any
+    invalidations sent during the gap were missed.
+    """
+    def __init__(self, bot, channel: str = CACHE_INVALIDATION_CHANNEL):
+        self.bot = bot
+        self.channel = channel
+        self.origin_id = shortuuid.uuid()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None:
+            self.bot.local_cache.enabled = False
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def build_message(self, *cache_keys: str) -> str:
+        return json.dumps({'origin': self.origin_id, 'keys': list(cache_keys)})
+
+    def handle_message(self, message: dict):
+        try:
+            payload = json.loads(message['data'])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f'Malformed cache invalidation message: {message}')
+            return
+
+        if payload.get('origin') == self.origin_id:
+            return
+
+        self.bot.local_cache.delete(*payload.get('keys', []))
+
+    async def _listen(self):
+        retry_delay = 1
+        while True:
+            pubsub = self.bot.rdb.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+
+                # Resync: anything cached before this point may have missed an invalidation
+                self.bot.local_cache.clear()
+                self.bot.local_cache.enabled = True
+                retry_delay = 1
+
+                async for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self.handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f'Cache invalidation subscription lost, retrying in {retry_delay}s: {e}')
+            finally:
+                self.bot.local_cache.enabled = False
+                self.bot.local_cache.clear()
+                try:
+                    await pubsub.aclose()
+                except Exception as e:
+                    logger.debug(f'Failed to close cache invalidation subscription: {e}')
+
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30)
+
+
+async def invalidate_cache(bot, *cache_keys: str):
+    """
+    Evicts the given keys from the local cache and from redis, and notifies other bot processes to evict them from
+    their local caches.
+
+    :param bot: the discord bot instance
+    :param cache_keys: keys built with build_cache_key
+    """
+    if not cache_keys:
+        return
+
+    bot.local_cache.delete(*cache_keys)
+
+    try:
+        async with bot.rdb.pipeline(transaction=False) as pipe:
+            pipe.delete(*cache_keys)
+            pipe.publish(bot.cache_bus.channel, bot.cache_bus.build_message(*cache_keys))
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Redis delete failed: {e}")
+
+
+_redis_scripts = {}
+
+
+def get_redis_script(bot, source: str):
+    """
+    Returns a Lua script registered with the bot's Redis client, registering it the first time it is used. Scripts
+    run by their SHA and are loaded into Redis automatically if Redis doesn't have them.
+
+    :param bot: the discord bot instance
+    :param source: the Lua source of the script
+    """
+    script_key = (id(bot.rdb), source)
+    script = _redis_scripts.get(script_key)
+    if script is None:
+        script = bot.rdb.register_script(source)
+        _redis_scripts[script_key] = script
+    return script
+
+
 async def get_cached_data(bot, mongo_database, collection_name, query, is_single=True, cache_id=None):
     """
     Fetches a document from mongodb using redis caching.
@@ -52,9 +245,14 @@ async def get_cached_data(bot, mongo_database, collection_name, query, is_single
 
     cache_key = build_cache_key(mongo_database.name, cache_id, collection_name)
 
+    local_cached = bot.local_cache.get(cache_key)
+    if local_cached:
+        return json.loads(local_cached)
+
     try:
         cached = await bot.rdb.get(cache_key)
         if cached:
+            bot.local_cache.set(cache_key, cached)
             return json.loads(cached)
     except Exception as e:
         logger.error(f"Redis read failed: {e}")
@@ -63,21 +261,17 @@ async def get_cached_data(bot, mongo_database, collection_name, query, is_single
     try:
         if is_single:
             data = await mongo_database[collection_name].find_one(query)
-
-            if data:
-                try:
-                    await bot.rdb.set(cache_key, json.dumps(data, default=str), ex=3600)
-                except Exception as e:
-                    logger.error(f"Redis write failed: {e}")
         else:
             cursor = mongo_database[collection_name].find(query)
             data = await cursor.to_list(length=None)
 
-            if data:
-                try:
-                    await bot.rdb.set(cache_key, json.dumps(data, default=str), ex=3600)
-                except Exception as e:
-                    logger.error(f"Redis write failed: {e}")
+        if data:
+            serialized = json.dumps(data, default=str)
+            bot.local_cache.set(cache_key, serialized)
+            try:
+                await bot.rdb.set(cache_key, serialized, ex=3600)
+            except Exception as e:
+                logger.error(f"Redis write failed: {e}")
 
         return data
     except Exception as e:
@@ -85,6 +279,110 @@ async def get_cached_data(bot, mongo_database, collection_name, query, is_single
         return None
 
 
+class CachedQuery:
+    """
+    One single-document lookup for get_many_cached_data, with the same query and cache_id semantics as
+    get_cached_data.
+    """
+    def __init__(self, collection_name: str, query: dict, cache_id=None):
+        if cache_id is None:
+            if CommonFields.ID in query:
+                cache_id = query[CommonFields.ID]
+            else:
+                raise ValueError('cache_id must be provided if "_id" is not in the query.')
+
+        self.collection_name = collection_name
+        self.query = query
+        self.cache_id = cache_id
+
+
+async def get_many_cached_data(bot, mongo_database, queries: list[CachedQuery]) -> list:
+    """
+    Fetches several documents through the cache in as few round trips as possible: local cache hits are served
+    directly, the remaining keys are read with a single MGET, and anything still missing is read from mongodb
+    concurrently and written back to redis in one pipeline.
+
+    :param bot: the discord bot instance
+    :param mongo_database: the mongodb database instance
+    :param queries: the documents to fetch
+
+    :return: the fetched documents, in the order of queries, with None for any not found
+    """
+    cache_keys = [build_cache_key(mongo_database.name, query.cache_id, query.collection_name) for query in queries]
+    results = [None] * len(queries)
+
+    missing = []
+    for index, cache_key in enumerate(cache_keys):
+        local_cached = bot.local_cache.get(cache_key)
+        if local_cached:
+            results[index] = json.loads(local_cached)
+        else:
+            missing.append(index)
+
+    if not missing:
+        return results
+
+    try:
+        cached_values = await bot.rdb.mget([cache_keys[index] for index in missing])
+    except Exception as e:
+        logger.error(f"Redis read failed: {e}")
+        await log_exception(e)
+        cached_values = [None] * len(missing)
+
+    uncached = []
+    for index, cached in zip(missing, cached_values):
+        if cached:
+            bot.local_cache.set(cache_keys[index], cached)
+            results[index] = json.loads(cached)
+        else:
+            uncached.append(index)
+
+    if not uncached:
+        return results
+
+    documents = await asyncio.gather(
+        *[mongo_database[queries[index].collection_name].find_one(queries[index].query) for index in uncached],
+        return_exceptions=True
+    )
+
+    writes = {}
+    for index, document in zip(uncached, documents):
+        if isinstance(document, Exception):
+            await log_exception(document)
+            continue
+        if document:
+            serialized = json.dumps(document, default=str)
+            bot.local_cache.set(cache_keys[index], serialized)
+            writes[cache_keys[index]] = serialized
+            results[index] = document
+
+    if writes:
+        try:
+            async with bot.rdb.pipeline(transaction=False) as pipe:
+                for cache_key, serialized in writes.items():
+                    pipe.set(cache_key, serialized, ex=3600)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis write failed: {e}")
+
+    return results
+
+
+async def get_guild_configs(bot, guild_id: int, *collection_names: str) -> dict:
+    """
+    Fetches several of a guild's config documents with get_many_cached_data.
+
+    :param bot: the discord bot instance
+    :param guild_id: the guild ID
+    :param collection_names: the config collections to read
+
+    :return: dict mapping each collection name to its document, or None if not configured
+    """
+    queries = [CachedQuery(collection_name, {CommonFields.ID: guild_id}) for collection_name in collection_names]
+    documents = await get_many_cached_data(bot, bot.gdb, queries)
+    return dict(zip(collection_names, documents))
+
+
 async def update_cached_data(bot, mongo_database, collection_name, query, update_data,
                              is_single: bool = True, cache_id=None):
     """
@@ -123,10 +421,7 @@ async def update_cached_data(bot, mongo_database, collection_name, query, update
     except Exception as e:
         raise Exception(f'Error updating config in database: {e}') from e
 
-    try:
-        await bot.rdb.delete(cache_key)
-    except Exception as e:
-        logger.error(f"Redis delete failed: {e}")
+    await invalidate_cache(bot, cache_key)
 
 
 async def replace_cached_data(bot, mongo_database, collection_name, query, new_data, cache_id=None):
@@ -158,10 +453,7 @@ async def replace_cached_data(bot, mongo_database, collection_name, query, new_d
     except Exception as e:
         raise Exception(f'Error replacing config in database: {e}') from e
 
-    try:
-        await bot.rdb.delete(cache_key)
-    except Exception as e:
-        logger.error(f"Redis delete failed: {e}")
+    await invalidate_cache(bot, cache_key)
 
 
 async def delete_cached_data(bot, mongo_database, collection_name, search_filter,
@@ -193,10 +485,7 @@ async def delete_cached_data(bot, mongo_database, collection_name, search_filter
     except Exception as e:
         raise Exception(f'Error deleting config in database: {e}') from e
 
-    try:
-        await bot.rdb.delete(cache_key)
-    except Exception as e:
-        logger.error(f"Redis delete failed: {e}")
+    await invalidate_cache(bot, cache_key)
 
 
 async def attempt_delete(message: discord.Message | discord.PartialMessage):
@@ -299,6 +588,272 @@ async def log_exception(exception, interaction=None):
             logger.error(f'Failed to handle exception in log_exception: {e}')
 
 
+# ----- Database Indexes -----
+
+
+class IndexDefinition:
+    """
+    An index the bot's queries rely on, along with a sample of the query shape it serves so the query plan can be
+    audited.
+
+    :param database: The bot attribute holding the database (mdb, gdb or cdb)
+    :param collection: The collection name
+    :param keys: The index keys, as a list of (field, direction) tuples
+    :param query: A sample filter with the shape of the queries the index serves
+    :param options: Any further create_index options
+    """
+    def __init__(self, database: str, collection: str, keys: list[Tuple[str, int]], query: dict | None = None,
+                 **options):
+        self.database = database
+        self.collection = collection
+        self.keys = keys
+        self.query = query
+        self.options = options
+
+    def get_collection(self, bot):
+        return getattr(bot, self.database)[self.collection]
+
+    def __repr__(self):
+        return f'{self.database}.{self.collection} {self.keys}'
+
+
+DATABASE_INDEXES = [
+    IndexDefinition('gdb', DatabaseCollections.QUESTS, [(QuestFields.GUILD_ID, 1), (QuestFields.QUEST_ID, 1)],
+                    query={QuestFields.GUILD_ID: 0, QuestFields.QUEST_ID: ''}),
+    IndexDefinition('gdb', DatabaseCollections.QUESTS, [(QuestFields.GUILD_ID, 1), (QuestFields.GM, 1)],
+                    query={QuestFields.GUILD_ID: 0, QuestFields.GM: 0}),
+    IndexDefinition('gdb', DatabaseCollections.QUESTS, [(QuestFields.GUILD_ID, 1), (QuestFields.MESSAGE_ID, 1)],
+                    query={QuestFields.GUILD_ID: 0, QuestFields.MESSAGE_ID: 0}),
+    IndexDefinition('gdb', DatabaseCollections.PLAYER_BOARD, [('guildId', 1), ('postId', 1)],
+                    query={'guildId': 0, 'postId': ''}),
+    IndexDefinition('gdb', DatabaseCollections.PLAYER_BOARD, [('guildId', 1), ('playerId', 1)],
+                    query={'guildId': 0, 'playerId': 0}),
+    IndexDefinition('gdb', DatabaseCollections.PLAYER_BOARD, [('guildId', 1), ('timestamp', 1)],
+                    query={'guildId': 0, 'timestamp': {'$lt': datetime.min}}),
+    IndexDefinition('gdb', DatabaseCollections.APPROVALS, [('submission_id', 1)],
+                    query={'submission_id': ''}),
+    IndexDefinition('gdb', DatabaseCollections.SHOP_CARTS, [(CartFields.EXPIRES_AT, 1)],
+                    query={CartFields.EXPIRES_AT: {'$lt': datetime.min}}),
+    IndexDefinition('mdb', DatabaseCollections.CHARACTER_DATA, [(CharacterFields.OWNER_ID, 1)],
+                    query={CharacterFields.OWNER_ID: 0})
+]
+
+
+async def ensure_indexes(bot):
+    """
+    Creates every declared index that does not already exist. Creating an existing index is a no-op, so this is safe
+    to run on every startup. A failure to create one index is logged and does not stop the rest.
+
+    :param bot: The Discord bot instance
+    """
+    for index in DATABASE_INDEXES:
+        try:
+            await index.get_collection(bot).create_index(index.keys, **index.options)
+        except Exception as e:
+            logger.error(f'Failed to create index {index}: {e}')
+
+
+def find_plan_stages(plan: dict) -> list[str]:
+    """Returns the name of every stage in an explain() query plan."""
+    stages = [plan['stage']] if 'stage' in plan else []
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            stages += find_plan_stages(plan[key])
+    for child in plan.get('inputStages', []):
+        stages += find_plan_stages(child)
+    return stages
+
+
+async def audit_query_plans(bot) -> list[str]:
+    """
+    Explains the sample query of every declared index and warns about any that would scan the whole collection.
+
+    :param bot: The Discord bot instance
+
+    :return: A list describing each query shape planned as a collection scan
+    """
+    collection_scans = []
+    for index in DATABASE_INDEXES:
+        if index.query is None:
+            continue
+
+        try:
+            explanation = await index.get_collection(bot).find(index.query).explain()
+        except Exception as e:
+            logger.error(f'Failed to explain query for index {index}: {e}')
+            continue
+
+        if 'COLLSCAN' in find_plan_stages(explanation.get('queryPlanner', {}).get('winningPlan', {})):
+            logger.warning(f'Query {index.query} on {index.database}.{index.collection} is a collection scan.')
+            collection_scans.append(f'{index.database}.{index.collection}: {index.query}')
+
+    return collection_scans
+
+
+# ----- Currency -----
+
+
+# Largest denominator used when recovering the decimal value a float amount was meant to hold
+CURRENCY_MAX_DENOMINATOR = 1_000_000
+
+
+def to_exact_amount(amount) -> Fraction:
+    """Converts a currency amount to an exact fraction, recovering the decimal value a float was meant to hold."""
+    if isinstance(amount, float):
+        return Fraction(amount).limit_denominator(CURRENCY_MAX_DENOMINATOR)
+    return Fraction(amount)
+
+
+def format_two_places(amount) -> str:
+    """Formats a currency amount to two decimal places, rounding half up."""
+    amount = to_exact_amount(amount)
+    value = Decimal(amount.numerator) / Decimal(amount.denominator)
+    return str(value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+
+class CurrencySystem:
+    """
+    A single currency and its denominations. Every denomination is valued in integer units of the smallest
+    denomination, so balances and change-making use exact integer math.
+    """
+    def __init__(self, currency: dict):
+        self.name = currency[CommonFields.NAME]
+        self.key = self.name.lower()
+        self.is_double = currency.get(CurrencyFields.IS_DOUBLE, False)
+
+        values = {self.key: (self.name, Fraction(1))}
+        for denomination in currency.get(CurrencyFields.DENOMINATIONS, []):
+            name = denomination[CommonFields.NAME]
+            values[name.lower()] = (name, to_exact_amount(float(denomination[CurrencyFields.VALUE])))
+
+        if any(value <= 0 for _, value in values.values()):
+            raise ValueError(f'Currency {self.name} has a non-positive denomination value.')
+
+        # Scale every value to an integer, then divide out the common factor so the smallest denomination is 1 unit
+        scale = math.lcm(*(value.denominator for _, value in values.values()))
+        scaled = {key: int(value * scale) for key, (_, value) in values.items()}
+        common = math.gcd(*scaled.values())
+
+        self.display_names = {key: name for key, (name, _) in values.items()}
+        self.units = {key: amount // common for key, amount in scaled.items()}
+        self.base_units = self.units[self.key]
+        self.descending = sorted(self.units.items(), key=lambda x: -x[1])
+
+    def to_units(self, name: str, amount) -> Fraction:
+        """Converts an amount of one of this currency's denominations to units."""
+        return to_exact_amount(amount) * self.units[name.lower()]
+
+    def wallet_units(self, wallet: dict) -> Fraction:
+        """Totals a wallet, keyed by lowercase denomination name, in units."""
+        return sum((to_exact_amount(quantity) * self.units[key] for key, quantity in wallet.items()
+                    if key in self.units), Fraction(0))
+
+    def make_change(self, total_units: int) -> dict:
+        """Splits a number of units into the fewest coins, keyed by lowercase denomination name."""
+        change = {}
+        if total_units <= 0:
+            return change
+
+        for key, units in self.descending:
+            quantity, total_units = divmod(total_units, units)
+            if quantity > 0:
+                change[key] = quantity
+        return change
+
+    def units_to_base(self, total_units) -> Fraction:
+        """Converts a number of units to an amount of the base currency."""
+        return Fraction(total_units) / self.base_units
+
+
+class CurrencyIndex:
+    """
+    Compiled form of a server's currency config. Currency and denomination names resolve case-insensitively in
+    constant time, and each valid currency is compiled to a CurrencySystem. Indexes are shared between callers through
+    get_currency_index, so treat them as read-only.
+    """
+    def __init__(self, currency_config: dict | None):
+        # Lowercase base currency name -> CurrencySystem
+        self.systems: dict[str, CurrencySystem] = {}
+        # Lowercase currency or denomination name -> (display name, parent currency display name)
+        self.names: dict[str, tuple[str, str]] = {}
+        # Lowercase base currency name -> {lowercase denomination name: value in the base currency}
+        self.denomination_maps: dict[str, dict[str, float]] = {}
+        # Lowercase base currency name -> is_double flag
+        self.is_double: dict[str, bool] = {}
+
+        for currency in (currency_config or {}).get(CurrencyFields.CURRENCIES, []):
+            name = currency[CommonFields.NAME]
+            key = name.lower()
+
+            # The first match wins, matching a scan of the config in order
+            if key not in self.denomination_maps:
+                denomination_map = {key: 1.0}
+                for denomination in currency.get(CurrencyFields.DENOMINATIONS, []):
+                    denomination_map[denomination[CommonFields.NAME].lower()] = float(denomination[CurrencyFields.VALUE])
+                self.denomination_maps[key] = denomination_map
+                self.is_double[key] = currency.get(CurrencyFields.IS_DOUBLE, False)
+
+            self.names.setdefault(key, (name, name))
+            for denomination in currency.get(CurrencyFields.DENOMINATIONS, []):
+                self.names.setdefault(denomination[CommonFields.NAME].lower(), (denomination[CommonFields.NAME], name))
+
+            try:
+                system = CurrencySystem(currency)
+            except ValueError as e:
+                logger.warning(f'Skipping invalid currency config: {e}')
+                continue
+            self.systems.setdefault(system.key, system)
+
+    def find(self, name: str) -> tuple[str | None, str | None]:
+        """Returns the display name of a currency or denomination and the name of its parent currency."""
+        return self.names.get(name.lower(), (None, None))
+
+    def system_for(self, name: str) -> CurrencySystem | None:
+        """Returns the currency system a currency or denomination name belongs to."""
+        _, parent_name = self.find(name)
+        return self.systems.get(parent_name.lower()) if parent_name else None
+
+
+# Compiled indexes keyed by a fingerprint of the currency definitions, so each config version is compiled once
+CURRENCY_INDEX_CACHE_SIZE = 256
+_currency_indexes: OrderedDict[str, CurrencyIndex] = OrderedDict()
+# The index each recently seen config dict resolved to, keyed by the dict's identity, so repeat lookups with the same
+# dict skip the fingerprint. Each entry holds its dict, so the ID can't be reused while the entry exists.
+_currency_index_bindings: OrderedDict[int, tuple[dict | None, CurrencyIndex]] = OrderedDict()
+
+
+def get_currency_index(currency_config: dict | None) -> CurrencyIndex:
+    """
+    Returns the compiled CurrencyIndex for a currency config, building it only the first time a given version of the
+    config is seen. The config is fingerprinted once per dict, so treat config dicts as read-only once looked up.
+
+    :param currency_config: The server's currency config dict
+
+    :return: The shared CurrencyIndex for the config
+    """
+    binding = _currency_index_bindings.get(id(currency_config))
+    if binding is not None and binding[0] is currency_config:
+        _currency_index_bindings.move_to_end(id(currency_config))
+        return binding[1]
+
+    currencies = (currency_config or {}).get(CurrencyFields.CURRENCIES, [])
+    fingerprint = json.dumps(currencies, sort_keys=True, default=str)
+
+    index = _currency_indexes.get(fingerprint)
+    if index is not None:
+        _currency_indexes.move_to_end(fingerprint)
+    else:
+        index = CurrencyIndex(currency_config)
+        _currency_indexes[fingerprint] = index
+        if len(_currency_indexes) > CURRENCY_INDEX_CACHE_SIZE:
+            _currency_indexes.popitem(last=False)
+
+    _currency_index_bindings[id(currency_config)] = (currency_config, index)
+    if len(_currency_index_bindings) > CURRENCY_INDEX_CACHE_SIZE:
+        _currency_index_bindings.popitem(last=False)
+    return index
+
+
 def find_currency_or_denomination(currency_def_query, search_name) -> Tuple[str | None, str | None]:
     """
     Finds a currency or denomination by name in the currency definition.
@@ -312,15 +867,7 @@ def find_currency_or_denomination(currency_def_query, search_name) -> Tuple[str
     """
     if not currency_def_query:
         return None, None
-    search_name = search_name.lower()
-    for currency in currency_def_query[CurrencyFields.CURRENCIES]:
-        if currency[CommonFields.NAME].lower() == search_name:
-            return currency[CommonFields.NAME], currency[CommonFields.NAME]
-        if CurrencyFields.DENOMINATIONS in currency:
-            for denomination in currency[CurrencyFields.DENOMINATIONS]:
-                if denomination[CommonFields.NAME].lower() == search_name:
-                    return denomination[CommonFields.NAME], currency[CommonFields.NAME]
-    return None, None
+    return get_currency_index(currency_def_query).find(search_name)
 
 
 def normalize_currency_keys(currency_dict):
@@ -341,66 +888,775 @@ def format_currency_display(player_currency: dict, currency_config: dict) -> lis
         return []
 
     output_lines = []
-    processed_denominations = set()
     norm_player_wallet = normalize_currency_keys(player_currency)
 
-    for currency in currency_config[CurrencyFields.CURRENCIES]:
-        base_name = currency[CommonFields.NAME]
-        denomination_map, _ = get_denomination_map(currency_config, base_name)
-
-        if not denomination_map:
-            continue
-
-        denominations_in_wallet = {k for k in norm_player_wallet if k in denomination_map}
+    for system in get_currency_index(currency_config).systems.values():
+        denominations_in_wallet = {k: v for k, v in norm_player_wallet.items() if k in system.units}
         if not denominations_in_wallet:
             continue
 
         # Display as double
-        if currency.get(CurrencyFields.IS_DOUBLE, False):
-            total_value = 0.0
-            for denom_name_lower in denominations_in_wallet:
-                quantity = norm_player_wallet.get(denom_name_lower, 0)
-                denom_value_in_base = denomination_map[denom_name_lower]
-                total_value += quantity * denom_value_in_base
-                processed_denominations.add(denom_name_lower)
-
+        if system.is_double:
+            total_value = system.units_to_base(system.wallet_units(denominations_in_wallet))
             if total_value > 0:
-                output_lines.append(f"{titlecase(base_name)}: **{total_value:.2f}**")
+                output_lines.append(f"{titlecase(system.name)}: **{format_two_places(total_value)}**")
 
-        # Display as separate integers
+        # Display as separate integers, sorted by value descending
         else:
-            # Sort by value descending
-            sorted_denoms = sorted(denominations_in_wallet, key=lambda d: denomination_map[d], reverse=True)
-            for denom_name_lower in sorted_denoms:
-                quantity = norm_player_wallet.get(denom_name_lower, 0)
+            for denom_name_lower, _ in system.descending:
+                quantity = denominations_in_wallet.get(denom_name_lower, 0)
                 if quantity > 0:
-                    denom_display_name, _ = find_currency_or_denomination(currency_config, denom_name_lower)
-                    if denom_display_name:
-                        output_lines.append(f"{titlecase(denom_display_name)}: **{quantity}**")
-                    processed_denominations.add(denom_name_lower)
+                    output_lines.append(f"{titlecase(system.display_names[denom_name_lower])}: **{quantity}**")
 
     return output_lines
 
 
+# ----- Character Storage -----
+
+
+def character_storage_is_split(bot) -> bool:
+    """Returns True if characters are stored as one document per character."""
+    return bot.character_storage == CharacterStorageMode.SPLIT
+
+
+def build_character_cache_key(bot, player_id: int, character_id: str) -> str:
+    """Builds the cache key holding a character's data for the configured storage mode."""
+    if character_storage_is_split(bot):
+        return build_cache_key(bot.mdb.name, character_id, DatabaseCollections.CHARACTER_DATA)
+    return build_cache_key(bot.mdb.name, player_id, DatabaseCollections.CHARACTERS)
+
+
+def strip_character_document(character_document: dict) -> dict:
+    """Removes the storage-only fields from a split character document so it matches the embedded shape."""
+    return {key: value for key, value in character_document.items()
+            if key not in (CommonFields.ID, CharacterFields.OWNER_ID)}
+
+
+async def migrate_player_characters(bot, player_data: dict) -> int:
+    """
+    Moves the characters embedded in a player's document into their own documents, leaving the player document as a
+    small index of active characters.
+
+    :param bot: The Discord bot instance
+    :param player_data: The player's document from the characters collection
+
+    :return: The number of characters migrated
+    """
+    player_id = player_data[CommonFields.ID]
+    characters = player_data.get(CharacterFields.CHARACTERS) or {}
+
+    if characters:
+        # Only insert characters that don't have a document yet. player_data may be a stale cached copy, and another
+        # process may already have migrated this player and written newer changes to the split documents.
+        operations = [
+            UpdateOne(
+                {CommonFields.ID: character_id},
+                {'$setOnInsert': {**character_data, CharacterFields.OWNER_ID: player_id}},
+                upsert=True
+            )
+            for character_id, character_data in characters.items()
+        ]
+        await bot.mdb[DatabaseCollections.CHARACTER_DATA].bulk_write(operations, ordered=False)
+
+    await update_cached_data(
+        bot=bot,
+        mongo_database=bot.mdb,
+        collection_name=DatabaseCollections.CHARACTERS,
+        query={CommonFields.ID: player_id},
+        update_data={'$unset': {CharacterFields.CHARACTERS: ''}}
+    )
+    await invalidate_cache(bot, *[
+        build_cache_key(bot.mdb.name, character_id, DatabaseCollections.CHARACTER_DATA) for character_id in characters
+    ])
+
+    return len(characters)
+
+
+async def migrate_embedded_players(bot, player_ids) -> int:
+    """
+    In split storage mode, migrates any of the given players whose characters are still embedded. Write paths call
+    this so that changes to a player who hasn't been read since split mode was enabled aren't lost.
+
+    :param bot: The Discord bot instance
+    :param player_ids: The Discord IDs of the players to check
+
+    :return: The number of players migrated
+    """
+    if not character_storage_is_split(bot):
+        return 0
+
+    player_count = 0
+    cursor = bot.mdb[DatabaseCollections.CHARACTERS].find(
+        {CommonFields.ID: {'$in': list(set(player_ids))}, CharacterFields.CHARACTERS: {'$exists': True}}
+    )
+    async for player_data in cursor:
+        await migrate_player_characters(bot, player_data)
+        player_count += 1
+
+    return player_count
+
+
+async def migrate_character_storage(bot) -> Tuple[int, int]:
+    """
+    Migrates every player document still holding embedded characters to one document per character.
+
+    :param bot: The Discord bot instance
+
+    :return: A tuple of (players migrated, characters migrated)
+    """
+    player_count = 0
+    character_count = 0
+    cursor = bot.mdb[DatabaseCollections.CHARACTERS].find({CharacterFields.CHARACTERS: {'$exists': True}})
+    async for player_data in cursor:
+        character_count += await migrate_player_characters(bot, player_data)
+        player_count += 1
+
+    return player_count, character_count
+
+
+async def get_player_data(bot, player_id: int) -> dict | None:
+    """
+    Retrieves a player's document from the characters collection. In split storage mode this is the index of active
+    characters per guild; players still holding embedded characters are migrated on first read.
+
+    :param bot: The Discord bot instance
+    :param player_id: The player's Discord ID
+
+    :return: The player document, or None if the player has never registered a character
+    """
+    player_data = await get_cached_data(
+        bot=bot,
+        mongo_database=bot.mdb,
+        collection_name=DatabaseCollections.CHARACTERS,
+        query={CommonFields.ID: player_id}
+    )
+
+    if player_data and character_storage_is_split(bot) and CharacterFields.CHARACTERS in player_data:
+        await migrate_player_characters(bot, player_data)
+        del player_data[CharacterFields.CHARACTERS]
+
+    return player_data
+
+
+async def get_character(bot, player_id: int, character_id: str) -> dict | None:
+    """
+    Retrieves a single character's data.
+
+    :param bot: The Discord bot instance
+    :param player_id: The owning player's Discord ID
+    :param character_id: The character's ID
+
+    :return: The character dict, or None if not found
+    """
+    if not character_storage_is_split(bot):
+        player_data = await get_player_data(bot, player_id)
+        if not player_data:
+            return None
+        return player_data.get(CharacterFields.CHARACTERS, {}).get(character_id)
+
+    character_data = await get_cached_data(
+        bot=bot,
+        mongo_database=bot.mdb,
+        collection_name=DatabaseCollections.CHARACTER_DATA,
+        query={CommonFields.ID: character_id}
+    )
+    if not character_data:
+        # The owner may not have been migrated yet
+        await get_player_data(bot, player_id)
+        character_data = await get_cached_data(
+            bot=bot,
+            mongo_database=bot.mdb,
+            collection_name=DatabaseCollections.CHARACTER_DATA,
+            query={CommonFields.ID: character_id}
+        )
+
+    if not character_data or character_data.get(CharacterFields.OWNER_ID) != player_id:
+        return None
+
+    return strip_character_document(character_data)
+
+
+async def get_active_character(bot, player_id: int, guild_id: int) -> Tuple[str | None, dict | None]:
+    """
+    Retrieves a player's active character for a guild.
+
+    :param bot: The Discord bot instance
+    :param player_id: The player's Discord ID
+    :param guild_id: The guild ID
+
+    :return: A tuple of (character ID, character dict), or (None, None) if there is no active character
+    """
+    player_data = await get_player_data(bot, player_id)
+    if not player_data:
+        return None, None
+
+    character_id = player_data.get(CharacterFields.ACTIVE_CHARACTERS, {}).get(str(guild_id))
+    if not character_id:
+        return None, None
+
+    if character_storage_is_split(bot):
+        character_data = await get_character(bot, player_id, character_id)
+    else:
+        character_data = player_data.get(CharacterFields.CHARACTERS, {}).get(character_id)
+
+    if not character_data:
+        return None, None
+
+    return character_id, character_data
+
+
+async def get_player_characters(bot, player_id: int) -> dict:
+    """
+    Retrieves all of a player's characters for listing. In split storage mode, inventories, containers and wallets
+    are not loaded.
+
+    :param bot: The Discord bot instance
+    :param player_id: The player's Discord ID
+
+    :return: Dict mapping character IDs to character dicts
+    """
+    player_data = await get_player_data(bot, player_id)
+    if not player_data:
+        return {}
+
+    if not character_storage_is_split(bot):
+        return player_data.get(CharacterFields.CHARACTERS, {})
+
+    cursor = bot.mdb[DatabaseCollections.CHARACTER_DATA].find(
+        {CharacterFields.OWNER_ID: player_id},
+        projection={
+            f'{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}': 0,
+            f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}': 0,
+            f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CURRENCY}': 0
+        }
+    )
+    return {character[CommonFields.ID]: strip_character_document(character) async for character in cursor}
+
+
+async def create_character(bot, player_id: int, guild_id: int, character_id: str, character_data: dict):
+    """
+    Stores a new character and makes it the player's active character in the guild.
+
+    :param bot: The Discord bot instance
+    :param player_id: The owning player's Discord ID
+    :param guild_id: The guild the character was registered in
+    :param character_id: The new character's ID
+    :param character_data: The character dict
+    """
+    if not character_storage_is_split(bot):
+        await update_cached_data(
+            bot=bot,
+            mongo_database=bot.mdb,
+            collection_name=DatabaseCollections.CHARACTERS,
+            query={CommonFields.ID: player_id},
+            update_data={'$set': {f'{CharacterFields.ACTIVE_CHARACTERS}.{guild_id}': character_id,
+                                  f'{CharacterFields.CHARACTERS}.{character_id}': character_data}}
+        )
+        return
+
+    await bot.mdb[DatabaseCollections.CHARACTER_DATA].insert_one(
+        {**character_data, CommonFields.ID: character_id, CharacterFields.OWNER_ID: player_id}
+    )
+    await update_cached_data(
+        bot=bot,
+        mongo_database=bot.mdb,
+        collection_name=DatabaseCollections.CHARACTERS,
+        query={CommonFields.ID: player_id},
+        update_data={'$set': {f'{CharacterFields.ACTIVE_CHARACTERS}.{guild_id}': character_id}}
+    )
+
+
+async def delete_character(bot, player_id: int, character_id: str):
+    """
+    Deletes a character and clears it as the active character in any guild.
+
+    :param bot: The Discord bot instance
+    :param player_id: The owning player's Discord ID
+    :param character_id: The character's ID
+    """
+    player_data = await get_player_data(bot, player_id)
+    if not player_data:
+        return
+
+    update_data = {}
+    if not character_storage_is_split(bot):
+        update_data[f'{CharacterFields.CHARACTERS}.{character_id}'] = ''
+    else:
+        await delete_cached_data(
+            bot=bot,
+            mongo_database=bot.mdb,
+            collection_name=DatabaseCollections.CHARACTER_DATA,
+            search_filter={CommonFields.ID: character_id, CharacterFields.OWNER_ID: player_id},
+            cache_id=character_id
+        )
+
+    for guild_id, active_character_id in player_data.get(CharacterFields.ACTIVE_CHARACTERS, {}).items():
+        if active_character_id == character_id:
+            update_data[f'{CharacterFields.ACTIVE_CHARACTERS}.{guild_id}'] = ''
+
+    if update_data:
+        await update_cached_data(
+            bot=bot,
+            mongo_database=bot.mdb,
+            collection_name=DatabaseCollections.CHARACTERS,
+            query={CommonFields.ID: player_id},
+            update_data={'$unset': update_data}
+        )
+
+
+async def update_character(bot, player_id: int, character_id: str, update_data: dict):
+    """
+    Applies a mongo update to a single character and invalidates its cache entry.
+
+    :param bot: The Discord bot instance
+    :param player_id: The owning player's Discord ID
+    :param character_id: The character's ID
+    :param update_data: The update dict, with field paths relative to the character,
+                        e.g. {'$set': {'attributes.experience': 10}}
+    """
+    if character_storage_is_split(bot):
+        try:
+            await bot.mdb[DatabaseCollections.CHARACTER_DATA].update_one(
+                {CommonFields.ID: character_id, CharacterFields.OWNER_ID: player_id},
+                update_data
+            )
+        except Exception as e:
+            raise Exception(f'Error updating character in database: {e}') from e
+
+        await invalidate_cache(bot, build_character_cache_key(bot, player_id, character_id))
+        return
+
+    prefix = f'{CharacterFields.CHARACTERS}.{character_id}'
+    await update_cached_data(
+        bot=bot,
+        mongo_database=bot.mdb,
+        collection_name=DatabaseCollections.CHARACTERS,
+        query={CommonFields.ID: player_id},
+        update_data={
+            operator: {f'{prefix}.{path}': value for path, value in fields.items()}
+            for operator, fields in update_data.items()
+        }
+    )
+
+
+# ----- Character Mutations -----
+
+
+def character_field_path(bot, character_id: str, path: str) -> str:
+    """Resolves a character-relative field path to its full path in the configured storage mode."""
+    if character_storage_is_split(bot):
+        return path
+    return f'{CharacterFields.CHARACTERS}.{character_id}.{path}'
+
+
+def character_filter(bot, player_id: int, character_id: str) -> dict:
+    """Builds the mongo filter matching a single character document in the configured storage mode."""
+    if character_storage_is_split(bot):
+        return {CommonFields.ID: character_id, CharacterFields.OWNER_ID: player_id}
+    return {CommonFields.ID: player_id, f'{CharacterFields.CHARACTERS}.{character_id}': {'$exists': True}}
+
+
+def build_item_change(items_path: str, item_name: str, quantity: int) -> Tuple[dict | None, dict]:
+    """
+    Builds a guarded aggregation update that adds or removes an item from an items map, matching existing keys
+    case-insensitively. Item names are handled as array entries, so names containing dots or dollar signs are safe.
+
+    :param items_path: The full field path of the items map
+    :param item_name: The name of the item
+    :param quantity: The quantity to add (positive) or remove (negative)
+
+    :return: A tuple of (guard expression, or None if no guard is needed, pipeline stage)
+    """
+    entries = {'$objectToArray': {'$ifNull': [f'${items_path}', {}]}}
+    item_name_lower = item_name.lower()
+    is_item = {'$eq': [{'$toLower': '$$this.k'}, {'$literal': item_name_lower}]}
+    current_quantity = {'$sum': {'$map': {
+        'input': {'$filter': {'input': entries, 'cond': is_item}},
+        'in': '$$this.v'
+    }}}
+
+    guard = None
+    if quantity < 0:
+        guard = {'$gte': [current_quantity, -quantity]}
+
+    stage = {'$set': {items_path: {'$let': {
+        'vars': {
+            'matches': {'$filter': {'input': entries, 'cond': is_item}},
+            'others': {'$filter': {'input': entries, 'cond': {'$not': [is_item]}}}
+        },
+        'in': {'$let': {
+            'vars': {
+                'key': {'$ifNull': [{'$arrayElemAt': ['$$matches.k', 0]}, {'$literal': titlecase(item_name)}]},
+                'quantity': {'$add': [{'$sum': '$$matches.v'}, quantity]}
+            },
+            'in': {'$arrayToObject': {'$concatArrays': [
+                '$$others',
+                {'$cond': [{'$gt': ['$$quantity', 0]}, [{'k': '$$key', 'v': '$$quantity'}], []]}
+            ]}}
+        }}
+    }}}}
+
+    return guard, stage
+
+
+def build_currency_change(currency_path: str, currency_config: dict, currency_name: str,
+                          quantity: float) -> Tuple[dict | None, dict]:
+    """
+    Builds a guarded aggregation update that adds or removes currency from a wallet. The wallet's balance is computed
+    server-side in integer units of the currency's smallest denomination, and change is made into the fewest coins.
+
+    :param currency_path: The full field path of the wallet
+    :param currency_config: The server's currency config dict
+    :param currency_name: The name of the currency or denomination
+    :param quantity: The amount to add (positive) or remove (negative)
+
+    :return: A tuple of (guard expression, or None if no guard is needed, pipeline stage)
+    """
+    system = get_currency_index(currency_config).system_for(currency_name)
+    if not system:
+        raise UserFeedbackError(f'Currency {currency_name} could not be processed.')
+
+    # Round down to a whole unit of the smallest denomination, so credits are never overpaid and debits never
+    # undercharged
+    change_in_units = math.floor(system.to_units(currency_name, quantity))
+
+    entries = {'$objectToArray': {'$ifNull': [f'${currency_path}', {}]}}
+    total_in_units = {'$toLong': {'$sum': {'$map': {
+        'input': entries,
+        'in': {'$multiply': ['$$this.v', {'$switch': {
+            'branches': [
+                {'case': {'$eq': [{'$toLower': '$$this.k'}, {'$literal': denom}]}, 'then': units}
+                for denom, units in system.units.items()
+            ],
+            'default': 0
+        }}]}
+    }}}}
+
+    guard = None
+    if change_in_units < 0:
+        guard = {'$gte': [{'$add': [total_in_units, change_in_units]}, 0]}
+
+    denominations = [{'k': titlecase(denom), 'u': units} for denom, units in system.descending]
+    change = {'$reduce': {
+        'input': {'$literal': denominations},
+        'initialValue': {'rem': {'$max': [{'$add': [total_in_units, change_in_units]}, 0]}, 'out': []},
+        'in': {'$let': {
+            'vars': {'remainder': {'$mod': ['$$value.rem', '$$this.u']}},
+            'in': {'$let': {
+                'vars': {'qty': {'$toLong': {'$divide': [{'$subtract': ['$$value.rem', '$$remainder']}, '$$this.u']}}},
+                'in': {
+                    'rem': '$$remainder',
+                    'out': {'$concatArrays': [
+                        '$$value.out',
+                        {'$cond': [{'$gt': ['$$qty', 0]}, [{'k': '$$this.k', 'v': '$$qty'}], []]}
+                    ]}
+                }
+            }}
+        }}
+    }}
+
+    stage = {'$set': {currency_path: {'$arrayToObject': {'$concatArrays': [
+        {'$filter': {'input': entries, 'cond': {'$not': [{'$in': [{'$toLower': '$$this.k'}, {'$literal': list(system.units)}]}]}}},
+        {'$let': {'vars': {'change': change}, 'in': '$$change.out'}}
+    ]}}}}
+
+    return guard, stage
+
+
+def character_collection_name(bot) -> str:
+    """Returns the name of the collection holding character data in the configured storage mode."""
+    if character_storage_is_split(bot):
+        return DatabaseCollections.CHARACTER_DATA
+    return DatabaseCollections.CHARACTERS
+
+
+def build_character_update(bot, player_id: int, character_id: str, item_changes: list | None = None,
+                           currency_changes: list | None = None, currency_config: dict | None = None,
+                           experience: int | None = None) -> Tuple[dict, list] | None:
+    """
+    Builds a single guarded update applying item, currency and experience changes to a character. The filter only
+    matches if no removal would leave an item or wallet negative, and every target container exists.
+
+    :param bot: The Discord bot instance
+    :param player_id: The owning player's Discord ID
+    :param character_id: The character's ID
+    :param item_changes: List of (item name, quantity, container ID) tuples. A container ID of None targets the loose
+                         inventory
+    :param currency_changes: List of (currency name, amount) tuples
+    :param currency_config: The server's currency config dict, required for currency changes
+    :param experience: Experience to add
+
+    :return: A tuple of (filter, update pipeline), or None if there is nothing to change
+    """
+    guards = []
+    pipeline = []
+
+    for item_name, quantity, container_id in item_changes or []:
+        if container_id is None:
+            items_path = character_field_path(bot, character_id, f'{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}')
+        else:
+            container_path = character_field_path(
+                bot, character_id, f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}'
+            )
+            guards.append({'$ne': [{'$type': f'${container_path}'}, 'missing']})
+            items_path = f'{container_path}.{ContainerFields.ITEMS}'
+
+        guard, stage = build_item_change(items_path, item_name, int(quantity))
+        if guard:
+            guards.append(guard)
+        pipeline.append(stage)
+
+    currency_path = character_field_path(bot, character_id, f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CURRENCY}')
+    for currency_name, amount in currency_changes or []:
+        guard, stage = build_currency_change(currency_path, currency_config, currency_name, amount)
+        if guard:
+            guards.append(guard)
+        pipeline.append(stage)
+
+    if experience:
+        experience_path = character_field_path(bot, character_id,
+                                               f'{CharacterFields.ATTRIBUTES}.{CharacterFields.EXPERIENCE}')
+        pipeline.append({'$set': {experience_path: {'$add': [{'$ifNull': [f'${experience_path}', 0]}, experience]}}})
+
+    if not pipeline:
+        return None
+
+    search_filter = character_filter(bot, player_id, character_id)
+    if guards:
+        search_filter['$expr'] = {'$and': guards}
+
+    return search_filter, pipeline
+
+
+def split_reward_items(currency_config: dict | None, items: dict) -> Tuple[list, list]:
+    """
+    Sorts a reward's items into loose inventory item changes and currency changes.
+
+    :param currency_config: The server's currency config dict
+    :param items: Dict mapping item or currency names to quantities
+
+    :return: A tuple of (item changes, currency changes) for build_character_update
+    """
+    item_changes = []
+    currency_changes = []
+    for item_name, quantity in items.items():
+        is_currency, _ = find_currency_or_denomination(currency_config, item_name)
+        if is_currency:
+            currency_changes.append((item_name, quantity))
+        else:
+            item_changes.append((item_name, quantity, None))
+
+    return item_changes, currency_changes
+
+
+async def apply_character_changes(bot, player_id: int, character_id: str, item_changes: list | None = None,
+                                  currency_changes: list | None = None, currency_config: dict | None = None,
+                                  experience: int | None = None) -> bool:
+    """
+    Atomically applies item, currency and experience changes to a character in one round trip. See
+    build_character_update for the parameters.
+
+    :return: True if the changes were applied, False if the character was not found or a guard failed
+    """
+    update = build_character_update(bot, player_id, character_id, item_changes, currency_changes, currency_config,
+                                    experience)
+    if not update:
+        return True
+
+    search_filter, pipeline = update
+    collection = bot.mdb[character_collection_name(bot)]
+    try:
+        result = await collection.update_one(search_filter, pipeline)
+        # The owner may not have been migrated to split storage yet
+        if not result.matched_count and await migrate_embedded_players(bot, [player_id]):
+            result = await collection.update_one(search_filter, pipeline)
+    except Exception as e:
+        raise Exception(f'Error updating character in database: {e}') from e
+
+    await invalidate_cache(bot, build_character_cache_key(bot, player_id, character_id))
+
+    return result.matched_count > 0
+
+
+async def find_existing_characters(bot, changes: list[dict]) -> set[Tuple[int, str]]:
+    """
+    Finds which of the characters named by a list of changes exist, with a single read.
+
+    :param bot: The Discord bot instance
+    :param changes: List of dicts with player_id and character_id keys
+
+    :return: The (player ID, character ID) pairs that exist
+    """
+    collection = bot.mdb[character_collection_name(bot)]
+    if character_storage_is_split(bot):
+        cursor = collection.find(
+            {CommonFields.ID: {'$in': [change['character_id'] for change in changes]}},
+            {CharacterFields.OWNER_ID: 1}
+        )
+        return {(character[CharacterFields.OWNER_ID], character[CommonFields.ID]) async for character in cursor}
+
+    cursor = collection.find(
+        {CommonFields.ID: {'$in': list({change['player_id'] for change in changes})}},
+        {f'{CharacterFields.CHARACTERS}.{change["character_id"]}.{CharacterFields.NAME}': 1 for change in changes}
+    )
+    return {(player[CommonFields.ID], character_id) async for player in cursor
+            for character_id in player.get(CharacterFields.CHARACTERS, {})}
+
+
+async def apply_bulk_character_changes(bot, changes: list[dict], currency_config: dict | None = None) -> list[dict]:
+    """
+    Applies changes to many characters with a single bulk write and a single pipelined cache invalidation.
+
+    :param bot: The Discord bot instance
+    :param changes: List of dicts with player_id and character_id keys, plus any of the item_changes,
+                    currency_changes and experience arguments of build_character_update
+    :param currency_config: The server's currency config dict, required for currency changes
+
+    :return: The changes that were not applied, because the character was not found or a guard failed
+    """
+    updates = []
+    for change in changes:
+        update = build_character_update(bot, currency_config=currency_config, **change)
+        if update:
+            updates.append((change, update))
+
+    if not updates:
+        return []
+
+    # Owners who haven't been migrated to split storage yet would otherwise match nothing
+    await migrate_embedded_players(bot, [change['player_id'] for change, _ in updates])
+
+    try:
+        result = await bot.mdb[character_collection_name(bot)].bulk_write(
+            [UpdateOne(*update) for _, update in updates], ordered=False
+        )
+    except Exception as e:
+        raise Exception(f'Error updating characters in database: {e}') from e
+
+    await invalidate_cache(bot, *[build_character_cache_key(bot, change['player_id'], change['character_id'])
+                                  for change, _ in updates])
+
+    unapplied_count = len(updates) - result.matched_count
+    if not unapplied_count:
+        return []
+
+    # A bulk write only reports how many updates matched. Characters that don't exist account for some or all of them;
+    # any others failed a guard, which only changes with a removal carry.
+    existing = await find_existing_characters(bot, [change for change, _ in updates])
+    failed = [change for change, _ in updates if (change['player_id'], change['character_id']) not in existing]
+    guarded = [change for change, (search_filter, _) in updates
+               if '$expr' in search_filter and (change['player_id'], change['character_id']) in existing]
+    if len(failed) < unapplied_count:
+        if len(failed) + len(guarded) != unapplied_count:
+            logger.warning(f'{unapplied_count - len(failed)} of {len(guarded)} character updates with removals were '
+                           f'not applied and can\'t be told apart; reporting all of them as not applied.')
+        failed.extend(guarded)
+
+    logger.warning(f'{unapplied_count} of {len(updates)} character updates were not applied.')
+
+    return failed
+
+
+async def mongo_supports_transactions(bot) -> bool:
+    """
+    Checks whether the MongoDB deployment supports multi-document transactions, which need a replica set or a
+    sharded cluster. A single-node replica set is enough.
+
+    :param bot: The Discord bot instance
+
+    :return: True if transactions are supported
+    """
+    try:
+        hello = await bot.mongo_client.admin.command('hello')
+    except Exception as e:
+        logger.warning(f'Could not determine MongoDB topology, trades will run without transactions: {e}')
+        return False
+
+    return 'setName' in hello or hello.get('msg') == 'isdbgrid'
+
+
+def invert_character_change(change: dict) -> dict:
+    """Builds the change undoing the item and currency changes of an apply_bulk_character_changes style change."""
+    return {
+        'player_id': change['player_id'],
+        'character_id': change['character_id'],
+        'item_changes': [(item_name, -quantity, container_id)
+                         for item_name, quantity, container_id in change.get('item_changes') or []],
+        'currency_changes': [(currency_name, -amount) for currency_name, amount in change.get('currency_changes') or []]
+    }
+
+
+async def apply_character_trade(bot, sender_change: dict, receiver_change: dict,
+                                currency_config: dict | None = None) -> Tuple[dict | None, dict | None]:
+    """
+    Applies both sides of a trade and returns both characters as written. When the deployment supports transactions
+    (bot.mongo_transactions) both writes commit or neither does. Otherwise the sender's change is undone if the
+    receiver can't be written.
+
+    :param bot: The Discord bot instance
+    :param sender_change: Dict with player_id and character_id keys, plus the item_changes and currency_changes of
+                          build_character_update to apply to the sender
+    :param receiver_change: The same for the receiver
+    :param currency_config: The server's currency config dict, required for currency changes
+
+    :return: A tuple of (sender character, receiver character) after the trade. The sender is None if a guard failed
+             or the sender's character was not found, and the receiver is None if the receiver's character was not
+             found; in both cases nothing was traded.
+    """
+    collection = bot.mdb[character_collection_name(bot)]
+
+    async def write(change: dict, session=None) -> dict | None:
+        search_filter, pipeline = build_character_update(bot, currency_config=currency_config, **change)
+        projection = None
+        if not character_storage_is_split(bot):
+            projection = {f'{CharacterFields.CHARACTERS}.{change["character_id"]}': 1}
+
+        document = await collection.find_one_and_update(search_filter, pipeline, projection=projection,
+                                                        return_document=ReturnDocument.AFTER, session=session)
+        if document is None:
+            return None
+        if character_storage_is_split(bot):
+            return strip_character_document(document)
+        return document[CharacterFields.CHARACTERS][change['character_id']]
+
+    # Owners who haven't been migrated to split storage yet would otherwise match nothing
+    await migrate_embedded_players(bot, [sender_change['player_id'], receiver_change['player_id']])
+
+    sender = receiver = None
+    if bot.mongo_transactions:
+        async with bot.mongo_client.start_session() as session:
+            async with await session.start_transaction():
+                sender = await write(sender_change, session)
+                if sender is not None:
+                    receiver = await write(receiver_change, session)
+                if sender is None or receiver is None:
+                    await session.abort_transaction()
+    else:
+        sender = await write(sender_change)
+        if sender is not None:
+            receiver = await write(receiver_change)
+            if receiver is None:
+                # Give the sender back what they sent, since the receiving character disappeared
+                await write(invert_character_change(sender_change))
+
+    await invalidate_cache(
+        bot,
+        build_character_cache_key(bot, sender_change['player_id'], sender_change['character_id']),
+        build_character_cache_key(bot, receiver_change['player_id'], receiver_change['character_id'])
+    )
+
+    return sender, receiver
+
+
 async def trade_currency(interaction, currency_name, amount, sending_member_id, receiving_member_id,
                          guild_id):
     bot = interaction.client
     currency_name = currency_name.lower()
-    sender_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: sending_member_id}
-    )
-    receiver_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: receiving_member_id}
-    )
-    sender_character_id = sender_data[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-    sender_currency = sender_data[CharacterFields.CHARACTERS][sender_character_id][CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {})
-    receiver_character_id = receiver_data[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
+    sender_character_id, sender_character = await get_active_character(bot, sending_member_id, guild_id)
+    receiver_character_id, receiver_character = await get_active_character(bot, receiving_member_id, guild_id)
+    if not sender_character or not receiver_character:
+        raise UserFeedbackError('Both parties must have an active character on this server.')
+    sender_currency = sender_character[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {})
 
     currency_config = await get_cached_data(
         bot=bot,
@@ -416,23 +1672,21 @@ async def trade_currency(interaction, currency_name, amount, sending_member_id,
     if not can_afford:
         raise UserFeedbackError(f'The transaction cannot be completed:\n{message}')
 
-    await update_character_inventory(interaction, sending_member_id, sender_character_id, currency_name, -amount)
-    await update_character_inventory(interaction, receiving_member_id, receiver_character_id, currency_name, amount)
-
-    updated_sender_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: sending_member_id}
-    )
-    updated_receiver_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: receiving_member_id}
+    updated_sender, updated_receiver = await apply_character_trade(
+        bot,
+        {'player_id': sending_member_id, 'character_id': sender_character_id,
+         'currency_changes': [(currency_name, -amount)]},
+        {'player_id': receiving_member_id, 'character_id': receiver_character_id,
+         'currency_changes': [(currency_name, amount)]},
+        currency_config
     )
-    updated_sender_currency = updated_sender_data[CharacterFields.CHARACTERS][sender_character_id][CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY)
-    updated_receiver_currency = updated_receiver_data[CharacterFields.CHARACTERS][receiver_character_id][CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY)
+    if updated_sender is None:
+        raise UserFeedbackError('Your funds changed while trading. Please try again.')
+    if updated_receiver is None:
+        raise UserFeedbackError('The receiving character could not be found.')
+
+    updated_sender_currency = updated_sender[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY)
+    updated_receiver_currency = updated_receiver[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY)
 
     return updated_sender_currency, updated_receiver_currency
 
@@ -441,105 +1695,46 @@ async def trade_item(bot, item_name, quantity, sending_member_id, receiving_memb
     # Normalize the item name for consistent storage and comparison
     normalized_item_name = item_name.lower()
 
-    # Fetch sending character
-    sender_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: sending_member_id}
-    )
-    sender_character_id = sender_data[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-    sender_character = sender_data[CharacterFields.CHARACTERS][sender_character_id]
-
-    # Fetch receiving character
-    receiver_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: receiving_member_id}
-    )
-    receiver_character_id = receiver_data[CharacterFields.ACTIVE_CHARACTERS][str(guild_id)]
-    receiver_character = receiver_data[CharacterFields.CHARACTERS][receiver_character_id]
+    # Fetch sending and receiving characters
+    sender_character_id, sender_character = await get_active_character(bot, sending_member_id, guild_id)
+    receiver_character_id, receiver_character = await get_active_character(bot, receiving_member_id, guild_id)
+    if not sender_character or not receiver_character:
+        raise UserFeedbackError('Both parties must have an active character on this server.')
 
     # Check if sender has enough items across all containers + loose items
-    quantity_owned = get_total_item_quantity(sender_character, item_name)
+    item_index = get_character_item_index(bot, sending_member_id, sender_character_id, sender_character)
+    quantity_owned = item_index.total(item_name)
     if quantity_owned < quantity:
         raise UserFeedbackError(f'You have {quantity_owned}x {titlecase(normalized_item_name)} but are trying to give '
                                 f'{quantity}.')
 
     # Get item locations and remove items (loose items first, then containers)
-    locations = get_item_locations(sender_character, item_name)
+    locations = item_index.locations(item_name)
     # Sort so loose items (id=None) come first
     locations.sort(key=lambda x: (x['id'] is not None, x['name']))
 
+    removals = []
     remaining_to_remove = quantity
     for loc in locations:
         if remaining_to_remove <= 0:
             break
 
-        container_id = loc[CommonFields.ID]
-        loc_qty = loc[CommonFields.QUANTITY]
-        remove_from_here = min(loc_qty, remaining_to_remove)
-
-        if container_id is None:
-            # Remove from loose items
-            inventory = sender_character[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-            for key in list(inventory.keys()):
-                if key.lower() == normalized_item_name:
-                    inventory[key] -= remove_from_here
-                    if inventory[key] <= 0:
-                        del inventory[key]
-                    break
-        else:
-            # Remove from container
-            container_items = sender_character[CharacterFields.ATTRIBUTES][CharacterFields.CONTAINERS][container_id].get(CharacterFields.ITEMS, {})
-            for key in list(container_items.keys()):
-                if key.lower() == normalized_item_name:
-                    container_items[key] -= remove_from_here
-                    if container_items[key] <= 0:
-                        del container_items[key]
-                    break
-
+        remove_from_here = min(loc[CommonFields.QUANTITY], remaining_to_remove)
+        removals.append((item_name, -remove_from_here, loc['id']))
         remaining_to_remove -= remove_from_here
 
-    # Add items to receiver's loose inventory
-    receiver_inventory = receiver_character[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-    # Find existing key (case-insensitive) or use titlecase
-    existing_key = None
-    for key in receiver_inventory:
-        if key.lower() == normalized_item_name:
-            existing_key = key
-            break
-
-    if existing_key:
-        receiver_inventory[existing_key] += quantity
-    else:
-        receiver_inventory[titlecase(item_name)] = quantity
-
-    # Update sender's character data
-    sender_update = {
-        f'{CharacterFields.CHARACTERS}.{sender_character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}': sender_character[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-    }
-    # Include container updates if containers exist
-    if sender_character[CharacterFields.ATTRIBUTES].get(CharacterFields.CONTAINERS):
-        sender_update[f'{CharacterFields.CHARACTERS}.{sender_character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}'] = sender_character[CharacterFields.ATTRIBUTES][CharacterFields.CONTAINERS]
-
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: sending_member_id},
-        update_data={'$set': sender_update}
-    )
-
-    # Update receiver's inventory
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: receiving_member_id},
-        update_data={'$set': {f'{CharacterFields.CHARACTERS}.{receiver_character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}': receiver_inventory}}
+    # Remove from every location in one guarded update, so a concurrent change can't drive a count negative, and add
+    # the items to the receiver's loose inventory
+    updated_sender, updated_receiver = await apply_character_trade(
+        bot,
+        {'player_id': sending_member_id, 'character_id': sender_character_id, 'item_changes': removals},
+        {'player_id': receiving_member_id, 'character_id': receiver_character_id,
+         'item_changes': [(item_name, quantity, None)]}
     )
+    if updated_sender is None:
+        raise UserFeedbackError('Your inventory changed while trading. Please try again.')
+    if updated_receiver is None:
+        raise UserFeedbackError('The receiving character could not be found.')
 
 
 async def update_character_inventory(interaction: discord.Interaction, player_id: int, character_id: str,
@@ -548,19 +1743,6 @@ async def update_character_inventory(interaction: discord.Interaction, player_id
         bot = interaction.client
         normalized_item_name = item_name.lower()
 
-        player_data = await get_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: player_id}
-        )
-        if not player_data:
-            raise UserFeedbackError('Player data not found.')
-
-        character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
-        if not character_data:
-            raise UserFeedbackError('Character data not found.')
-
         currency_query = await get_cached_data(
             bot=bot,
             mongo_database=bot.gdb,
@@ -568,118 +1750,401 @@ async def update_character_inventory(interaction: discord.Interaction, player_id
             query={CommonFields.ID: interaction.guild_id}
         )
 
-        is_currency, currency_parent_name = None, None
+        is_currency = None
         if currency_query:
-            is_currency, currency_parent_name = find_currency_or_denomination(currency_query, normalized_item_name)
+            is_currency, _ = find_currency_or_denomination(currency_query, normalized_item_name)
 
         if is_currency:
-            denomination_map, _ = get_denomination_map(currency_query, normalized_item_name)
-            if not denomination_map:
-                raise UserFeedbackError(f"Currency {item_name} could not be processed.")
+            applied = await apply_character_changes(bot, player_id, character_id,
+                                                    currency_changes=[(item_name, quantity)],
+                                                    currency_config=currency_query)
+            error_message = 'Insufficient funds to cover this transaction.'
+        else:
+            applied = await apply_character_changes(bot, player_id, character_id,
+                                                    item_changes=[(item_name, quantity, None)])
+            error_message = f'Insufficient item(s): {titlecase(item_name)}'
+
+        # apply_character_changes has already migrated the owner and retried if they were still embedded, so a failure
+        # here is either a missing character or a failed guard
+        if not applied:
+            if not await get_character(bot, player_id, character_id):
+                raise UserFeedbackError('Character data not found.')
+            raise UserFeedbackError(error_message)
+    except Exception as e:
+        await log_exception(e, interaction)
+
+
+async def update_character_experience(interaction, player_id: int, character_id: str,
+                                      amount: int):
+    bot = interaction.client
+    try:
+        if not await apply_character_changes(bot, player_id, character_id, experience=amount):
+            raise UserFeedbackError('Character data not found.')
+    except Exception as e:
+        await log_exception(e, interaction)
 
-            min_value = min(denomination_map.values())
-            if min_value <= 0:
-                raise Exception(f"Currency {currency_parent_name} has a non-positive denomination value.")
 
-            character_currency = normalize_currency_keys(character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {}))
+async def get_posted_quest(bot, guild_id: int, quest_id: str | None, message_id: int) -> dict | None:
+    """
+    Retrieves the quest behind a quest post.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param quest_id: The quest ID carried in the post's button custom IDs, or None for posts made before the ID was
+        included
+    :param message_id: The ID of the quest post message, used to find the quest when quest_id is None
 
-            total_in_lowest_denom = 0.0
-            for denom, value in denomination_map.items():
-                total_in_lowest_denom += character_currency.get(denom, 0) * (value / min_value)
+    :return: The quest document, or None if the quest no longer exists
+    """
+    if quest_id:
+        return await get_cached_data(
+            bot=bot,
+            mongo_database=bot.gdb,
+            collection_name=DatabaseCollections.QUESTS,
+            query={QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: quest_id},
+            cache_id=f'{guild_id}:{quest_id}'
+        )
 
-            change_value_in_lowest = quantity * (denomination_map[item_name.lower()] / min_value)
+    return await bot.gdb[DatabaseCollections.QUESTS].find_one(
+        {QuestFields.GUILD_ID: guild_id, QuestFields.MESSAGE_ID: message_id}
+    )
 
-            total_in_lowest_denom += change_value_in_lowest
 
-            tolerance = 1e-9
-            if total_in_lowest_denom < -tolerance:
-                raise UserFeedbackError(f"Insufficient funds to cover this transaction.")
+# ----- Quest Roster -----
 
-            if total_in_lowest_denom < 0:
-                total_in_lowest_denom = 0
 
-            new_character_currency = {}
-            for denom, value in sorted(denomination_map.items(), key=lambda x: -x[1]):
-                denom_value_in_lowest = value / min_value
-                if total_in_lowest_denom + tolerance >= denom_value_in_lowest:
-                    qty = int(total_in_lowest_denom // denom_value_in_lowest)
-                    new_character_currency[denom] = qty
-                    total_in_lowest_denom %= denom_value_in_lowest
+def build_roster_entry(user_id: int, character_id: str, character_data: dict) -> dict:
+    """
+    Builds a quest roster entry for a player's character. Rosters only hold what a quest needs to display and reward
+    its players, never a copy of the character itself.
+    """
+    return {str(user_id): {character_id: {CommonFields.NAME: character_data[CommonFields.NAME]}}}
 
-            final_wallet = normalize_currency_keys(character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {}))
 
-            for denom_name in denomination_map.keys():
-                if denom_name in new_character_currency:
-                    final_wallet[denom_name] = new_character_currency[denom_name]
-                elif denom_name in final_wallet:
-                    del final_wallet[denom_name]
+def slim_roster_expression(field: str) -> dict:
+    """Builds an aggregation expression reducing each entry of a roster field to the compact roster entry shape."""
+    return {
+        '$map': {
+            'input': {'$ifNull': [f'${field}', []]},
+            'as': 'entry',
+            'in': {'$arrayToObject': {'$map': {
+                'input': {'$objectToArray': '$$entry'},
+                'as': 'player',
+                'in': {
+                    'k': '$$player.k',
+                    'v': {'$arrayToObject': {'$map': {
+                        'input': {'$objectToArray': '$$player.v'},
+                        'as': 'character',
+                        'in': {'k': '$$character.k', 'v': {CommonFields.NAME: f'$$character.v.{CommonFields.NAME}'}}
+                    }}}
+                }
+            }}}
+        }
+    }
 
-            character_currency_db = {titlecase(k): v for k, v in final_wallet.items() if v > 0}
 
-            await update_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: player_id},
-                update_data={'$set': {f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CURRENCY}': character_currency_db}}
-            )
-        else:
-            character_inventory = normalize_currency_keys(character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {}))
-            found_key = normalized_item_name
-
-            if found_key in character_inventory:
-                character_inventory[found_key] += int(quantity)
-                if character_inventory[found_key] <= 0:
-                    del character_inventory[found_key]
-            elif quantity > 0:
-                character_inventory[normalized_item_name] = int(quantity)
-            elif quantity < 0:
-                raise UserFeedbackError(f"Insufficient item(s): {titlecase(item_name)}")
-
-            inventory_for_db = {titlecase(k): v for k, v in character_inventory.items()}
-
-            await update_cached_data(
-                bot=bot,
-                mongo_database=bot.mdb,
-                collection_name=DatabaseCollections.CHARACTERS,
-                query={CommonFields.ID: player_id},
-                update_data={'$set': {f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}': inventory_for_db}}
-            )
-    except Exception as e:
-        await log_exception(e, interaction)
+async def migrate_quest_rosters(bot) -> int:
+    """
+    Reduces the roster entries of every quest holding full character snapshots to compact roster entries.
 
+    :param bot: The Discord bot instance
 
-async def update_character_experience(interaction, player_id: int, character_id: str,
-                                      amount: int):
-    bot = interaction.client
-    try:
-        player_data = await get_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: player_id}
+    :return: The number of quests updated
+    """
+    collection = bot.gdb[DatabaseCollections.QUESTS]
+    roster_filter = {'$or': [{f'{QuestFields.PARTY}.0': {'$exists': True}},
+                             {f'{QuestFields.WAIT_LIST}.0': {'$exists': True}}]}
+
+    cache_keys = []
+    cursor = collection.find(roster_filter, {QuestFields.GUILD_ID: 1, QuestFields.QUEST_ID: 1})
+    async for quest in cursor:
+        cache_keys.append(build_cache_key(bot.gdb.name, f'{quest[QuestFields.GUILD_ID]}:{quest[QuestFields.QUEST_ID]}',
+                                          DatabaseCollections.QUESTS))
+
+    result = await collection.update_many(roster_filter, [{
+        '$set': {
+            QuestFields.PARTY: slim_roster_expression(QuestFields.PARTY),
+            QuestFields.WAIT_LIST: slim_roster_expression(QuestFields.WAIT_LIST)
+        }
+    }])
+
+    if cache_keys:
+        await invalidate_cache(bot, *cache_keys)
+
+    return result.modified_count
+
+
+def roster_has_player(field: str, user_id: int) -> dict:
+    """Builds a query matching quests whose roster field holds an entry for the given player."""
+    return {field: {'$elemMatch': {str(user_id): {'$exists': True}}}}
+
+
+def roster_without_player(field: str, user_id: int) -> dict:
+    """Builds an aggregation expression for a roster field with the given player's entry removed."""
+    return {
+        '$filter': {
+            'input': f'${field}',
+            'as': 'entry',
+            'cond': {'$not': [{'$in': [str(user_id), {'$map': {
+                'input': {'$objectToArray': '$$entry'},
+                'in': '$$this.k'
+            }}]}]}
+        }
+    }
+
+
+def find_roster_entry(roster: list, user_id: int) -> dict | None:
+    """Returns the given player's entry in a roster list, if there is one."""
+    return next((entry for entry in roster if str(user_id) in entry), None)
+
+
+async def join_quest_roster(bot, guild_id: int, quest_id: str, user_id: int,
+                            roster_entry: dict) -> Tuple[dict | None, str | None]:
+    """
+    Adds a player to a quest's party, or to its wait list if the party is full. Each attempt is a single conditional
+    update, guarded on the lock state, the roster sizes, and the player not already being signed up.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param quest_id: The quest ID
+    :param user_id: The joining player's Discord ID
+    :param roster_entry: The entry to add to the roster
+
+    :return: A tuple of (the updated quest, the roster field the player was added to), or (None, None) if the player
+        could not join
+    """
+    collection = bot.gdb[DatabaseCollections.QUESTS]
+    base_filter = {
+        QuestFields.GUILD_ID: guild_id,
+        QuestFields.QUEST_ID: quest_id,
+        QuestFields.LOCK_STATE: {'$ne': True},
+        '$nor': [roster_has_player(QuestFields.PARTY, user_id), roster_has_player(QuestFields.WAIT_LIST, user_id)]
+    }
+    attempts = (
+        (QuestFields.PARTY, {'$lt': [{'$size': f'${QuestFields.PARTY}'}, f'${QuestFields.MAX_PARTY_SIZE}']}),
+        (QuestFields.WAIT_LIST, {'$and': [
+            {'$gte': [{'$size': f'${QuestFields.PARTY}'}, f'${QuestFields.MAX_PARTY_SIZE}']},
+            {'$lt': [{'$size': f'${QuestFields.WAIT_LIST}'}, f'${QuestFields.MAX_WAIT_LIST_SIZE}']}
+        ]})
+    )
+
+    for field, capacity_guard in attempts:
+        quest = await collection.find_one_and_update(
+            {**base_filter, '$expr': capacity_guard},
+            {'$push': {field: roster_entry}},
+            return_document=ReturnDocument.AFTER
         )
-        if not player_data:
-            raise UserFeedbackError('Player data not found.')
+        if quest:
+            await invalidate_cache(bot, build_cache_key(bot.gdb.name, f'{guild_id}:{quest_id}',
+                                                        DatabaseCollections.QUESTS))
+            return quest, field
 
-        character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
-        if not character_data:
-            raise UserFeedbackError('Character data not found.')
+    return None, None
+
+
+async def leave_quest_roster(bot, guild_id: int, quest_id: str, user_id: int,
+                             character_id: str | None = None) -> Tuple[dict | None, dict | None, bool]:
+    """
+    Removes a player from a quest's party or wait list in a single update. When a party member leaves a quest with a
+    wait list, the first player on the wait list is promoted into the party in the same update.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param quest_id: The quest ID
+    :param user_id: The leaving player's Discord ID
+    :param character_id: If provided, this character's individual rewards are removed from the quest in the same
+        update
 
-        if character_data[CharacterFields.ATTRIBUTES][CharacterFields.EXPERIENCE]:
-            character_data[CharacterFields.ATTRIBUTES][CharacterFields.EXPERIENCE] += amount
+    :return: A tuple containing:
+             - The updated quest, or None if the player was not signed up
+             - The promoted wait list entry, or None if nobody was promoted
+             - True if the player left the party, False if they left the wait list
+    """
+    in_party = {'$in': [str(user_id), {'$reduce': {
+        'input': f'${QuestFields.PARTY}',
+        'initialValue': [],
+        'in': {'$concatArrays': ['$$value', {'$map': {'input': {'$objectToArray': '$$this'}, 'in': '$$this.k'}}]}
+    }}]}
+    promote = {'$and': [
+        in_party,
+        {'$gt': [f'${QuestFields.MAX_WAIT_LIST_SIZE}', 0]},
+        {'$gt': [{'$size': f'${QuestFields.WAIT_LIST}'}, 0]}
+    ]}
+
+    pipeline = [{
+        '$set': {
+            QuestFields.PARTY: {'$concatArrays': [
+                roster_without_player(QuestFields.PARTY, user_id),
+                {'$cond': [promote, [{'$first': f'${QuestFields.WAIT_LIST}'}], []]}
+            ]},
+            QuestFields.WAIT_LIST: {'$cond': [
+                promote,
+                {'$slice': [f'${QuestFields.WAIT_LIST}', 1, {'$max': [1, {'$size': f'${QuestFields.WAIT_LIST}'}]}]},
+                roster_without_player(QuestFields.WAIT_LIST, user_id)
+            ]}
+        }
+    }]
+    if character_id:
+        pipeline.append({'$unset': f'{QuestFields.REWARDS}.{character_id}'})
+
+    quest = await bot.gdb[DatabaseCollections.QUESTS].find_one_and_update(
+        {
+            QuestFields.GUILD_ID: guild_id,
+            QuestFields.QUEST_ID: quest_id,
+            '$or': [roster_has_player(QuestFields.PARTY, user_id), roster_has_player(QuestFields.WAIT_LIST, user_id)]
+        },
+        pipeline,
+        return_document=ReturnDocument.BEFORE
+    )
+    if not quest:
+        return None, None, False
+
+    await invalidate_cache(bot, build_cache_key(bot.gdb.name, f'{guild_id}:{quest_id}', DatabaseCollections.QUESTS))
+
+    # Apply the same change to the pre-update document rather than reading the quest back
+    party = quest[QuestFields.PARTY]
+    wait_list = quest[QuestFields.WAIT_LIST]
+    left_party = find_roster_entry(party, user_id) is not None
+    promoted_entry = None
+    if left_party:
+        party.remove(find_roster_entry(party, user_id))
+        if quest[QuestFields.MAX_WAIT_LIST_SIZE] > 0 and wait_list:
+            promoted_entry = wait_list.pop(0)
+            party.append(promoted_entry)
+    else:
+        wait_list.remove(find_roster_entry(wait_list, user_id))
+    if character_id and quest.get(QuestFields.REWARDS):
+        quest[QuestFields.REWARDS].pop(character_id, None)
+
+    return quest, promoted_entry, left_party
+
+
+# ----- Quest Index -----
+
+
+# Each guild keeps a Redis sorted set of its quests, plus one per GM. Every member has the same score, so the sets
+# order lexicographically by member, which starts with the lowercased quest title.
+QUEST_INDEX_KEY = 'request:questIndex'
+QUEST_INDEX_SEPARATOR = '\x00'
+# Member added to every built index with a score of 1, after every quest. Its absence means the set was lost or never
+# built, e.g. Redis was restarted or evicted the key, and must be rebuilt.
+QUEST_INDEX_SENTINEL = '__index__'
+
+
+def build_quest_index_key(guild_id: int, gm_id: int | None = None) -> str:
+    if gm_id is None:
+        return f'{QUEST_INDEX_KEY}:{guild_id}'
+    return f'{QUEST_INDEX_KEY}:{guild_id}:{gm_id}'
+
+
+def build_quest_index_member(quest: dict) -> str:
+    return f'{quest.get(QuestFields.TITLE, "").lower()}{QUEST_INDEX_SEPARATOR}{quest[QuestFields.QUEST_ID]}'
+
+
+async def index_quest(bot, quest: dict):
+    """
+    Adds a quest to its guild's quest index and its GM's quest index.
+
+    :param bot: The Discord bot instance
+    :param quest: The quest document
+    """
+    member = build_quest_index_member(quest)
+    async with bot.rdb.pipeline(transaction=False) as pipe:
+        pipe.zadd(build_quest_index_key(quest[QuestFields.GUILD_ID]), {member: 0})
+        pipe.zadd(build_quest_index_key(quest[QuestFields.GUILD_ID], quest[QuestFields.GM]), {member: 0})
+        await pipe.execute()
+
+
+async def unindex_quest(bot, quest: dict):
+    """
+    Removes a quest from its guild's quest index and its GM's quest index. Call this with the quest as it was indexed,
+    before any change to its title.
+
+    :param bot: The Discord bot instance
+    :param quest: The quest document
+    """
+    member = build_quest_index_member(quest)
+    async with bot.rdb.pipeline(transaction=False) as pipe:
+        pipe.zrem(build_quest_index_key(quest[QuestFields.GUILD_ID]), member)
+        pipe.zrem(build_quest_index_key(quest[QuestFields.GUILD_ID], quest[QuestFields.GM]), member)
+        await pipe.execute()
+
+
+async def ensure_quest_index(bot, guild_id: int, gm_id: int | None = None):
+    """
+    Builds a guild's quest indexes from the database if the index about to be read has been lost from Redis.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param gm_id: The GM's Discord ID, or None to check the guild's index
+    """
+    index_key = build_quest_index_key(guild_id, gm_id)
+    if await bot.rdb.zscore(index_key, QUEST_INDEX_SENTINEL) is not None:
+        return
+
+    cursor = bot.gdb[DatabaseCollections.QUESTS].find(
+        {QuestFields.GUILD_ID: guild_id},
+        {QuestFields.GUILD_ID: 1, QuestFields.QUEST_ID: 1, QuestFields.TITLE: 1, QuestFields.GM: 1}
+    )
+    indexes = {build_quest_index_key(guild_id): {}, index_key: {}}
+    async for quest in cursor:
+        member = build_quest_index_member(quest)
+        indexes[build_quest_index_key(guild_id)][member] = 0
+        indexes.setdefault(build_quest_index_key(guild_id, quest[QuestFields.GM]), {})[member] = 0
+
+    async with bot.rdb.pipeline(transaction=False) as pipe:
+        for key, members in indexes.items():
+            pipe.zadd(key, {**members, QUEST_INDEX_SENTINEL: 1})
+        await pipe.execute()
+
+
+async def get_quest_page(bot, guild_id: int, gm_id: int | None, page: int,
+                         per_page: int) -> Tuple[list[dict], int]:
+    """
+    Retrieves one page of a guild's quests, or of one GM's quests, ordered by title.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param gm_id: The GM's Discord ID, or None for every quest in the guild
+    :param page: The zero-based page number
+    :param per_page: The number of quests per page
+
+    :return: A tuple of (the quests on the page, the total number of quests)
+    """
+    await ensure_quest_index(bot, guild_id, gm_id)
+
+    # Quests all score 0; reading by score leaves out the sentinel
+    index_key = build_quest_index_key(guild_id, gm_id)
+    start = page * per_page
+    async with bot.rdb.pipeline(transaction=False) as pipe:
+        pipe.zcount(index_key, 0, 0)
+        pipe.zrangebyscore(index_key, 0, 0, start=start, num=per_page)
+        total, members = await pipe.execute()
+
+    if not members:
+        return [], total
+
+    quest_ids = [member.rsplit(QUEST_INDEX_SEPARATOR, 1)[1] for member in members]
+    cursor = bot.gdb[DatabaseCollections.QUESTS].find(
+        {QuestFields.GUILD_ID: guild_id, QuestFields.QUEST_ID: {'$in': quest_ids}}
+    )
+    quests = {quest[QuestFields.QUEST_ID]: quest async for quest in cursor}
+
+    # Drop members left behind by quests removed or renamed without updating the index
+    page_quests = []
+    stale_members = []
+    for member, quest_id in zip(members, quest_ids):
+        quest = quests.get(quest_id)
+        if quest and build_quest_index_member(quest) == member:
+            page_quests.append(quest)
         else:
-            character_data[CharacterFields.ATTRIBUTES][CharacterFields.EXPERIENCE] = amount
+            stale_members.append(member)
 
-        await update_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: player_id},
-            update_data={'$set': {f'{CharacterFields.CHARACTERS}.{character_id}': character_data}}
-        )
-    except Exception as e:
-        await log_exception(e, interaction)
+    if stale_members:
+        await bot.rdb.zrem(index_key, *stale_members)
+        total -= len(stale_members)
+
+    return page_quests, total
 
 
 async def update_quest_embed(quest: dict) -> discord.Embed | None:
@@ -818,22 +2283,13 @@ def get_denomination_map(currency_config: dict, currency_name: str) -> Tuple[dic
     if not currency_config or CurrencyFields.CURRENCIES not in currency_config:
         return None, None
 
-    _denom_name, parent_name = find_currency_or_denomination(currency_config, currency_name)
+    index = get_currency_index(currency_config)
+    _denom_name, parent_name = index.find(currency_name)
 
     if not parent_name:
         return None, None
 
-    parent_currency_config = next(
-        (currency for currency in currency_config[CurrencyFields.CURRENCIES] if currency[CommonFields.NAME].lower() == parent_name.lower()),
-        None
-    )
-
-    if not parent_currency_config:
-        return None, None  # Config is inconsistent
-
-    denomination_map = {parent_name.lower(): 1.0}
-    for denom in parent_currency_config.get(CurrencyFields.DENOMINATIONS, []):
-        denomination_map[denom[CommonFields.NAME].lower()] = float(denom[CurrencyFields.VALUE])
+    denomination_map = dict(index.denomination_maps[parent_name.lower()])
 
     return denomination_map, parent_name
 
@@ -856,31 +2312,12 @@ def check_sufficient_funds(player_currency: dict, currency_config: dict, cost_cu
         if cost_amount <= 0:
             return True, "OK"
 
-        denomination_map, _ = get_denomination_map(currency_config, cost_currency_name.lower())
-
-        if not denomination_map:
+        system = get_currency_index(currency_config).system_for(cost_currency_name)
+        if not system:
             return False, f"Currency '{cost_currency_name}' is not configured on this server."
 
-        cost_name_lower = cost_currency_name.lower()
-        if cost_name_lower not in denomination_map:
-            return False, f"Cost currency '{cost_currency_name}' is not part of its own currency system."
-
-        min_value = min(denomination_map.values())
-        if min_value <= 0:
-            return False, "Currency configuration error: 0 or negative denomination value."
-
-        norm_player_currency = normalize_currency_keys(player_currency)
-        player_total_value = 0.0
-
-        for denom_name_lower, denom_value in denomination_map.items():
-            player_qty = norm_player_currency.get(denom_name_lower, 0)
-            player_total_value += player_qty * (denom_value / min_value)
-
-        cost_denom_value = denomination_map[cost_name_lower]
-        cost_total_value = cost_amount * (cost_denom_value / min_value)
-
-        tolerance = 1e-9
-        if player_total_value + tolerance < cost_total_value:
+        player_total = system.wallet_units(normalize_currency_keys(player_currency))
+        if player_total < system.to_units(cost_currency_name, cost_amount):
             return False, "Insufficient funds."
 
         return True, "OK"
@@ -890,94 +2327,6 @@ def check_sufficient_funds(player_currency: dict, currency_config: dict, cost_cu
         return False, f"An error occurred during currency validation: {e}"
 
 
-def apply_item_change_local(character_data: dict, item_name: str, quantity: int) -> dict:
-    """
-    Applies an item change to a character's inventory dict.
-
-    :param character_data: The character's data dictionary
-    :param item_name: The name of the item to add or remove
-    :param quantity: The quantity to add (positive) or remove (negative)
-
-    :return: The updated character data dictionary
-    """
-    inventory = normalize_currency_keys(character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {}))
-    item_name_lower = item_name.lower()
-
-    found_key = item_name_lower
-
-    if found_key in inventory:
-        inventory[found_key] += int(quantity)
-        if inventory[found_key] <= 0:
-            del inventory[found_key]
-    elif quantity > 0:
-        inventory[item_name.lower()] = int(quantity)
-    elif quantity < 0:
-        raise UserFeedbackError(f"Insufficient item(s): {titlecase(item_name)}")
-
-    character_data[CharacterFields.ATTRIBUTES][CharacterFields.INVENTORY] = {titlecase(k): v for k, v in inventory.items()}
-    return character_data
-
-
-def apply_currency_change_local(character_data: dict, currency_config: dict, item_name: str, quantity: float) -> dict:
-    """
-    Applies a currency change to a character's currency dict.
-
-    :param character_data: The character's data dictionary
-    :param currency_config: The server's currency config dict
-    :param item_name: The name of the currency or denomination to add or remove
-    :param quantity: The amount to add (positive) or remove (negative)
-
-    :return: The updated character data dictionary
-    """
-    normalized_item_name = item_name.lower()
-    is_currency, currency_parent_name = find_currency_or_denomination(currency_config, normalized_item_name)
-
-    if not is_currency:
-        raise UserFeedbackError(f'{item_name} is not a valid currency.')
-
-    denomination_map, _ = get_denomination_map(currency_config, normalized_item_name)
-    if not denomination_map:
-        raise UserFeedbackError(f'Currency {item_name} could not be processed.')
-
-    min_value = min(denomination_map.values())
-    if min_value <= 0:
-        raise Exception(f'Currency {currency_parent_name} has a non-positive denomination value.')
-
-    character_currency = normalize_currency_keys(character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {}))
-
-    total_in_lowest_denom = 0.0
-    for denom, value in denomination_map.items():
-        total_in_lowest_denom += character_currency.get(denom, 0) * (value / min_value)
-
-    change_value_in_lowest = quantity * (denomination_map[item_name.lower()] / min_value)
-
-    total_in_lowest_denom += change_value_in_lowest
-
-    tolerance = 1e-9
-    if total_in_lowest_denom < -tolerance:
-        raise UserFeedbackError('Insufficient funds for this transaction.')
-    if total_in_lowest_denom < 0:
-        total_in_lowest_denom = 0.0
-
-    new_character_currency = {}
-    for denom, value in sorted(denomination_map.items(), key=lambda x: -x[1]):
-        denom_value_in_lowest = value / min_value
-        if total_in_lowest_denom + tolerance >= denom_value_in_lowest:
-            qty = int(total_in_lowest_denom // denom_value_in_lowest)
-            new_character_currency[denom] = qty
-            total_in_lowest_denom %= denom_value_in_lowest
-
-    final_wallet = normalize_currency_keys(character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CURRENCY, {}))
-    for denom_name in denomination_map.keys():
-        if denom_name in new_character_currency:
-            final_wallet[denom_name] = new_character_currency[denom_name]
-        elif denom_name in final_wallet:
-            del final_wallet[denom_name]
-
-    character_data[CharacterFields.ATTRIBUTES][CharacterFields.CURRENCY] = {titlecase(k): v for k, v in final_wallet.items() if v > 0}
-    return character_data
-
-
 def get_base_currency_info(currency_config: dict, currency_name: str):
     """
     Returns base currency info for a given currency name.
@@ -990,20 +2339,16 @@ def get_base_currency_info(currency_config: dict, currency_name: str):
     - Tuple[str | None, float, bool]: A tuple containing the base currency name (or None if not found),
       the multiplier to convert to base currency, and a boolean indicating if it's a double currency.
     """
+    index = get_currency_index(currency_config)
     normalized_name = currency_name.lower()
-    is_currency, parent_name = find_currency_or_denomination(currency_config, normalized_name)
+    is_currency, base_name = index.find(normalized_name)
 
     if not is_currency:
         return None, 0, False
 
-    denomination_map, base_name = get_denomination_map(currency_config, normalized_name)
-    multiplier = denomination_map.get(normalized_name, 0)
-
-    is_double = False
-    for currency in currency_config.get(CurrencyFields.CURRENCIES):
-        if currency[CommonFields.NAME].lower() == base_name.lower():
-            is_double = currency.get(CurrencyFields.IS_DOUBLE, False)
-            break
+    base_key = base_name.lower()
+    multiplier = index.denomination_maps[base_key].get(normalized_name, 0)
+    is_double = index.is_double[base_key]
 
     return base_name, multiplier, is_double
 
@@ -1021,19 +2366,19 @@ def consolidate_currency_totals(raw_totals: dict, currency_config: dict) -> dict
     if not currency_config:
         return raw_totals
 
+    index = get_currency_index(currency_config)
     consolidated = {}
 
     for currency_name, amount in raw_totals.items():
-        base_name, multiplier, _ = get_base_currency_info(currency_config, currency_name)
+        system = index.system_for(currency_name)
 
-        if base_name:
-            base_key = base_name.lower()
-            total_value_in_base = amount * multiplier
-            consolidated[base_key] = consolidated.get(base_key, 0.0) + total_value_in_base
+        if system:
+            total_value_in_base = system.units_to_base(system.to_units(currency_name, amount))
+            consolidated[system.key] = consolidated.get(system.key, 0) + total_value_in_base
         else:
-            consolidated[currency_name] = consolidated.get(currency_name, 0.0) + amount
+            consolidated[currency_name] = consolidated.get(currency_name, 0) + to_exact_amount(amount)
 
-    return consolidated
+    return {name: float(total) for name, total in consolidated.items()}
 
 
 def format_consolidated_totals(base_totals: dict, currency_config: dict) -> list[str]:
@@ -1046,47 +2391,28 @@ def format_consolidated_totals(base_totals: dict, currency_config: dict) -> list
     :return: A list of formatted currency total strings
     """
     output = []
+    index = get_currency_index(currency_config)
 
     for base_name, total_value in base_totals.items():
-        curr_conf = None
-        if currency_config:
-            for c in currency_config.get(CurrencyFields.CURRENCIES, []):
-                if c[CommonFields.NAME].lower() == base_name.lower():
-                    curr_conf = c
-                    break
-
-        if not curr_conf:
+        system = index.systems.get(base_name.lower())
+
+        if not system:
             output.append(f"{titlecase(base_name)}: {total_value}")
             continue
 
-        base_display_name = curr_conf[CommonFields.NAME]
-
-        if curr_conf.get(CurrencyFields.IS_DOUBLE, False):
-            output.append(f"{titlecase(base_display_name)}: {total_value:.2f}")
+        if system.is_double:
+            output.append(f"{titlecase(system.name)}: {format_two_places(total_value)}")
         else:
-            denoms = curr_conf.get(CurrencyFields.DENOMINATIONS, [])
-            all_denoms = [{CommonFields.NAME: curr_conf[CommonFields.NAME], CurrencyFields.VALUE: 1.0}] + denoms
-            all_denoms.sort(key=lambda x: float(x[CurrencyFields.VALUE]), reverse=True)
-
-            parts = []
-            remaining_val = total_value
-
-            tolerance = 1e-9
-
-            for d in all_denoms:
-                d_val = float(d[CurrencyFields.VALUE])
-                if remaining_val + tolerance >= d_val:
-                    count = int(remaining_val / d_val + tolerance)
-                    if count > 0:
-                        parts.append(f'{count} {titlecase(d[CommonFields.NAME])}')
-                        remaining_val -= count * d_val
+            total_units = round(system.to_units(system.key, total_value))
+            parts = [f'{count} {titlecase(system.display_names[key])}'
+                     for key, count in system.make_change(total_units).items()]
 
             if parts:
                 output.append(', '.join(parts))
             elif total_value == 0:
-                output.append(f'{titlecase(base_display_name)}: 0')
+                output.append(f'{titlecase(system.name)}: 0')
             elif total_value > 0:
-                output.append(f'{titlecase(base_display_name)}: {total_value:.2f}')
+                output.append(f'{titlecase(system.name)}: {format_two_places(total_value)}')
 
     return output
 
@@ -1101,15 +2427,12 @@ def format_currency_amount(amount, currency_name, currency_config) -> str:
 
     :return: A formatted amount string (e.g. '50' for integer, '2.50' for double)
     """
-    _, _, is_double = get_base_currency_info(currency_config, currency_name)
+    system = get_currency_index(currency_config).system_for(currency_name)
+    exact_amount = to_exact_amount(amount)
 
-    if is_double:
-        return f'{amount:.2f}'
-    else:
-        if amount % 1 == 0:
-            return str(int(amount))
-        else:
-            return f'{amount:.2f}'
+    if (system and system.is_double) or exact_amount.denominator != 1:
+        return format_two_places(exact_amount)
+    return str(exact_amount.numerator)
 
 
 def format_price_string(amount, currency_name, currency_config) -> str:
@@ -1229,6 +2552,23 @@ async def get_shop_channel(bot, guild_id: int, channel_id: str) -> discord.abc.M
         return None
 
 
+def build_shop_stock_id(guild_id: int, channel_id: str) -> str:
+    return f'{guild_id}:{channel_id}'
+
+
+def build_shop_stock_cache_key(bot, guild_id: int, channel_id: str) -> str:
+    return build_cache_key(bot.gdb.name, build_shop_stock_id(guild_id, channel_id), DatabaseCollections.SHOP_STOCK)
+
+
+def shop_stock_item_path(item_name: str) -> str:
+    return f'{ShopFields.ITEMS}.{encode_mongo_key(item_name)}'
+
+
+def shop_stock_owner(guild_id: int, channel_id: str) -> dict:
+    """The fields identifying the shop a stock document belongs to, set whenever a stock document is upserted."""
+    return {ShopFields.GUILD_ID: guild_id, ShopFields.CHANNEL_ID: str(channel_id)}
+
+
 async def get_item_stock(bot, guild_id: int, channel_id: str, item_name: str) -> dict | None:
     """
     Retrieves stock information for a specific item in a shop.
@@ -1238,20 +2578,9 @@ async def get_item_stock(bot, guild_id: int, channel_id: str, item_name: str) ->
     :param channel_id: The shop channel ID
     :param item_name: The name of the item
 
-    :return: Dict with 'available' and 'reserved' counts, or None if unlimited
-    """
-    stock_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.gdb,
-        collection_name=DatabaseCollections.SHOP_STOCK,
-        query={CommonFields.ID: guild_id}
-    )
-
-    if not stock_data:
-        return None
-
-    shops = stock_data.get(ShopFields.SHOPS, {})
-    shop_stock = shops.get(str(channel_id), {})
+    :return: Dict with 'available' and 'reserved' counts, or None if unlimited
+    """
+    shop_stock = await get_shop_stock(bot, guild_id, channel_id)
     item_stock = shop_stock.get(encode_mongo_key(item_name))
 
     if item_stock is None:
@@ -1265,7 +2594,8 @@ async def get_item_stock(bot, guild_id: int, channel_id: str, item_name: str) ->
 
 async def get_shop_stock(bot, guild_id: int, channel_id: str) -> dict:
     """
-    Retrieves all stock information for a shop.
+    Retrieves all stock information for a shop. Each shop's stock is its own document and cache entry, so stock
+    changes in one shop never evict another shop's stock from the cache.
 
     :param bot: The Discord bot instance
     :param guild_id: The guild ID
@@ -1273,18 +2603,20 @@ async def get_shop_stock(bot, guild_id: int, channel_id: str) -> dict:
 
     :return: Dict mapping item names to their stock info, empty dict if no stock limits
     """
+    if stock_engine_is_redis(bot):
+        return await get_stock_counters(bot, guild_id, channel_id)
+
     stock_data = await get_cached_data(
         bot=bot,
         mongo_database=bot.gdb,
         collection_name=DatabaseCollections.SHOP_STOCK,
-        query={CommonFields.ID: guild_id}
+        query={CommonFields.ID: build_shop_stock_id(guild_id, channel_id)}
     )
 
     if not stock_data:
         return {}
 
-    shops = stock_data.get(ShopFields.SHOPS, {})
-    return shops.get(str(channel_id), {})
+    return stock_data.get(ShopFields.ITEMS, {})
 
 
 async def initialize_item_stock(bot, guild_id: int, channel_id: str, item_name: str,
@@ -1302,14 +2634,21 @@ async def initialize_item_stock(bot, guild_id: int, channel_id: str, item_name:
     if current_stock is None:
         current_stock = max_stock
 
+    if stock_engine_is_redis(bot):
+        item_key = encode_mongo_key(item_name)
+        await run_stock_script(bot, STOCK_SET_SCRIPT, guild_id, channel_id,
+                               f'a:{item_key}', current_stock, f'r:{item_key}', 0)
+        return
+
     await update_cached_data(
         bot=bot,
         mongo_database=bot.gdb,
         collection_name=DatabaseCollections.SHOP_STOCK,
-        query={CommonFields.ID: guild_id},
+        query={CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
         update_data={
             '$set': {
-                f'{ShopFields.SHOPS}.{channel_id}.{encode_mongo_key(item_name)}': {
+                **shop_stock_owner(guild_id, channel_id),
+                shop_stock_item_path(item_name): {
                     ShopFields.AVAILABLE: current_stock,
                     ShopFields.RESERVED: 0
                 }
@@ -1327,19 +2666,46 @@ async def remove_item_stock_limit(bot, guild_id: int, channel_id: str, item_name
     :param channel_id: The shop channel ID
     :param item_name: The name of the item
     """
+    if stock_engine_is_redis(bot):
+        item_key = encode_mongo_key(item_name)
+        await run_stock_script(bot, STOCK_SET_SCRIPT, guild_id, channel_id, f'a:{item_key}', '', f'r:{item_key}', '')
+        return
+
     await update_cached_data(
         bot=bot,
         mongo_database=bot.gdb,
         collection_name=DatabaseCollections.SHOP_STOCK,
-        query={CommonFields.ID: guild_id},
+        query={CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
         update_data={
             '$unset': {
-                f'{ShopFields.SHOPS}.{channel_id}.{encode_mongo_key(item_name)}': ''
+                shop_stock_item_path(item_name): ''
             }
         }
     )
 
 
+async def delete_shop_stock(bot, guild_id: int, channel_id: str):
+    """
+    Deletes a shop's stock document, including its last restock time.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param channel_id: The shop channel ID
+    """
+    if stock_engine_is_redis(bot):
+        async with bot.rdb.pipeline(transaction=True) as pipe:
+            pipe.delete(build_stock_counter_key(guild_id, channel_id))
+            pipe.srem(STOCK_DIRTY_KEY, build_shop_stock_id(guild_id, channel_id))
+            await pipe.execute()
+
+    await delete_cached_data(
+        bot=bot,
+        mongo_database=bot.gdb,
+        collection_name=DatabaseCollections.SHOP_STOCK,
+        search_filter={CommonFields.ID: build_shop_stock_id(guild_id, channel_id)}
+    )
+
+
 async def reserve_stock(bot, guild_id: int, channel_id: str, item_name: str, quantity: int = 1) -> bool:
     """
     Atomically reserves stock by moving from available to reserved.
@@ -1352,18 +2718,23 @@ async def reserve_stock(bot, guild_id: int, channel_id: str, item_name: str, qua
 
     :return: True if reservation succeeded, False if insufficient stock
     """
+    if stock_engine_is_redis(bot):
+        result = await run_stock_script(bot, STOCK_RESERVE_SCRIPT, guild_id, channel_id,
+                                        encode_mongo_key(item_name), quantity)
+        return result == 1
+
     collection = bot.gdb[DatabaseCollections.SHOP_STOCK]
 
-    encoded_name = encode_mongo_key(item_name)
+    path = shop_stock_item_path(item_name)
     result = await collection.find_one_and_update(
         {
-            CommonFields.ID: guild_id,
-            f'{ShopFields.SHOPS}.{channel_id}.{encoded_name}.{ShopFields.AVAILABLE}': {'$gte': quantity}
+            CommonFields.ID: build_shop_stock_id(guild_id, channel_id),
+            f'{path}.{ShopFields.AVAILABLE}': {'$gte': quantity}
         },
         {
             '$inc': {
-                f'{ShopFields.SHOPS}.{channel_id}.{encoded_name}.{ShopFields.AVAILABLE}': -quantity,
-                f'{ShopFields.SHOPS}.{channel_id}.{encoded_name}.{ShopFields.RESERVED}': quantity
+                f'{path}.{ShopFields.AVAILABLE}': -quantity,
+                f'{path}.{ShopFields.RESERVED}': quantity
             }
         },
         return_document=True
@@ -1371,38 +2742,30 @@ async def reserve_stock(bot, guild_id: int, channel_id: str, item_name: str, qua
 
     # Invalidate cache after update
     if result:
-        cache_key = build_cache_key(bot.gdb.name, guild_id, DatabaseCollections.SHOP_STOCK)
-        try:
-            await bot.rdb.delete(cache_key)
-        except Exception as e:
-            logger.error(f"Redis delete failed: {e}")
+        await invalidate_cache(bot, build_shop_stock_cache_key(bot, guild_id, channel_id))
         return True
 
     return False
 
 
-async def release_stock(bot, guild_id: int, channel_id: str, item_name: str,
-                        quantity: int = 1, max_stock: int | None = None):
+def build_stock_release(guild_id: int, channel_id: str, item_name: str, quantity: int,
+                        max_stock: int | None = None) -> Tuple[dict, list]:
     """
-    Releases reserved stock back to available, capped at max_stock.
+    Builds the filter and update pipeline that move reserved stock back to available, capped at max_stock.
 
-    :param bot: The Discord bot instance
-    :param guild_id: The guild ID
-    :param channel_id: The shop channel ID
-    :param item_name: The name of the item
-    :param quantity: The quantity to release
-    :param max_stock: The maximum stock for this item (caps available to prevent overflow)
+    :return: A tuple of (filter, pipeline) for an update on the shop stock collection
     """
-    collection = bot.gdb[DatabaseCollections.SHOP_STOCK]
-    encoded_name = encode_mongo_key(item_name)
-    path = f'{ShopFields.SHOPS}.{channel_id}.{encoded_name}'
+    path = shop_stock_item_path(item_name)
 
     new_available = {'$add': [f'${path}.{ShopFields.AVAILABLE}', quantity]}
     if max_stock is not None:
         new_available = {'$min': [max_stock, new_available]}
 
-    result = await collection.update_one(
-        {CommonFields.ID: guild_id, f'{path}.{ShopFields.RESERVED}': {'$exists': True}},
+    return (
+        {
+            CommonFields.ID: build_shop_stock_id(guild_id, channel_id),
+            f'{path}.{ShopFields.RESERVED}': {'$exists': True}
+        },
         [
             {
                 '$set': {
@@ -1413,13 +2776,32 @@ async def release_stock(bot, guild_id: int, channel_id: str, item_name: str,
         ]
     )
 
+
+async def release_stock(bot, guild_id: int, channel_id: str, item_name: str,
+                        quantity: int = 1, max_stock: int | None = None):
+    """
+    Releases reserved stock back to available, capped at max_stock.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param channel_id: The shop channel ID
+    :param item_name: The name of the item
+    :param quantity: The quantity to release
+    :param max_stock: The maximum stock for this item (caps available to prevent overflow)
+    """
+    if stock_engine_is_redis(bot):
+        await run_stock_script(bot, STOCK_RELEASE_SCRIPT, guild_id, channel_id, encode_mongo_key(item_name),
+                               quantity, '' if max_stock is None else max_stock)
+        return
+
+    collection = bot.gdb[DatabaseCollections.SHOP_STOCK]
+    release_filter, release_pipeline = build_stock_release(guild_id, channel_id, item_name, quantity, max_stock)
+
+    result = await collection.update_one(release_filter, release_pipeline)
+
     # Invalidate cache after update
     if result.modified_count > 0:
-        cache_key = build_cache_key(bot.gdb.name, guild_id, DatabaseCollections.SHOP_STOCK)
-        try:
-            await bot.rdb.delete(cache_key)
-        except Exception as e:
-            logger.error(f"Redis delete failed: {e}")
+        await invalidate_cache(bot, build_shop_stock_cache_key(bot, guild_id, channel_id))
 
 
 async def finalize_stock(bot, guild_id: int, channel_id: str, item_name: str, quantity: int = 1):
@@ -1432,12 +2814,19 @@ async def finalize_stock(bot, guild_id: int, channel_id: str, item_name: str, qu
     :param item_name: The name of the item
     :param quantity: The quantity to finalize
     """
+    if stock_engine_is_redis(bot):
+        await run_stock_script(bot, STOCK_FINALIZE_SCRIPT, guild_id, channel_id, encode_mongo_key(item_name),
+                               quantity)
+        return
+
     collection = bot.gdb[DatabaseCollections.SHOP_STOCK]
-    encoded_name = encode_mongo_key(item_name)
-    path = f'{ShopFields.SHOPS}.{channel_id}.{encoded_name}'
+    path = shop_stock_item_path(item_name)
 
     result = await collection.update_one(
-        {CommonFields.ID: guild_id, f'{path}.{ShopFields.RESERVED}': {'$exists': True}},
+        {
+            CommonFields.ID: build_shop_stock_id(guild_id, channel_id),
+            f'{path}.{ShopFields.RESERVED}': {'$exists': True}
+        },
         [
             {
                 '$set': {
@@ -1449,11 +2838,7 @@ async def finalize_stock(bot, guild_id: int, channel_id: str, item_name: str, qu
 
     # Invalidate cache after update
     if result.modified_count > 0:
-        cache_key = build_cache_key(bot.gdb.name, guild_id, DatabaseCollections.SHOP_STOCK)
-        try:
-            await bot.rdb.delete(cache_key)
-        except Exception as e:
-            logger.error(f"Redis delete failed: {e}")
+        await invalidate_cache(bot, build_shop_stock_cache_key(bot, guild_id, channel_id))
 
 
 async def set_available_stock(bot, guild_id: int, channel_id: str, item_name: str, amount: int):
@@ -1466,14 +2851,20 @@ async def set_available_stock(bot, guild_id: int, channel_id: str, item_name: st
     :param item_name: The name of the item
     :param amount: The amount to set available stock to
     """
+    if stock_engine_is_redis(bot):
+        await run_stock_script(bot, STOCK_SET_SCRIPT, guild_id, channel_id,
+                               f'a:{encode_mongo_key(item_name)}', amount)
+        return
+
     await update_cached_data(
         bot=bot,
         mongo_database=bot.gdb,
         collection_name=DatabaseCollections.SHOP_STOCK,
-        query={CommonFields.ID: guild_id},
+        query={CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
         update_data={
             '$set': {
-                f'{ShopFields.SHOPS}.{channel_id}.{encode_mongo_key(item_name)}.{ShopFields.AVAILABLE}': amount
+                **shop_stock_owner(guild_id, channel_id),
+                f'{shop_stock_item_path(item_name)}.{ShopFields.AVAILABLE}': amount
             }
         }
     )
@@ -1491,12 +2882,19 @@ async def increment_available_stock(bot, guild_id: int, channel_id: str, item_na
     :param increment: The amount to add
     :param max_stock: The maximum stock allowed
     """
+    if stock_engine_is_redis(bot):
+        await run_stock_script(bot, STOCK_RESTOCK_SCRIPT, guild_id, channel_id, '0', increment,
+                               encode_mongo_key(item_name), max_stock)
+        return
+
     collection = bot.gdb[DatabaseCollections.SHOP_STOCK]
-    encoded_name = encode_mongo_key(item_name)
-    path = f'{ShopFields.SHOPS}.{channel_id}.{encoded_name}'
+    path = shop_stock_item_path(item_name)
 
     result = await collection.update_one(
-        {CommonFields.ID: guild_id, f'{path}.{ShopFields.AVAILABLE}': {'$exists': True}},
+        {
+            CommonFields.ID: build_shop_stock_id(guild_id, channel_id),
+            f'{path}.{ShopFields.AVAILABLE}': {'$exists': True}
+        },
         [
             {
                 '$set': {
@@ -1508,11 +2906,92 @@ async def increment_available_stock(bot, guild_id: int, channel_id: str, item_na
 
     # Invalidate cache after update
     if result.modified_count > 0:
-        cache_key = build_cache_key(bot.gdb.name, guild_id, DatabaseCollections.SHOP_STOCK)
-        try:
-            await bot.rdb.delete(cache_key)
-        except Exception as e:
-            logger.error(f"Redis delete failed: {e}")
+        await invalidate_cache(bot, build_shop_stock_cache_key(bot, guild_id, channel_id))
+
+
+async def restock_shop_stock(bot, guild_id: int, channel_id: str, max_stocks: dict[str, int], mode: str,
+                             increment: int = 1) -> list[Tuple[str, int]]:
+    """
+    Restocks every limited item in a shop with a single update.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param channel_id: The shop channel ID
+    :param max_stocks: A dict mapping item names to their maximum stock
+    :param mode: The restock mode. Full restocks set available stock to the maximum; incremental restocks add the
+        increment up to the maximum, and only to items whose stock is already tracked.
+    :param increment: The amount to add to each item in incremental mode
+
+    :return: A list of (item_name, amount_added) tuples for the items whose available stock went up
+    """
+    if not max_stocks:
+        return []
+
+    full_restock = mode == RestockMode.FULL.value
+
+    if stock_engine_is_redis(bot):
+        restock_args = []
+        for item_name, max_stock in max_stocks.items():
+            restock_args.extend([encode_mongo_key(item_name), max_stock])
+        previous_values = await run_stock_script(bot, STOCK_RESTOCK_SCRIPT, guild_id, channel_id,
+                                                 '1' if full_restock else '0', increment, *restock_args)
+
+        restocked_items = []
+        for (item_name, max_stock), previous in zip(max_stocks.items(), previous_values):
+            if previous < 0:
+                continue
+            amount_added = max_stock - previous if full_restock else min(increment, max_stock - previous)
+            if amount_added > 0:
+                restocked_items.append((item_name, amount_added))
+        return restocked_items
+
+    new_values = {}
+    if full_restock:
+        # Full restocks may create the shop's stock document
+        for field, value in shop_stock_owner(guild_id, channel_id).items():
+            new_values[field] = {'$literal': value}
+    for item_name, max_stock in max_stocks.items():
+        item_path = shop_stock_item_path(item_name)
+        if full_restock:
+            new_values[f'{item_path}.{ShopFields.AVAILABLE}'] = {'$literal': max_stock}
+        else:
+            # Incremental restocks never start tracking an item, so items without a stock entry are left out
+            available_path = f'${item_path}.{ShopFields.AVAILABLE}'
+            new_values[item_path] = {'$cond': [
+                {'$eq': [{'$type': f'${item_path}'}, 'missing']},
+                '$$REMOVE',
+                {'$mergeObjects': [f'${item_path}', {ShopFields.AVAILABLE: {
+                    '$min': [max_stock, {'$add': [{'$ifNull': [available_path, 0]}, increment]}]
+                }}]}
+            ]}
+
+    collection = bot.gdb[DatabaseCollections.SHOP_STOCK]
+    before = await collection.find_one_and_update(
+        {CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
+        [{'$set': new_values}],
+        projection={ShopFields.ITEMS: 1},
+        upsert=full_restock,
+        return_document=ReturnDocument.BEFORE
+    )
+
+    await invalidate_cache(bot, build_shop_stock_cache_key(bot, guild_id, channel_id))
+
+    previous_stock = (before or {}).get(ShopFields.ITEMS, {})
+    restocked_items = []
+    for item_name, max_stock in max_stocks.items():
+        item_key = encode_mongo_key(item_name)
+        previous = previous_stock.get(item_key, {}).get(ShopFields.AVAILABLE, 0)
+        if full_restock:
+            amount_added = max_stock - previous
+        elif item_key in previous_stock:
+            amount_added = min(increment, max_stock - previous)
+        else:
+            continue
+
+        if amount_added > 0:
+            restocked_items.append((item_name, amount_added))
+
+    return restocked_items
 
 
 async def update_last_restock(bot, guild_id: int, channel_id: str, timestamp: str):
@@ -1528,10 +3007,11 @@ async def update_last_restock(bot, guild_id: int, channel_id: str, timestamp: st
         bot=bot,
         mongo_database=bot.gdb,
         collection_name=DatabaseCollections.SHOP_STOCK,
-        query={CommonFields.ID: guild_id},
+        query={CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
         update_data={
             '$set': {
-                f'{RestockFields.LAST_RESTOCK}.{channel_id}': timestamp
+                **shop_stock_owner(guild_id, channel_id),
+                RestockFields.LAST_RESTOCK: timestamp
             }
         }
     )
@@ -1551,19 +3031,553 @@ async def get_last_restock(bot, guild_id: int, channel_id: str) -> str | None:
         bot=bot,
         mongo_database=bot.gdb,
         collection_name=DatabaseCollections.SHOP_STOCK,
-        query={CommonFields.ID: guild_id}
+        query={CommonFields.ID: build_shop_stock_id(guild_id, channel_id)}
     )
 
     if not stock_data:
         return None
 
-    return stock_data.get(RestockFields.LAST_RESTOCK, {}).get(str(channel_id))
+    return stock_data.get(RestockFields.LAST_RESTOCK)
+
+
+async def migrate_shop_stock(bot) -> int:
+    """
+    Splits the guild-wide stock documents used by earlier versions, which held every shop's stock under
+    shops.{channel}, into one stock document per shop. Safe to run repeatedly; guilds already migrated are skipped.
+
+    :param bot: The Discord bot instance
+
+    :return: The number of shops migrated
+    """
+    collection = bot.gdb[DatabaseCollections.SHOP_STOCK]
+    legacy_cursor = collection.find({'$or': [
+        {ShopFields.SHOPS: {'$exists': True}},
+        {RestockFields.LAST_RESTOCK: {'$type': 'object'}}
+    ]})
+
+    shop_count = 0
+    async for legacy_doc in legacy_cursor:
+        guild_id = legacy_doc[CommonFields.ID]
+        shop_updates = {}
+        for channel_id, items in legacy_doc.get(ShopFields.SHOPS, {}).items():
+            shop_updates.setdefault(channel_id, {})[ShopFields.ITEMS] = items
+        for channel_id, timestamp in legacy_doc.get(RestockFields.LAST_RESTOCK, {}).items():
+            shop_updates.setdefault(channel_id, {})[RestockFields.LAST_RESTOCK] = timestamp
+
+        operations = [
+            UpdateOne(
+                {CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
+                {'$set': {**shop_stock_owner(guild_id, channel_id), **fields}},
+                upsert=True
+            )
+            for channel_id, fields in shop_updates.items()
+        ]
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+        await collection.delete_one({CommonFields.ID: guild_id})
+
+        await invalidate_cache(
+            bot,
+            build_cache_key(bot.gdb.name, guild_id, DatabaseCollections.SHOP_STOCK),
+            *[build_shop_stock_cache_key(bot, guild_id, channel_id) for channel_id in shop_updates]
+        )
+        shop_count += len(shop_updates)
+
+    return shop_count
+
+
+# ----- Redis Stock Engine -----
+
+
+# With STOCK_ENGINE=redis, each shop's available and reserved counts live in a Redis hash and every change is a single
+# Lua script. Changed shops are added to a dirty set and written back to the shop's stock document by
+# flush_stock_counters; a shop only leaves the dirty set once the version that was written is still current, so a
+# crash at any point leaves it to be written again.
+STOCK_COUNTER_PREFIX = 'request:stock:'
+STOCK_DIRTY_KEY = 'request:stockDirty'
+STOCK_FLUSH_BATCH_SIZE = 200
+STOCK_VERSION_FIELD = '__version'
+STOCK_UNSEEDED = -2
+
+# Every stock script takes KEYS: counter hash, dirty set; ARGV[1]: shop stock ID. Hash fields are 'a:{item}' for
+# available and 'r:{item}' for reserved stock, with item names encoded by encode_mongo_key.
+_STOCK_SCRIPT_PREAMBLE = '''
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -2
+end
+local function changed()
+    redis.call('HINCRBY', KEYS[1], '__version', 1)
+    redis.call('SADD', KEYS[2], ARGV[1])
+end
+'''
+
+# ARGV: item, quantity
+STOCK_RESERVE_SCRIPT = _STOCK_SCRIPT_PREAMBLE + '''
+local available = tonumber(redis.call('HGET', KEYS[1], 'a:' .. ARGV[2]))
+local quantity = tonumber(ARGV[3])
+if not available or available < quantity then
+    return 0
+end
+redis.call('HINCRBY', KEYS[1], 'a:' .. ARGV[2], -quantity)
+redis.call('HINCRBY', KEYS[1], 'r:' .. ARGV[2], quantity)
+changed()
+return 1
+'''
+
+# ARGV: item, quantity, max stock ('' for no cap)
+STOCK_RELEASE_SCRIPT = _STOCK_SCRIPT_PREAMBLE + '''
+local reserved = tonumber(redis.call('HGET', KEYS[1], 'r:' .. ARGV[2]))
+if not reserved then
+    return 0
+end
+local quantity = tonumber(ARGV[3])
+local available = (tonumber(redis.call('HGET', KEYS[1], 'a:' .. ARGV[2])) or 0) + quantity
+if ARGV[4] ~= '' then
+    available = math.min(tonumber(ARGV[4]), available)
+end
+redis.call('HSET', KEYS[1], 'a:' .. ARGV[2], available, 'r:' .. ARGV[2], math.max(0, reserved - quantity))
+changed()
+return 1
+'''
+
+# ARGV: item, quantity
+STOCK_FINALIZE_SCRIPT = _STOCK_SCRIPT_PREAMBLE + '''
+local reserved = tonumber(redis.call('HGET', KEYS[1], 'r:' .. ARGV[2]))
+if not reserved then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'r:' .. ARGV[2], math.max(0, reserved - tonumber(ARGV[3])))
+changed()
+return 1
+'''
+
+# ARGV: field, value pairs; an empty value deletes the field
+STOCK_SET_SCRIPT = _STOCK_SCRIPT_PREAMBLE + '''
+for i = 2, #ARGV, 2 do
+    if ARGV[i + 1] == '' then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    else
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+changed()
+return 1
+'''
+
+# ARGV: '1' for a full restock or '0' for incremental, increment, then item, max stock pairs
+# Returns each item's previous available stock, or -1 for untracked items skipped by an incremental restock
+STOCK_RESTOCK_SCRIPT = _STOCK_SCRIPT_PREAMBLE + '''
+local previous = {}
+for i = 4, #ARGV, 2 do
+    local field = 'a:' .. ARGV[i]
+    local max_stock = tonumber(ARGV[i + 1])
+    local available = tonumber(redis.call('HGET', KEYS[1], field))
+    if ARGV[2] == '1' then
+        redis.call('HSET', KEYS[1], field, max_stock)
+        redis.call('HSETNX', KEYS[1], 'r:' .. ARGV[i], 0)
+        table.insert(previous, available or 0)
+    elseif available then
+        redis.call('HSET', KEYS[1], field, math.min(max_stock, available + tonumber(ARGV[3])))
+        table.insert(previous, available)
+    else
+        table.insert(previous, -1)
+    end
+end
+changed()
+return previous
+'''
+
+# KEYS: dirty set, counter hash; ARGV: shop stock ID, the version that was written ('' if the hash was gone)
+STOCK_MARK_CLEAN_SCRIPT = '''
+local version = redis.call('HGET', KEYS[2], '__version') or ''
+if version == ARGV[2] then
+    redis.call('SREM', KEYS[1], ARGV[1])
+    return 1
+end
+return 0
+'''
+
+# KEYS: counter hash, dirty set; ARGV: shop stock ID
+STOCK_EVICT_SCRIPT = '''
+if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 0 then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+'''
+
+
+def stock_engine_is_redis(bot) -> bool:
+    """Returns True if limited stock is counted in Redis."""
+    return bot.stock_engine == StockEngine.REDIS
+
+
+def build_stock_counter_key(guild_id: int, channel_id: str) -> str:
+    return f'{STOCK_COUNTER_PREFIX}{build_shop_stock_id(guild_id, channel_id)}'
+
+
+def parse_shop_stock_id(stock_id: str) -> Tuple[int, str]:
+    guild_id, channel_id = stock_id.split(':', 1)
+    return int(guild_id), channel_id
+
+
+def parse_stock_counters(counters: dict) -> dict:
+    """Converts a shop's counter hash into the items map of a stock document."""
+    items = {}
+    for field, value in counters.items():
+        if field.startswith('a:'):
+            items.setdefault(field[2:], {})[ShopFields.AVAILABLE] = int(value)
+        elif field.startswith('r:'):
+            items.setdefault(field[2:], {})[ShopFields.RESERVED] = int(value)
+    return items
+
+
+async def seed_stock_counters(bot, guild_id: int, channel_id: str):
+    """
+    Loads a shop's stock document into its Redis counter hash. Fields already in Redis are newer than the database,
+    so they are never overwritten.
+    """
+    stock_data = await bot.gdb[DatabaseCollections.SHOP_STOCK].find_one(
+        {CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
+        {ShopFields.ITEMS: 1}
+    )
+
+    counter_key = build_stock_counter_key(guild_id, channel_id)
+    async with bot.rdb.pipeline(transaction=False) as pipe:
+        for item_key, item_stock in (stock_data or {}).get(ShopFields.ITEMS, {}).items():
+            pipe.hsetnx(counter_key, f'a:{item_key}', int(item_stock.get(ShopFields.AVAILABLE, 0)))
+            if ShopFields.RESERVED in item_stock:
+                pipe.hsetnx(counter_key, f'r:{item_key}', int(item_stock[ShopFields.RESERVED]))
+        # Marks the shop as loaded, even when it has no limited items
+        pipe.hsetnx(counter_key, STOCK_VERSION_FIELD, 0)
+        await pipe.execute()
+
+
+def build_stock_script_call(guild_id: int, channel_id: str, *args) -> dict:
+    """Builds the keys and arguments of a stock script call for a shop."""
+    return {
+        'keys': [build_stock_counter_key(guild_id, channel_id), STOCK_DIRTY_KEY],
+        'args': [build_shop_stock_id(guild_id, channel_id), *args]
+    }
+
+
+async def run_stock_script(bot, source: str, guild_id: int, channel_id: str, *args):
+    """
+    Runs a stock script against a shop's counters, loading them from the database first if Redis doesn't hold them.
+
+    :return: The script's result
+    """
+    script = get_redis_script(bot, source)
+    call = build_stock_script_call(guild_id, channel_id, *args)
+
+    result = await script(**call)
+    if result == STOCK_UNSEEDED:
+        await seed_stock_counters(bot, guild_id, channel_id)
+        result = await script(**call)
+
+    return result
+
+
+async def get_stock_counters(bot, guild_id: int, channel_id: str) -> dict:
+    """Returns a shop's items map from its Redis counters."""
+    counter_key = build_stock_counter_key(guild_id, channel_id)
+    counters = await bot.rdb.hgetall(counter_key)
+    if not counters:
+        await seed_stock_counters(bot, guild_id, channel_id)
+        counters = await bot.rdb.hgetall(counter_key)
+
+    return parse_stock_counters(counters)
+
+
+async def release_stock_counters(bot, releases: dict) -> int:
+    """
+    Releases reserved stock for many shop items with one pipelined round trip.
+
+    :param bot: The Discord bot instance
+    :param releases: Dict mapping (guild_id, channel_id, item_name) to (quantity, max_stock)
+
+    :return: The number of items released
+    """
+    calls = [
+        (guild_id, channel_id, encode_mongo_key(item_name), quantity, '' if max_stock is None else max_stock)
+        for (guild_id, channel_id, item_name), (quantity, max_stock) in releases.items()
+    ]
+
+    script = get_redis_script(bot, STOCK_RELEASE_SCRIPT)
+    async with bot.rdb.pipeline(transaction=False) as pipe:
+        for guild_id, channel_id, *args in calls:
+            await script(**build_stock_script_call(guild_id, channel_id, *args), client=pipe)
+        results = await pipe.execute()
+
+    released = 0
+    for (guild_id, channel_id, *args), result in zip(calls, results):
+        if result == STOCK_UNSEEDED:
+            result = await run_stock_script(bot, STOCK_RELEASE_SCRIPT, guild_id, channel_id, *args)
+        released += result
+
+    return released
+
+
+async def flush_stock_counters(bot) -> int:
+    """
+    Writes the stock counters of every shop changed since the last flush to their stock documents.
+
+    :param bot: The Discord bot instance
+
+    :return: The number of shops written
+    """
+    stock_ids = list(await bot.rdb.smembers(STOCK_DIRTY_KEY))
+    mark_clean = get_redis_script(bot, STOCK_MARK_CLEAN_SCRIPT)
+
+    flushed = 0
+    for start in range(0, len(stock_ids), STOCK_FLUSH_BATCH_SIZE):
+        batch = [parse_shop_stock_id(stock_id) for stock_id in stock_ids[start:start + STOCK_FLUSH_BATCH_SIZE]]
+
+        async with bot.rdb.pipeline(transaction=False) as pipe:
+            for guild_id, channel_id in batch:
+                pipe.hgetall(build_stock_counter_key(guild_id, channel_id))
+            snapshots = await pipe.execute()
+
+        operations = []
+        for (guild_id, channel_id), counters in zip(batch, snapshots):
+            # A shop deleted since it changed has no counters left to write
+            if counters:
+                operations.append(UpdateOne(
+                    {CommonFields.ID: build_shop_stock_id(guild_id, channel_id)},
+                    {'$set': {
+                        **shop_stock_owner(guild_id, channel_id),
+                        ShopFields.ITEMS: parse_stock_counters(counters)
+                    }},
+                    upsert=True
+                ))
+
+        if operations:
+            await bot.gdb[DatabaseCollections.SHOP_STOCK].bulk_write(operations, ordered=False)
+
+        async with bot.rdb.pipeline(transaction=False) as pipe:
+            for (guild_id, channel_id), counters in zip(batch, snapshots):
+                await mark_clean(
+                    keys=[STOCK_DIRTY_KEY, build_stock_counter_key(guild_id, channel_id)],
+                    args=[build_shop_stock_id(guild_id, channel_id), counters.get(STOCK_VERSION_FIELD, '')],
+                    client=pipe
+                )
+            await pipe.execute()
+
+        await invalidate_cache(bot, *[build_shop_stock_cache_key(bot, guild_id, channel_id)
+                                      for guild_id, channel_id in batch])
+        flushed += len(operations)
+
+    return flushed
+
+
+async def reconcile_stock_counters(bot) -> int:
+    """
+    Brings Redis and the database back in line on startup. Counters left unwritten by a previous run are flushed,
+    then every clean counter hash is dropped so it is reloaded from the database on first use. This also discards
+    counters left over from running with the Redis engine before stock was last changed in the database.
+
+    :param bot: The Discord bot instance
+
+    :return: The number of shops whose unwritten counters were flushed
+    """
+    flushed = await flush_stock_counters(bot)
+
+    evict = get_redis_script(bot, STOCK_EVICT_SCRIPT)
+    async for counter_key in bot.rdb.scan_iter(match=f'{STOCK_COUNTER_PREFIX}*', count=500):
+        await evict(keys=[counter_key, STOCK_DIRTY_KEY], args=[counter_key[len(STOCK_COUNTER_PREFIX):]])
+
+    return flushed
+
+
+# ----- Restock Scheduling -----
+
+
+# Redis sorted set of shops with restocking enabled, scored by the epoch time of their next restock
+RESTOCK_SCHEDULE_KEY = 'request:restockSchedule'
+# Member kept in the schedule at +inf so it is never due. Its absence means the schedule was lost, e.g. Redis was
+# restarted or evicted the key, and must be rebuilt.
+RESTOCK_SCHEDULE_SENTINEL = '__schedule__'
+# How long to wait before retrying a shop whose restock failed
+RESTOCK_RETRY_DELAY = timedelta(minutes=5)
+
+
+def build_restock_member(guild_id: int, channel_id: str) -> str:
+    return f'{guild_id}:{channel_id}'
+
+
+def parse_restock_member(member: str) -> Tuple[int, str]:
+    guild_id, channel_id = member.split(':', 1)
+    return int(guild_id), channel_id
+
+
+def get_next_restock(restock_config: dict, after: datetime) -> datetime | None:
+    """
+    Calculates the first scheduled restock strictly after a given time.
+
+    :param restock_config: The shop's restock configuration
+    :param after: The time to search from (UTC)
+
+    :return: The next restock time, or None if restocking is disabled or the schedule is unrecognized
+    """
+    if not restock_config or not restock_config.get(RestockFields.ENABLED):
+        return None
+
+    schedule = restock_config.get(RestockFields.SCHEDULE)
+    target_minute = restock_config.get(RestockFields.MINUTE, 0)
+    target_hour = restock_config.get(RestockFields.HOUR, 0)
+    target_day = restock_config.get(RestockFields.DAY_OF_WEEK, 0)  # 0 = Monday
+
+    if schedule == ScheduleType.HOURLY.value:
+        candidate = after.replace(minute=target_minute, second=0, microsecond=0)
+        step = timedelta(hours=1)
+    elif schedule == ScheduleType.DAILY.value:
+        candidate = after.replace(hour=target_hour, minute=target_minute, second=0, microsecond=0)
+        step = timedelta(days=1)
+    elif schedule == ScheduleType.WEEKLY.value:
+        candidate = after.replace(hour=target_hour, minute=target_minute, second=0, microsecond=0)
+        candidate += timedelta(days=(target_day - after.weekday()) % 7)
+        step = timedelta(weeks=1)
+    else:
+        return None
+
+    if candidate <= after:
+        candidate += step
+    return candidate
+
+
+async def schedule_shop_restock(bot, guild_id: int, channel_id: str, restock_config: dict | None,
+                                last_restock: datetime | None = None):
+    """
+    Adds a shop to the restock schedule at its next restock time, or removes it if restocking is disabled.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param channel_id: The shop channel ID
+    :param restock_config: The shop's restock configuration
+    :param last_restock: The shop's last restock time. When omitted, the next restock is scheduled from now. A last
+        restock before a missed window schedules the shop in the past, so it is restocked on the next check.
+    """
+    member = build_restock_member(guild_id, channel_id)
+    next_restock = get_next_restock(restock_config, last_restock or datetime.now(timezone.utc))
+
+    if next_restock is None:
+        await bot.rdb.zrem(RESTOCK_SCHEDULE_KEY, member)
+    else:
+        await bot.rdb.zadd(RESTOCK_SCHEDULE_KEY, {member: next_restock.timestamp()})
+
+
+async def defer_shop_restock(bot, guild_id: int, channel_id: str, retry_at: datetime):
+    """
+    Puts a claimed shop back on the restock schedule at a given time, so a failed restock is retried.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param channel_id: The shop channel ID
+    :param retry_at: When to retry the restock (UTC)
+    """
+    await bot.rdb.zadd(RESTOCK_SCHEDULE_KEY, {build_restock_member(guild_id, channel_id): retry_at.timestamp()})
+
+
+async def unschedule_shop_restock(bot, guild_id: int, channel_id: str):
+    """
+    Removes a shop from the restock schedule.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param channel_id: The shop channel ID
+    """
+    await bot.rdb.zrem(RESTOCK_SCHEDULE_KEY, build_restock_member(guild_id, channel_id))
+
+
+async def rebuild_restock_schedule(bot) -> int:
+    """
+    Rebuilds the restock schedule from the shop configs and their last restock times. Shops that missed a restock
+    while the bot was offline are scheduled in the past, so they are caught up on the next check.
+
+    :param bot: The Discord bot instance
+
+    :return: The number of shops scheduled
+    """
+    last_restocks = {}
+    stock_cursor = bot.gdb[DatabaseCollections.SHOP_STOCK].find(
+        {RestockFields.LAST_RESTOCK: {'$exists': True}},
+        {ShopFields.GUILD_ID: 1, ShopFields.CHANNEL_ID: 1, RestockFields.LAST_RESTOCK: 1}
+    )
+    async for stock_data in stock_cursor:
+        guild_id = stock_data.get(ShopFields.GUILD_ID)
+        channel_id = stock_data.get(ShopFields.CHANNEL_ID)
+        try:
+            last_restocks[(guild_id, channel_id)] = datetime.fromisoformat(
+                stock_data[RestockFields.LAST_RESTOCK].replace('Z', '+00:00')
+            )
+        except (ValueError, TypeError, AttributeError):
+            logger.error(f'Malformed data for last restock in guild {guild_id}, channel {channel_id}')
+
+    schedule = {}
+    # Project only the restock config of each shop, leaving the shop stock lists on the server
+    shop_cursor = await bot.gdb[DatabaseCollections.SHOPS].aggregate([
+        {'$project': {
+            'restockConfigs': {'$map': {
+                'input': {'$objectToArray': {'$ifNull': [f'${ShopFields.SHOP_CHANNELS}', {}]}},
+                'as': 'shop',
+                'in': {'k': '$$shop.k', 'v': f'$$shop.v.{ShopFields.RESTOCK_CONFIG}'}
+            }}
+        }}
+    ])
+    async for guild_doc in shop_cursor:
+        guild_id = guild_doc[CommonFields.ID]
+        for shop in guild_doc.get('restockConfigs', []):
+            channel_id = shop['k']
+            last_restock = last_restocks.get((guild_id, channel_id)) or datetime.now(timezone.utc)
+            next_restock = get_next_restock(shop.get('v'), last_restock)
+            if next_restock is not None:
+                schedule[build_restock_member(guild_id, channel_id)] = next_restock.timestamp()
+
+    async with bot.rdb.pipeline(transaction=True) as pipe:
+        pipe.delete(RESTOCK_SCHEDULE_KEY)
+        pipe.zadd(RESTOCK_SCHEDULE_KEY, {**schedule, RESTOCK_SCHEDULE_SENTINEL: float('inf')})
+        await pipe.execute()
+
+    return len(schedule)
+
+
+async def ensure_restock_schedule(bot) -> int | None:
+    """
+    Rebuilds the restock schedule if it has been lost from Redis.
+
+    :param bot: The Discord bot instance
+
+    :return: The number of shops scheduled if the schedule was rebuilt, otherwise None
+    """
+    if await bot.rdb.zscore(RESTOCK_SCHEDULE_KEY, RESTOCK_SCHEDULE_SENTINEL) is not None:
+        return None
+
+    return await rebuild_restock_schedule(bot)
+
+
+async def claim_due_restocks(bot, now: datetime) -> list[Tuple[int, str]]:
+    """
+    Claims every shop whose scheduled restock time has passed. Each shop is removed from the schedule as it is
+    claimed, so only one bot process restocks it; the caller reschedules it once the restock is done.
+
+    :param bot: The Discord bot instance
+    :param now: The current time (UTC)
+
+    :return: A list of (guild_id, channel_id) tuples for the claimed shops
+    """
+    due_members = await bot.rdb.zrangebyscore(RESTOCK_SCHEDULE_KEY, '-inf', now.timestamp())
+    claimed = []
+    for member in due_members:
+        if await bot.rdb.zrem(RESTOCK_SCHEDULE_KEY, member):
+            claimed.append(parse_restock_member(member))
+    return claimed
 
 
 # ----- Shop Cart Management -----
 
 
 CART_TTL_MINUTES = 10
+# Number of expired carts fetched and cleaned up per round trip
+CART_CLEANUP_BATCH_SIZE = 100
 
 
 def encode_mongo_key(key: str) -> str:
@@ -1637,6 +3651,9 @@ async def get_cart(bot, guild_id: int, user_id: int, channel_id: str) -> dict |
     if expires_at:
         if isinstance(expires_at, str):
             expires_at = datetime.fromisoformat(expires_at.replace('Z', '+00:00'))
+        # BSON dates are read back as naive UTC datetimes
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
         if datetime.now(timezone.utc) > expires_at:
             # Cart expired, clean it up
             await clear_cart_and_release_stock(bot, guild_id, user_id, channel_id)
@@ -1645,50 +3662,6 @@ async def get_cart(bot, guild_id: int, user_id: int, channel_id: str) -> dict |
     return cart
 
 
-async def get_or_create_cart(bot, guild_id: int, user_id: int, channel_id: str) -> dict:
-    """
-    Gets an existing cart or creates a new one.
-
-    :param bot: The Discord bot instance
-    :param guild_id: The guild ID
-    :param user_id: The user ID
-    :param channel_id: The shop channel ID
-
-    :return: Cart document
-    """
-    cart = await get_cart(bot, guild_id, user_id, channel_id)
-
-    if cart:
-        return cart
-
-    # Create new cart
-    cart_id = build_cart_id(guild_id, user_id, channel_id)
-    now = datetime.now(timezone.utc)
-    expires_at = now + timedelta(minutes=CART_TTL_MINUTES)
-
-    new_cart = {
-        CommonFields.ID: cart_id,
-        CartFields.GUILD_ID: guild_id,
-        CartFields.USER_ID: user_id,
-        CartFields.CHANNEL_ID: channel_id,
-        CartFields.ITEMS: {},
-        CartFields.CREATED_AT: now.isoformat(),
-        CartFields.UPDATED_AT: now.isoformat(),
-        CartFields.EXPIRES_AT: expires_at.isoformat()
-    }
-
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.gdb,
-        collection_name=DatabaseCollections.SHOP_CARTS,
-        query={CommonFields.ID: cart_id},
-        update_data={'$set': new_cart},
-        cache_id=cart_id
-    )
-
-    return new_cart
-
-
 async def update_cart_expiry(bot, guild_id: int, user_id: int, channel_id: str):
     """
     Extends the cart expiry to now + TTL.
@@ -1710,7 +3683,7 @@ async def update_cart_expiry(bot, guild_id: int, user_id: int, channel_id: str):
         update_data={
             '$set': {
                 CartFields.UPDATED_AT: now.isoformat(),
-                CartFields.EXPIRES_AT: expires_at.isoformat()
+                CartFields.EXPIRES_AT: expires_at
             }
         },
         cache_id=cart_id
@@ -1718,9 +3691,10 @@ async def update_cart_expiry(bot, guild_id: int, user_id: int, channel_id: str):
 
 
 async def add_item_to_cart(bot, guild_id: int, user_id: int, channel_id: str,
-                           item: dict, option_index: int = 0) -> bool:
+                           item: dict, option_index: int = 0) -> dict | None:
     """
-    Adds an item to the cart and reserves stock if applicable.
+    Adds an item to the cart and reserves stock if applicable. The cart is created, the item added or its quantity
+    bumped, and the expiry extended by a single upsert, which returns the updated cart.
 
     :param bot: The Discord bot instance
     :param guild_id: The guild ID
@@ -1729,68 +3703,64 @@ async def add_item_to_cart(bot, guild_id: int, user_id: int, channel_id: str,
     :param item: The item data dictionary
     :param option_index: The cost option index
 
-    :return: True if successful, False if out of stock
+    :return: The updated cart document, or None if out of stock
     """
     item_name = item.get(CommonFields.NAME)
     cart_key = f"{encode_mongo_key(item_name)}::{option_index}"
 
     # Check if item has stock limit and reserve if needed
-    has_stock_limit = item.get(ShopFields.MAX_STOCK) is not None
-    if has_stock_limit:
-        item_quantity = item.get(CommonFields.QUANTITY, 1)
+    max_stock = item.get(ShopFields.MAX_STOCK)
+    item_quantity = item.get(CommonFields.QUANTITY, 1)
+    if max_stock is not None:
         success = await reserve_stock(bot, guild_id, channel_id, item_name, item_quantity)
         if not success:
-            return False
-
-    # Get or create cart
-    cart = await get_or_create_cart(bot, guild_id, user_id, channel_id)
-    cart_id = cart[CommonFields.ID]
+            return None
 
+    cart_id = build_cart_id(guild_id, user_id, channel_id)
     now = datetime.now(timezone.utc)
     expires_at = now + timedelta(minutes=CART_TTL_MINUTES)
 
-    # Check if item already in cart
-    existing_items = cart.get(CartFields.ITEMS, {})
-    if cart_key in existing_items:
-        # Increment quantity
-        await update_cached_data(
-            bot=bot,
-            mongo_database=bot.gdb,
-            collection_name=DatabaseCollections.SHOP_CARTS,
-            query={CommonFields.ID: cart_id},
-            update_data={
-                '$inc': {f'{CartFields.ITEMS}.{cart_key}.{CartFields.QUANTITY}': 1},
-                '$set': {
-                    CartFields.UPDATED_AT: now.isoformat(),
-                    CartFields.EXPIRES_AT: expires_at.isoformat()
-                }
-            },
-            cache_id=cart_id
-        )
-    else:
-        # Add new item
-        cart_item = {
-            CartFields.ITEM: item,
-            CartFields.QUANTITY: 1,
-            CartFields.OPTION_INDEX: option_index,
-            CartFields.RESERVED_AT: now.isoformat()
-        }
-        await update_cached_data(
-            bot=bot,
-            mongo_database=bot.gdb,
-            collection_name=DatabaseCollections.SHOP_CARTS,
-            query={CommonFields.ID: cart_id},
-            update_data={
-                '$set': {
-                    f'{CartFields.ITEMS}.{cart_key}': cart_item,
-                    CartFields.UPDATED_AT: now.isoformat(),
-                    CartFields.EXPIRES_AT: expires_at.isoformat()
-                }
-            },
-            cache_id=cart_id
+    item_path = f'{CartFields.ITEMS}.{cart_key}'
+    new_cart_item = {
+        CartFields.ITEM: item,
+        CartFields.QUANTITY: 1,
+        CartFields.OPTION_INDEX: option_index,
+        CartFields.RESERVED_AT: now.isoformat()
+    }
+    # An expired cart the cleanup task hasn't reached yet is extended rather than cleared, since its stock is still
+    # reserved. The cleanup task re-checks expiry before deleting, so it leaves the extended cart alone.
+    pipeline = [{'$set': {
+        CartFields.GUILD_ID: guild_id,
+        CartFields.USER_ID: user_id,
+        CartFields.CHANNEL_ID: channel_id,
+        CartFields.CREATED_AT: {'$ifNull': [f'${CartFields.CREATED_AT}', now.isoformat()]},
+        CartFields.UPDATED_AT: now.isoformat(),
+        CartFields.EXPIRES_AT: expires_at,
+        item_path: {'$cond': [
+            {'$eq': [{'$type': f'${item_path}'}, 'object']},
+            {'$mergeObjects': [
+                f'${item_path}',
+                {CartFields.QUANTITY: {'$add': [f'${item_path}.{CartFields.QUANTITY}', 1]}}
+            ]},
+            {'$literal': new_cart_item}
+        ]}
+    }}]
+
+    try:
+        cart = await bot.gdb[DatabaseCollections.SHOP_CARTS].find_one_and_update(
+            {CommonFields.ID: cart_id},
+            pipeline,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
         )
+    except Exception:
+        if max_stock is not None:
+            await release_stock(bot, guild_id, channel_id, item_name, item_quantity, max_stock)
+        raise
+
+    await invalidate_cache(bot, build_cache_key(bot.gdb.name, cart_id, DatabaseCollections.SHOP_CARTS))
 
-    return True
+    return cart
 
 
 async def remove_item_from_cart(bot, guild_id: int, user_id: int, channel_id: str,
@@ -1841,7 +3811,7 @@ async def remove_item_from_cart(bot, guild_id: int, user_id: int, channel_id: st
                 '$unset': {f'{CartFields.ITEMS}.{cart_key}': ''},
                 '$set': {
                     CartFields.UPDATED_AT: now.isoformat(),
-                    CartFields.EXPIRES_AT: expires_at.isoformat()
+                    CartFields.EXPIRES_AT: expires_at
                 }
             },
             cache_id=cart_id
@@ -1857,7 +3827,7 @@ async def remove_item_from_cart(bot, guild_id: int, user_id: int, channel_id: st
                 '$inc': {f'{CartFields.ITEMS}.{cart_key}.{CartFields.QUANTITY}': -quantity},
                 '$set': {
                     CartFields.UPDATED_AT: now.isoformat(),
-                    CartFields.EXPIRES_AT: expires_at.isoformat()
+                    CartFields.EXPIRES_AT: expires_at
                 }
             },
             cache_id=cart_id
@@ -1922,7 +3892,7 @@ async def update_cart_item_quantity(bot, guild_id: int, user_id: int, channel_id
                 '$set': {
                     f'{CartFields.ITEMS}.{cart_key}.{CartFields.QUANTITY}': new_quantity,
                     CartFields.UPDATED_AT: now.isoformat(),
-                    CartFields.EXPIRES_AT: expires_at.isoformat()
+                    CartFields.EXPIRES_AT: expires_at
                 }
             },
             cache_id=cart_id
@@ -2014,50 +3984,361 @@ async def finalize_cart_purchase(bot, guild_id: int, user_id: int, channel_id: s
     )
 
 
-async def cleanup_expired_carts(bot):
+async def cleanup_expired_carts(bot) -> int:
     """
-    Finds and cleans up all expired carts, releasing reserved stock.
+    Finds and cleans up expired carts, releasing reserved stock. Carts are streamed in batches, with the stock
+    released by each batch grouped per shop item into a single bulk write. At most bot.cart_cleanup_budget carts are
+    cleaned up per call; any left over are picked up on the next run.
 
     :param bot: The Discord bot instance
+
+    :return: The number of carts cleaned up
     """
     now = datetime.now(timezone.utc)
 
-    # Query all expired carts directly from MongoDB (bypass cache for cleanup)
+    # Query expired carts directly from MongoDB (bypass cache for cleanup). Carts written before expiry was stored as a
+    # BSON date hold an ISO string, which only compares against another string.
+    expired_filter = {
+        '$or': [
+            {CartFields.EXPIRES_AT: {'$lt': now}},
+            {CartFields.EXPIRES_AT: {'$lt': now.isoformat()}}
+        ]
+    }
     collection = bot.gdb[DatabaseCollections.SHOP_CARTS]
-    cursor = collection.find({
-        CartFields.EXPIRES_AT: {'$lt': now.isoformat()}
-    })
+    cursor = collection.find(expired_filter).batch_size(CART_CLEANUP_BATCH_SIZE).limit(bot.cart_cleanup_budget)
+
+    cleaned = 0
+    batch = []
+    async for cart in cursor:
+        batch.append(cart)
+        if len(batch) >= CART_CLEANUP_BATCH_SIZE:
+            cleaned += await cleanup_cart_batch(bot, batch, expired_filter)
+            batch = []
+            # Give other tasks a turn between batches
+            await asyncio.sleep(0)
+
+    if batch:
+        cleaned += await cleanup_cart_batch(bot, batch, expired_filter)
+
+    if cleaned:
+        logger.info(f"Cleaned up {cleaned} expired shop carts.")
 
-    expired_carts = await cursor.to_list(length=None)
+    return cleaned
 
-    for cart in expired_carts:
+
+async def cleanup_cart_batch(bot, carts: list[dict], expired_filter: dict) -> int:
+    """
+    Deletes a batch of expired carts and releases their reserved stock.
+
+    :param bot: The Discord bot instance
+    :param carts: The expired cart documents
+    :param expired_filter: The filter matching expired carts, re-checked on delete so a cart extended since it was
+        read is left alone
+
+    :return: The number of carts deleted
+    """
+    cart_ids = [cart[CommonFields.ID] for cart in carts]
+    collection = bot.gdb[DatabaseCollections.SHOP_CARTS]
+
+    result = await collection.delete_many({CommonFields.ID: {'$in': cart_ids}, **expired_filter})
+    if result.deleted_count < len(cart_ids):
+        surviving_ids = set(await collection.distinct(CommonFields.ID, {CommonFields.ID: {'$in': cart_ids}}))
+        carts = [cart for cart in carts if cart[CommonFields.ID] not in surviving_ids]
+
+    # Total the stock to release per shop item, so each one takes a single update
+    releases = {}
+    for cart in carts:
         guild_id = cart[CartFields.GUILD_ID]
         channel_id = cart[CartFields.CHANNEL_ID]
-        items = cart.get(CartFields.ITEMS, {})
-
-        # Release all reserved stock
-        for cart_key, cart_item in items.items():
+        for cart_item in cart.get(CartFields.ITEMS, {}).values():
             item = cart_item[CartFields.ITEM]
-            quantity = cart_item[CartFields.QUANTITY]
-            item_name = item.get(CommonFields.NAME)
-
             max_stock = item.get(ShopFields.MAX_STOCK)
-            if max_stock is not None:
-                item_quantity = item.get(CommonFields.QUANTITY, 1)
-                await release_stock(bot, guild_id, channel_id, item_name, quantity * item_quantity, max_stock)
+            if max_stock is None:
+                continue
+
+            quantity = cart_item[CartFields.QUANTITY] * item.get(CommonFields.QUANTITY, 1)
+            release_key = (guild_id, channel_id, item.get(CommonFields.NAME))
+            released, _ = releases.get(release_key, (0, max_stock))
+            releases[release_key] = (released + quantity, max_stock)
+
+    stock_cache_keys = set()
+    if releases and stock_engine_is_redis(bot):
+        # The stock documents are invalidated when the released counters are flushed
+        await release_stock_counters(bot, releases)
+    elif releases:
+        operations = [
+            UpdateOne(*build_stock_release(guild_id, channel_id, item_name, quantity, max_stock))
+            for (guild_id, channel_id, item_name), (quantity, max_stock) in releases.items()
+        ]
+        await bot.gdb[DatabaseCollections.SHOP_STOCK].bulk_write(operations, ordered=False)
+        stock_cache_keys = {build_shop_stock_cache_key(bot, guild_id, channel_id)
+                            for guild_id, channel_id, _ in releases}
+
+    await invalidate_cache(
+        bot,
+        *[build_cache_key(bot.gdb.name, cart_id, DatabaseCollections.SHOP_CARTS) for cart_id in cart_ids],
+        *stock_cache_keys
+    )
 
-        # Delete the cart
-        cart_id = cart[CommonFields.ID]
-        await delete_cached_data(
+    return len(carts)
+
+
+# ----- Roleplay -----
+
+
+class RoleplayFilter:
+    """
+    The parts of a guild's roleplay configuration needed to decide whether a message can count, compiled so that
+    on_message can drop irrelevant messages without decoding the configuration.
+    """
+    __slots__ = ('enabled', 'channel_ids', 'min_length')
+
+    def __init__(self, enabled: bool = False, channel_ids: frozenset[int] = frozenset(), min_length: int = 0):
+        self.enabled = enabled
+        self.channel_ids = channel_ids
+        self.min_length = min_length
+
+    @classmethod
+    def from_config(cls, config: dict | None) -> 'RoleplayFilter':
+        if not config or not config.get(RoleplayFields.ENABLED):
+            return cls()
+
+        channel_ids = frozenset(int(channel_id) for channel_id in config.get(RoleplayFields.CHANNELS, []))
+        min_length = int(config.get(RoleplayFields.CONFIG, {}).get(RoleplayFields.MIN_LENGTH, 0) or 0)
+        return cls(bool(channel_ids), channel_ids, min_length)
+
+    def allows(self, message: discord.Message) -> bool:
+        """
+        Checks whether a message is eligible to count towards roleplay rewards. Messages in threads are checked
+        against their parent channel.
+        """
+        if not self.enabled or len(message.content) < self.min_length:
+            return False
+
+        channel = message.channel
+        if isinstance(channel, discord.Thread):
+            channel_id = channel.parent_id
+        else:
+            channel_id = channel.id
+
+        return channel_id in self.channel_ids
+
+
+async def get_roleplay_filter(bot, guild_id: int) -> RoleplayFilter:
+    """
+    Returns the compiled roleplay filter for a guild. Filters are held in the local cache under the roleplay config's
+    key, so they are rebuilt whenever the config is updated or invalidated by another process. Guilds without a
+    roleplay config are cached as a disabled filter.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+
+    :return: The guild's RoleplayFilter
+    """
+    cache_key = build_cache_key(bot.gdb.name, guild_id, DatabaseCollections.ROLEPLAY_CONFIG)
+    roleplay_filter = bot.local_cache.get_compiled(cache_key)
+    if roleplay_filter is None:
+        rp_config = await get_cached_data(
             bot=bot,
             mongo_database=bot.gdb,
-            collection_name=DatabaseCollections.SHOP_CARTS,
-            search_filter={CommonFields.ID: cart_id},
-            cache_id=cart_id
+            collection_name=DatabaseCollections.ROLEPLAY_CONFIG,
+            query={CommonFields.ID: guild_id}
+        )
+        roleplay_filter = RoleplayFilter.from_config(rp_config)
+        bot.local_cache.set_compiled(cache_key, roleplay_filter)
+
+    return roleplay_filter
+
+
+# Players whose roleplay counters changed since they were last written to the database
+ROLEPLAY_DIRTY_KEY = 'rp:dirty'
+# Idle counters expire from Redis after this long; the database copy seeds them again on the next message
+ROLEPLAY_STATE_TTL = 60 * 60 * 24 * 30
+ROLEPLAY_FLUSH_BATCH_SIZE = 500
+
+# Results of the roleplay message script
+ROLEPLAY_COOLDOWN = -1
+ROLEPLAY_UNSEEDED = -2
+ROLEPLAY_COUNTED = 0
+ROLEPLAY_REWARD = 1
+
+# KEYS: cooldown key, state hash key, dirty set key
+# ARGV: mode, cooldown seconds, current cycle, threshold or frequency, seeded flag, dirty member, state TTL
+ROLEPLAY_MESSAGE_SCRIPT = '''
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return -1
+end
+if ARGV[5] == '0' and redis.call('EXISTS', KEYS[2]) == 0 then
+    return -2
+end
+
+local cooldown = tonumber(ARGV[2])
+if cooldown > 0 then
+    redis.call('SET', KEYS[1], '1', 'EX', cooldown)
+end
+
+local limit = tonumber(ARGV[4])
+local result = 0
+if ARGV[1] == 'scheduled' then
+    local count
+    if redis.call('HGET', KEYS[2], 'last_reset') ~= ARGV[3] then
+        redis.call('HSET', KEYS[2], 'message_count', 1, 'last_reset', ARGV[3], 'claimed', 0)
+        count = 1
+    else
+        count = redis.call('HINCRBY', KEYS[2], 'message_count', 1)
+    end
+    if count >= limit and redis.call('HGET', KEYS[2], 'claimed') ~= '1' then
+        redis.call('HSET', KEYS[2], 'claimed', 1)
+        result = 1
+    end
+else
+    local count = redis.call('HINCRBY', KEYS[2], 'message_count', 1)
+    if count >= limit then
+        redis.call('HSET', KEYS[2], 'message_count', 0)
+        result = 1
+    end
+end
+
+redis.call('EXPIRE', KEYS[2], ARGV[7])
+redis.call('SADD', KEYS[3], ARGV[6])
+return result
+'''
+
+
+def build_roleplay_state_key(guild_id: int, user_id: int) -> str:
+    return f'rp:{guild_id}:{user_id}:state'
+
+
+async def seed_roleplay_state(bot, guild_id: int, user_id: int):
+    """Loads a player's roleplay counters from the database into Redis, without overwriting newer Redis values."""
+    state = await bot.gdb[DatabaseCollections.ROLEPLAY_DATA].find_one({CommonFields.ID: f'{guild_id}:{user_id}'})
+    if not state:
+        return
+
+    state_key = build_roleplay_state_key(guild_id, user_id)
+    async with bot.rdb.pipeline(transaction=False) as pipe:
+        pipe.hsetnx(state_key, 'message_count', state.get('message_count', 0))
+        if state.get('last_reset') is not None:
+            pipe.hsetnx(state_key, 'last_reset', state['last_reset'])
+        pipe.hsetnx(state_key, 'claimed', 1 if state.get('claimed') else 0)
+        await pipe.execute()
+
+
+async def record_roleplay_message(bot, guild_id: int, user_id: int, mode: str, cooldown: int, cycle: str | None,
+                                  limit: int) -> bool:
+    """
+    Counts a roleplay message in a single Redis round trip. The script applies the cooldown, increments the counter,
+    resets it at the start of a new cycle, and checks the threshold (scheduled mode) or frequency (accrued mode).
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param user_id: The author's Discord ID
+    :param mode: The roleplay mode
+    :param cooldown: The cooldown between counted messages, in seconds
+    :param cycle: The current cycle key in scheduled mode
+    :param limit: The message threshold (scheduled mode) or frequency (accrued mode)
+
+    :return: True if the message earned a reward
+    """
+    script = get_redis_script(bot, ROLEPLAY_MESSAGE_SCRIPT)
+    keys = [f'rp:{guild_id}:{user_id}:cooldown', build_roleplay_state_key(guild_id, user_id), ROLEPLAY_DIRTY_KEY]
+    args = [mode, cooldown, cycle or '', limit, 0, f'{guild_id}:{user_id}', ROLEPLAY_STATE_TTL]
+
+    result = await script(keys=keys, args=args)
+    if result == ROLEPLAY_UNSEEDED:
+        # First message since Redis last held this player's counters
+        await seed_roleplay_state(bot, guild_id, user_id)
+        args[4] = 1
+        result = await script(keys=keys, args=args)
+
+    return result == ROLEPLAY_REWARD
+
+
+async def flush_roleplay_counters(bot) -> int:
+    """
+    Writes the roleplay counters changed since the last flush to the database in bulk. Players are taken off the
+    dirty set a batch at a time, and put back if their batch can't be written.
+
+    :param bot: The Discord bot instance
+
+    :return: The number of players written
+    """
+    flushed = 0
+    while True:
+        members = await bot.rdb.spop(ROLEPLAY_DIRTY_KEY, ROLEPLAY_FLUSH_BATCH_SIZE)
+        if not members:
+            return flushed
+
+        try:
+            async with bot.rdb.pipeline(transaction=False) as pipe:
+                for member in members:
+                    guild_id, user_id = member.split(':', 1)
+                    pipe.hgetall(build_roleplay_state_key(int(guild_id), int(user_id)))
+                states = await pipe.execute()
+
+            operations = []
+            for member, state in zip(members, states):
+                if not state:
+                    continue
+                update = {
+                    'message_count': int(state.get('message_count', 0)),
+                    'claimed': state.get('claimed') == '1'
+                }
+                if state.get('last_reset'):
+                    update['last_reset'] = state['last_reset']
+                operations.append(UpdateOne({CommonFields.ID: member}, {'$set': update}, upsert=True))
+
+            if operations:
+                await bot.gdb[DatabaseCollections.ROLEPLAY_DATA].bulk_write(operations, ordered=False)
+        except Exception:
+            # Mark the batch dirty again so the next flush retries it
+            await bot.rdb.sadd(ROLEPLAY_DIRTY_KEY, *members)
+            raise
+        flushed += len(operations)
+
+        if len(members) < ROLEPLAY_FLUSH_BATCH_SIZE:
+            return flushed
+
+
+async def apply_roleplay_rewards(bot, guild_id: int, player_id: int, character_id: str, rewards: dict) -> bool:
+    """
+    Grants a guild's roleplay reward bundle to a character with a single atomic write. Experience is skipped when the
+    guild has experience disabled.
+
+    :param bot: The Discord bot instance
+    :param guild_id: The guild ID
+    :param player_id: The player's Discord ID
+    :param character_id: The character's ID
+    :param rewards: The rewards dict from the guild's roleplay config
+
+    :return: True if the rewards were applied, False if the character was not found or a reward would leave an item
+             or currency negative
+    """
+    experience = rewards.get(RoleplayFields.XP)
+    if experience and not await get_xp_config(bot, guild_id):
+        experience = None
+
+    reward_items = rewards.get(RoleplayFields.ITEMS, {})
+    reward_currency = rewards.get(RoleplayFields.CURRENCY, {})
+    currency_config = None
+    if reward_items or reward_currency:
+        currency_config = await get_cached_data(
+            bot=bot,
+            mongo_database=bot.gdb,
+            collection_name=DatabaseCollections.CURRENCY,
+            query={CommonFields.ID: guild_id}
         )
 
-    if expired_carts:
-        logger.info(f"Cleaned up {len(expired_carts)} expired shop carts.")
+    # Split items and currency separately, so an item and a currency sharing a name are both granted
+    item_changes = []
+    currency_changes = []
+    for reward_group in (reward_items, reward_currency):
+        group_item_changes, group_currency_changes = split_reward_items(currency_config, reward_group)
+        item_changes.extend(group_item_changes)
+        currency_changes.extend(group_currency_changes)
+
+    return await apply_character_changes(bot, player_id, character_id, item_changes, currency_changes,
+                                         currency_config, experience)
 
 
 # ----- Container Management -----
@@ -2127,58 +4408,97 @@ def get_container_name(character_data: dict, container_id: str | None) -> str:
     return container.get(ContainerFields.NAME, 'Unknown')
 
 
-def get_total_item_quantity(character_data: dict, item_name: str) -> int:
+def find_item_key(items: dict, item_name: str) -> Tuple[str | None, int]:
     """
-    Returns total quantity of item across ALL containers + loose items.
-    Useful for validating trades, quest requirements, etc.
+    Finds an item in a single items map, case-insensitively. Items are stored titlecased, so the lookup tries the
+    name as given and its titlecased form directly before falling back to comparing every key.
+
+    :return: A tuple of (stored item name, quantity), or (None, 0) if the item is not in the map
     """
-    item_name_lower = item_name.lower()
-    total = 0
+    for candidate in (item_name, titlecase(item_name)):
+        if candidate in items:
+            return candidate, items[candidate]
 
-    # Check loose items
-    inventory = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-    for name, qty in inventory.items():
-        if name.lower() == item_name_lower:
-            total += qty
+    item_name_lower = item_name.lower()
+    for key, quantity in items.items():
+        if key.lower() == item_name_lower:
+            return key, quantity
 
-    # Check all containers
-    containers = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CONTAINERS, {})
-    for container_data in containers.values():
-        items = container_data.get(ContainerFields.ITEMS, {})
-        for name, qty in items.items():
-            if name.lower() == item_name_lower:
-                total += qty
+    return None, 0
 
-    return total
 
+class ItemIndex:
+    """
+    Maps each lowercase item name to every place a character holds it, so quantity totals and location lookups don't
+    scan every container. Build it once per version of a character; see get_character_item_index.
 
-def get_item_locations(character_data: dict, item_name: str) -> list[dict]:
+    Each location is a dict: {'id': str|None, 'name': str, 'quantity': int, 'key': str}, where key is the item name
+    as stored.
     """
-    Returns list of dicts for everywhere this item exists.
-    Each dict: {'id': str|None, 'name': str, 'quantity': int}
+    __slots__ = ('_locations',)
+
+    def __init__(self, character_data: dict):
+        self._locations: dict[str, list[dict]] = {}
+
+        attributes = character_data[CharacterFields.ATTRIBUTES]
+        self._add_items(None, 'Loose Items', attributes.get(CharacterFields.INVENTORY, {}))
+        for container_id, container_data in attributes.get(CharacterFields.CONTAINERS, {}).items():
+            self._add_items(container_id, container_data.get(ContainerFields.NAME, 'Unknown'),
+                            container_data.get(ContainerFields.ITEMS, {}))
+
+    def _add_items(self, container_id: str | None, container_name: str, items: dict):
+        for key, quantity in items.items():
+            self._locations.setdefault(key.lower(), []).append({
+                'id': container_id,
+                'name': container_name,
+                'quantity': quantity,
+                'key': key
+            })
+
+    def locations(self, item_name: str) -> list[dict]:
+        """Returns every location holding a positive quantity of the item."""
+        return [location for location in self._locations.get(item_name.lower(), []) if location['quantity'] > 0]
+
+    def total(self, item_name: str) -> int:
+        """Returns the total quantity of the item across the loose inventory and every container."""
+        return sum(location['quantity'] for location in self._locations.get(item_name.lower(), []))
+
+    def find(self, item_name: str, container_id: str | None) -> Tuple[str | None, int]:
+        """
+        Finds the item in one container. container_id=None targets Loose Items.
+
+        :return: A tuple of (stored item name, quantity), or (None, 0) if the container doesn't hold the item
+        """
+        for location in self._locations.get(item_name.lower(), []):
+            if location['id'] == container_id:
+                return location['key'], location['quantity']
+        return None, 0
+
+
+def get_character_item_index(bot, player_id: int, character_id: str, character_data: dict) -> ItemIndex:
     """
-    item_name_lower = item_name.lower()
-    locations = []
+    Returns the ItemIndex for a character, built at most once per version of the character. Indexes are kept in the
+    local cache under the character's cache key, so any change to the character drops them.
 
-    # Check loose items
-    inventory = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-    for name, qty in inventory.items():
-        if name.lower() == item_name_lower and qty > 0:
-            locations.append({'id': None, 'name': 'Loose Items', 'quantity': qty})
+    :param bot: The Discord bot instance
+    :param player_id: The owning player's Discord ID
+    :param character_id: The character's ID
+    :param character_data: The character's current data, used to build the index if it isn't cached
 
-    # Check all containers
-    containers = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CONTAINERS, {})
-    for container_id, container_data in containers.items():
-        items = container_data.get(ContainerFields.ITEMS, {})
-        for name, qty in items.items():
-            if name.lower() == item_name_lower and qty > 0:
-                locations.append({
-                    'id': container_id,
-                    'name': container_data.get(ContainerFields.NAME, 'Unknown'),
-                    'quantity': qty
-                })
+    :return: The character's ItemIndex
+    """
+    cache_key = build_character_cache_key(bot, player_id, character_id)
+    # Keyed by character ID, since every character of a player shares one cache key in embedded storage
+    item_indexes = bot.local_cache.get_compiled(cache_key)
+    if item_indexes is None:
+        item_indexes = {}
+        bot.local_cache.set_compiled(cache_key, item_indexes)
 
-    return locations
+    item_index = item_indexes.get(character_id)
+    if item_index is None:
+        item_index = ItemIndex(character_data)
+        item_indexes[character_id] = item_index
+    return item_index
 
 
 def get_container_count(character_data: dict) -> int:
@@ -2227,16 +4547,7 @@ async def create_container(bot, player_id: int, character_id: str, name: str) ->
     if len(name) > MAX_CONTAINER_NAME_LENGTH:
         raise UserFeedbackError(f'Container name cannot exceed {MAX_CONTAINER_NAME_LENGTH} characters.')
 
-    player_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id}
-    )
-    if not player_data:
-        raise UserFeedbackError('Player data not found.')
-
-    character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
+    character_data = await get_character(bot, player_id, character_id)
     if not character_data:
         raise UserFeedbackError('Character not found.')
 
@@ -2249,13 +4560,10 @@ async def create_container(bot, player_id: int, character_id: str, name: str) ->
     container_id = str(shortuuid.uuid())
     order = get_next_container_order(character_data)
 
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id},
-        update_data={'$set': {
-            f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}': {
+    await update_character(
+        bot, player_id, character_id,
+        {'$set': {
+            f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}': {
                 ContainerFields.NAME: name,
                 ContainerFields.ORDER: order,
                 ContainerFields.ITEMS: {}
@@ -2280,16 +4588,7 @@ async def rename_container(bot, player_id: int, character_id: str,
     if len(new_name) > MAX_CONTAINER_NAME_LENGTH:
         raise UserFeedbackError(f'Container name cannot exceed {MAX_CONTAINER_NAME_LENGTH} characters.')
 
-    player_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id}
-    )
-    if not player_data:
-        raise UserFeedbackError('Player data not found.')
-
-    character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
+    character_data = await get_character(bot, player_id, character_id)
     if not character_data:
         raise UserFeedbackError('Character not found.')
 
@@ -2300,12 +4599,9 @@ async def rename_container(bot, player_id: int, character_id: str,
     if container_name_exists(character_data, new_name, exclude_id=container_id):
         raise UserFeedbackError(f'A container named "{new_name}" already exists.')
 
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id},
-        update_data={'$set': {f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}.{ContainerFields.NAME}': new_name}}
+    await update_character(
+        bot, player_id, character_id,
+        {'$set': {f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}.{ContainerFields.NAME}': new_name}}
     )
 
 
@@ -2322,17 +4618,7 @@ async def delete_container(bot, player_id: int, character_id: str,
 
     :return: Number of unique items moved to the root inventory
     """
-    player_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id}
-    )
-
-    if not player_data:
-        raise UserFeedbackError('Player data not found.')
-
-    character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
+    character_data = await get_character(bot, player_id, character_id)
     if not character_data:
         raise UserFeedbackError('Character not found.')
 
@@ -2361,23 +4647,17 @@ async def delete_container(bot, player_id: int, character_id: str,
         # Rebuild inventory with titlecase keys
         new_inventory = {name: qty for name, qty in inventory_lower.values()}
 
-        await update_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: player_id},
-            update_data={
-                '$set': {f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}': new_inventory},
-                '$unset': {f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}': ''}
+        await update_character(
+            bot, player_id, character_id,
+            {
+                '$set': {f'{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}': new_inventory},
+                '$unset': {f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}': ''}
             }
         )
     else:
-        await update_cached_data(
-            bot=bot,
-            mongo_database=bot.mdb,
-            collection_name=DatabaseCollections.CHARACTERS,
-            query={CommonFields.ID: player_id},
-            update_data={'$unset': {f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}': ''}}
+        await update_character(
+            bot, player_id, character_id,
+            {'$unset': {f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}': ''}}
         )
 
     return items_count
@@ -2389,16 +4669,7 @@ async def reorder_container(bot, player_id: int, character_id: str,
     Moves container up (direction=-1) or down (direction=1) in order.
     Swaps order values with adjacent container.
     """
-    player_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id}
-    )
-
-    if not player_data:
-        raise UserFeedbackError('Player data not found.')
-    character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
+    character_data = await get_character(bot, player_id, character_id)
     if not character_data:
         raise UserFeedbackError('Character not found.')
 
@@ -2431,14 +4702,11 @@ async def reorder_container(bot, player_id: int, character_id: str,
     current_order = containers[current_container_id].get(ContainerFields.ORDER, current_index)
     target_order = containers[target_container_id].get(ContainerFields.ORDER, target_index)
 
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id},
-        update_data={'$set': {
-            f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{current_container_id}.{ContainerFields.ORDER}': target_order,
-            f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{target_container_id}.{ContainerFields.ORDER}': current_order
+    await update_character(
+        bot, player_id, character_id,
+        {'$set': {
+            f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{current_container_id}.{ContainerFields.ORDER}': target_order,
+            f'{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{target_container_id}.{ContainerFields.ORDER}': current_order
         }}
     )
 
@@ -2460,40 +4728,17 @@ async def move_item_between_containers(
     if quantity < 1:
         raise UserFeedbackError('Quantity must be at least 1.')
 
-    player_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id}
-    )
-    if not player_data:
-        raise UserFeedbackError('Player data not found.')
-
-    character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
+    character_data = await get_character(bot, player_id, character_id)
     if not character_data:
         raise UserFeedbackError('Character not found.')
 
-    item_name_lower = item_name.lower()
-
-    # Get source items
-    if source_container_id is None:
-        source_items = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-        source_path = f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}'
-    else:
-        containers = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CONTAINERS, {})
-        if source_container_id not in containers:
-            raise UserFeedbackError('Source container not found.')
-        source_items = containers[source_container_id].get(ContainerFields.ITEMS, {})
-        source_path = f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{source_container_id}.{ContainerFields.ITEMS}'
+    containers = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CONTAINERS, {})
+    if source_container_id is not None and source_container_id not in containers:
+        raise UserFeedbackError('Source container not found.')
 
     # Find item in source (case-insensitive)
-    source_key = None
-    source_qty = 0
-    for key, qty in source_items.items():
-        if key.lower() == item_name_lower:
-            source_key = key
-            source_qty = qty
-            break
+    item_index = get_character_item_index(bot, player_id, character_id, character_data)
+    source_key, source_qty = item_index.find(item_name, source_container_id)
 
     if source_key is None:
         raise UserFeedbackError(f'Item "{item_name}" not found in the source container.')
@@ -2501,56 +4746,21 @@ async def move_item_between_containers(
     if source_qty < quantity:
         raise UserFeedbackError(f'Insufficient quantity. You have {source_qty} in this container.')
 
-    # Get destination items
-    if dest_container_id is None:
-        dest_items = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-        dest_path = f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}'
-    else:
-        containers = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CONTAINERS, {})
+    # Validate destination
+    if dest_container_id is not None:
         if dest_container_id not in containers:
             raise UserFeedbackError('Destination container not found.')
-        dest_items = containers[dest_container_id].get(ContainerFields.ITEMS, {})
-        dest_path = f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{dest_container_id}.{ContainerFields.ITEMS}'
-
-    # Find existing item in destination (case-insensitive)
-    dest_key = None
-    dest_qty = 0
-    for key, qty in dest_items.items():
-        if key.lower() == item_name_lower:
-            dest_key = key
-            dest_qty = qty
-            break
-
-    # Use titlecase for the item name
-    display_name = titlecase(item_name)
-
-    # Modify source items dict (remove item)
-    new_source_qty = source_qty - quantity
-    if new_source_qty <= 0:
-        del source_items[source_key]
-    else:
-        source_items[source_key] = new_source_qty
-
-    # Modify destination items dict (add item)
-    if dest_key:
-        dest_items[dest_key] = dest_qty + quantity
-    else:
-        dest_items[display_name] = quantity
 
-    # Update both containers at once using full path to items dict
-    # This avoids dot-notation issues with item names containing dots
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id},
-        update_data={
-            '$set': {
-                source_path: source_items,
-                dest_path: dest_items
-            }
-        }
+    # Move the item in one guarded update, so a concurrent change can't drive the source negative
+    moved = await apply_character_changes(
+        bot, player_id, character_id,
+        item_changes=[
+            (source_key, -quantity, source_container_id),
+            (item_name, quantity, dest_container_id)
+        ]
     )
+    if not moved:
+        raise UserFeedbackError('Your inventory changed before the item could be moved. Please try again.')
 
 
 async def consume_item_from_container(
@@ -2566,40 +4776,18 @@ async def consume_item_from_container(
     if quantity < 1:
         raise UserFeedbackError('Quantity must be at least 1.')
 
-    player_data = await get_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id}
-    )
-    if not player_data:
-        raise UserFeedbackError('Player data not found.')
-
-    character_data = player_data[CharacterFields.CHARACTERS].get(character_id)
+    character_data = await get_character(bot, player_id, character_id)
     if not character_data:
         raise UserFeedbackError('Character not found.')
 
-    item_name_lower = item_name.lower()
-
-    # Get container items
-    if container_id is None:
-        items = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.INVENTORY, {})
-        path = f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.INVENTORY}'
-    else:
+    if container_id is not None:
         containers = character_data[CharacterFields.ATTRIBUTES].get(CharacterFields.CONTAINERS, {})
         if container_id not in containers:
             raise UserFeedbackError('Container not found.')
-        items = containers[container_id].get(ContainerFields.ITEMS, {})
-        path = f'{CharacterFields.CHARACTERS}.{character_id}.{CharacterFields.ATTRIBUTES}.{CharacterFields.CONTAINERS}.{container_id}.{ContainerFields.ITEMS}'
 
     # Find item (case-insensitive)
-    item_key = None
-    current_qty = 0
-    for key, qty in items.items():
-        if key.lower() == item_name_lower:
-            item_key = key
-            current_qty = qty
-            break
+    item_index = get_character_item_index(bot, player_id, character_id, character_data)
+    item_key, current_qty = item_index.find(item_name, container_id)
 
     if item_key is None:
         raise UserFeedbackError(f'Item "{item_name}" not found in this container.')
@@ -2607,22 +4795,10 @@ async def consume_item_from_container(
     if current_qty < quantity:
         raise UserFeedbackError(f'You only have {current_qty} of this item in this container.')
 
-    new_qty = current_qty - quantity
-
-    # Modify items dict in Python and set the entire container
-    # This avoids dot-notation issues with item names containing dots
-    if new_qty <= 0:
-        del items[item_key]
-    else:
-        items[item_key] = new_qty
-
-    await update_cached_data(
-        bot=bot,
-        mongo_database=bot.mdb,
-        collection_name=DatabaseCollections.CHARACTERS,
-        query={CommonFields.ID: player_id},
-        update_data={'$set': {path: items}}
-    )
+    consumed = await apply_character_changes(bot, player_id, character_id,
+                                             item_changes=[(item_key, -quantity, container_id)])
+    if not consumed:
+        raise UserFeedbackError('Your inventory changed before the item could be used. Please try again.')
 
 
 def format_inventory_by_container(character_data: dict, currency_config: dict | None = None) -> str: